@@ -4,7 +4,7 @@ import csv
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from backtesting_system.interfaces.data_source import DataSource
 from backtesting_system.models.market import Candle
@@ -92,6 +92,36 @@ class CSVDataSource(DataSource):
             raise ValueError(f"Unsupported timeframe: {timeframe}")
         return _resample(candles, timeframe)
 
+    def iter_ohlcv(self, symbol: str, timeframe: str, start_date=None, end_date=None) -> Iterator[Candle]:
+        """``load_ohlcv`` as a stream, holding one bucket at a time; the CSV must be in time order."""
+        if timeframe != self.base_timeframe and timeframe not in _TIMEFRAME_MINUTES:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        path = self._resolve_path(symbol)
+        if not path.exists():
+            raise FileNotFoundError(f"CSV not found: {path}")
+        candles = (
+            c
+            for c in self._iter_candles(path)
+            if not (start_date and c.time < start_date) and not (end_date and c.time > end_date)
+        )
+        if timeframe == self.base_timeframe:
+            return candles
+        return self._resample_stream(candles, timeframe)
+
+    @staticmethod
+    def _resample_stream(candles: Iterable[Candle], timeframe: str) -> Iterator[Candle]:
+        bucket: List[Candle] = []
+        bucket_time = None
+        for candle in candles:
+            key = _floor_time(candle.time, timeframe)
+            if bucket and key != bucket_time:
+                yield _resample(bucket, timeframe)[0]
+                bucket = []
+            bucket_time = key
+            bucket.append(candle)
+        if bucket:
+            yield _resample(bucket, timeframe)[0]
+
     def load_volume_profile(self, symbol: str, date):
         return None
 
@@ -99,24 +129,23 @@ class CSVDataSource(DataSource):
         return []
 
     def _read_candles(self, path: Path) -> List[Candle]:
-        candles: List[Candle] = []
+        return list(self._iter_candles(path))
+
+    def _iter_candles(self, path: Path) -> Iterator[Candle]:
         if not path.exists():
             raise FileNotFoundError(f"CSV not found: {path}")
         with path.open("r", newline="", encoding="utf-8") as infile:
             reader = csv.DictReader(infile)
             for row in reader:
                 dt = _parse_iso_utc(row["time_utc"])
-                candles.append(
-                    Candle(
-                        time=dt,
-                        open=float(row["open"]),
-                        high=float(row["high"]),
-                        low=float(row["low"]),
-                        close=float(row["close"]),
-                        volume=None,
-                    )
+                yield Candle(
+                    time=dt,
+                    open=float(row["open"]),
+                    high=float(row["high"]),
+                    low=float(row["low"]),
+                    close=float(row["close"]),
+                    volume=None,
                 )
-        return candles
 
     def _filter_date_range(
         self,
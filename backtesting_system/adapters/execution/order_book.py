@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+from backtesting_system.models.market import Candle
+from backtesting_system.models.orders import Order, OrderSide, OrderType
+
+
+def _trigger_price(order: Order) -> float:
+    if order.order_type == OrderType.LIMIT:
+        price = order.limit_price
+    else:
+        price = order.stop_price if order.stop_price is not None else order.limit_price
+    if price is None:
+        raise ValueError(f"{order.order_type.value} order requires a trigger price.")
+    return float(price)
+
+
+def _triggers_on_decline(order: Order) -> bool:
+    # Buy limits and sell stops sit below the market, sell limits and buy stops above it.
+    if order.order_type == OrderType.LIMIT:
+        return order.side == OrderSide.BUY
+    return order.side == OrderSide.SELL
+
+
+@dataclass
+class PendingOrderBook:
+    """
+    Resting LIMIT/STOP orders, kept in two price-sorted heaps.
+
+    Orders that trigger when price trades down to them (buy limits, sell stops)
+    live in a max-heap, orders that trigger when price trades up to them
+    (sell limits, buy stops) in a min-heap. Per bar only the heap tops are
+    compared against high/low, so k triggered orders out of n cost O(k log n).
+    Cancelled orders are removed lazily when they surface at a heap top.
+    """
+
+    _below: List[Tuple[float, int, str]] = field(default_factory=list)
+    _above: List[Tuple[float, int, str]] = field(default_factory=list)
+    _expiries: List[Tuple[datetime, int, str]] = field(default_factory=list)
+    _orders: Dict[str, Order] = field(default_factory=dict)
+    _oco_groups: Dict[str, Set[str]] = field(default_factory=dict)
+    _seq: int = 0
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def add(self, order_id: str, order: Order) -> None:
+        price = _trigger_price(order)
+        self._seq += 1
+        if _triggers_on_decline(order):
+            heapq.heappush(self._below, (-price, self._seq, order_id))
+        else:
+            heapq.heappush(self._above, (price, self._seq, order_id))
+        if order.expires_at is not None:
+            heapq.heappush(self._expiries, (order.expires_at, self._seq, order_id))
+        if order.oco_group is not None:
+            self._oco_groups.setdefault(order.oco_group, set()).add(order_id)
+        self._orders[order_id] = order
+
+    def cancel(self, order_id: str) -> bool:
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        if order.oco_group is not None:
+            group = self._oco_groups.get(order.oco_group)
+            if group is not None:
+                group.discard(order_id)
+                if not group:
+                    del self._oco_groups[order.oco_group]
+        self._compact()
+        return True
+
+    def expire(self, now: datetime) -> List[str]:
+        expired: List[str] = []
+        while self._expiries and self._expiries[0][0] <= now:
+            _expires_at, _seq, order_id = heapq.heappop(self._expiries)
+            if self.cancel(order_id):
+                expired.append(order_id)
+        return expired
+
+    def trigger(self, bar: Candle) -> List[Tuple[str, Order, float]]:
+        """Pop every order touched by ``bar`` and return ``(order_id, order, raw_fill_price)``.
+
+        Fills happen at the trigger price, or at the bar open if the market gapped
+        through it. Orders are filled in order of distance from the open, and a fill
+        cancels the remaining members of its OCO group.
+        """
+        self.expire(bar.time)
+        candidates: List[Tuple[float, int, str, float]] = []
+        while self._below:
+            neg_price, seq, order_id = self._below[0]
+            if order_id not in self._orders:
+                heapq.heappop(self._below)
+                continue
+            if -neg_price < bar.low:
+                break
+            heapq.heappop(self._below)
+            fill_price = min(-neg_price, bar.open)
+            candidates.append((abs(bar.open - fill_price), seq, order_id, fill_price))
+        while self._above:
+            price, seq, order_id = self._above[0]
+            if order_id not in self._orders:
+                heapq.heappop(self._above)
+                continue
+            if price > bar.high:
+                break
+            heapq.heappop(self._above)
+            fill_price = max(price, bar.open)
+            candidates.append((abs(bar.open - fill_price), seq, order_id, fill_price))
+
+        triggered: List[Tuple[str, Order, float]] = []
+        for _distance, _seq, order_id, fill_price in sorted(candidates):
+            order = self._orders.get(order_id)
+            if order is None:
+                continue
+            self.cancel(order_id)
+            if order.oco_group is not None:
+                for sibling in list(self._oco_groups.get(order.oco_group, ())):
+                    self.cancel(sibling)
+            triggered.append((order_id, order, fill_price))
+        return triggered
+
+    def _compact(self) -> None:
+        live = len(self._orders)
+        if len(self._below) + len(self._above) <= 2 * live + 64:
+            return
+        self._below = [entry for entry in self._below if entry[2] in self._orders]
+        self._above = [entry for entry in self._above if entry[2] in self._orders]
+        self._expiries = [entry for entry in self._expiries if entry[2] in self._orders]
+        heapq.heapify(self._below)
+        heapq.heapify(self._above)
+        heapq.heapify(self._expiries)
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List
 
+from backtesting_system.adapters.execution.order_book import PendingOrderBook
 from backtesting_system.interfaces.execution import ExecutionBroker
-from backtesting_system.models.orders import Fill, Order, OrderSide
+from backtesting_system.models.market import Candle
+from backtesting_system.models.orders import Fill, Order, OrderSide, OrderType
 
 
 @dataclass
@@ -14,12 +16,48 @@ class SimulatedBroker(ExecutionBroker):
     fee_per_trade: float = 0.0
     spread_bps: float = 0.0
     _fills: List[Fill] = field(default_factory=list)
+    _books: Dict[str, PendingOrderBook] = field(default_factory=dict)
+    _order_count: int = 0
 
     def place_order(self, order: Order) -> str:
+        self._order_count += 1
+        order_id = f"sim-{self._order_count}"
+        if order.order_type in (OrderType.LIMIT, OrderType.STOP):
+            self._books.setdefault(order.symbol, PendingOrderBook()).add(order_id, order)
+            return order_id
+
         fill_price = order.limit_price or order.stop_price
         if fill_price is None:
             raise ValueError("Market order requires limit_price for fill simulation.")
+        self._fill(order_id, order, fill_price, order.time or datetime.now(timezone.utc))
+        return order_id
+
+    def cancel_order(self, order_id: str) -> None:
+        for book in self._books.values():
+            if book.cancel(order_id):
+                return
+
+    def process_bar(self, bar: Candle, symbol: str) -> None:
+        """Expire and trigger ``symbol``'s resting orders against ``bar``; fills are queued for ``fetch_fills``."""
+        book = self._books.get(symbol)
+        if not book:
+            return
+        for order_id, order, price in book.trigger(bar):
+            self._fill(order_id, order, price, bar.time)
+
+    def is_pending(self, order_id: str) -> bool:
+        return any(order_id in book for book in self._books.values())
+
+    @property
+    def pending_orders(self) -> int:
+        return sum(len(book) for book in self._books.values())
+
+    def fetch_fills(self) -> list[Fill]:
+        fills = list(self._fills)
+        self._fills.clear()
+        return fills
 
+    def _fill(self, order_id: str, order: Order, fill_price: float, time: datetime) -> None:
         slippage = fill_price * (self.slippage_bps / 10000.0)
         spread = fill_price * (self.spread_bps / 10000.0)
         if order.side == OrderSide.BUY:
@@ -32,15 +70,7 @@ class SimulatedBroker(ExecutionBroker):
             price=fill_price,
             fees=self.fee_per_trade,
             slippage=slippage + spread,
-            time=order.time or datetime.now(timezone.utc),
+            time=time,
+            order_id=order_id,
         )
         self._fills.append(fill)
-        return f"sim-{len(self._fills)}"
-
-    def cancel_order(self, order_id: str) -> None:
-        return None
-
-    def fetch_fills(self) -> list[Fill]:
-        fills = list(self._fills)
-        self._fills.clear()
-        return fills
@@ -4,7 +4,8 @@ import csv
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Tuple
 
 from backtesting_system.analytics.performance_metrics import (
     calmar_ratio,
@@ -24,6 +25,7 @@ from backtesting_system.analytics.portfolio_analysis import (
     weekly_returns,
 )
 from backtesting_system.core.backtest_engine import BacktestEngine
+from backtesting_system.models.analytics import EquityBuffer, TradeLog
 
 
 def _years_between(start: datetime, end: datetime) -> float:
@@ -43,9 +45,39 @@ def _max_consecutive_losses(pnls: Iterable[float]) -> int:
     return max_streak
 
 
+def _equity_columns(engine: BacktestEngine) -> Tuple[List[datetime], List[float]]:
+    curve = engine.equity_curve
+    if isinstance(curve, EquityBuffer):
+        return curve.times, curve.equities.tolist()
+    return [point.time for point in curve], [point.equity for point in curve]
+
+
+def _trade_columns(engine: BacktestEngine) -> Tuple[List[float], List[datetime], List[datetime]]:
+    trades = engine.trades
+    if isinstance(trades, TradeLog):
+        return trades.pnl.tolist(), trades.entry_time, trades.exit_time
+    return [t.pnl for t in trades], [t.entry_time for t in trades], [t.exit_time for t in trades]
+
+
 def build_report(engine: BacktestEngine) -> Dict[str, Any]:
-    equity_curve = [point.equity for point in engine.equity_curve]
-    equity_points = [(point.time, point.equity) for point in engine.equity_curve] if engine.equity_curve else []
+    timer = engine.phase_timer if getattr(engine, "profile", False) else None
+    if timer is None:
+        report = _build_report(engine)
+    else:
+        # Timed outside the engine's timer, so its summary (and the profile JSON
+        # written by the run) does not change with each report built.
+        started = perf_counter()
+        report = _build_report(engine)
+        report["profile"] = {**timer.summary(), "reporting_seconds": perf_counter() - started}
+    funnel = getattr(engine.strategy, "filter_funnel", None)
+    if funnel is not None and funnel.calls:
+        report["filter_funnel"] = funnel.summary()
+    return report
+
+
+def _build_report(engine: BacktestEngine) -> Dict[str, Any]:
+    equity_times, equity_curve = _equity_columns(engine)
+    equity_points = list(zip(equity_times, equity_curve))
     if not equity_points:
         return {
             "initial_capital": engine.initial_capital,
@@ -77,10 +109,11 @@ def build_report(engine: BacktestEngine) -> Dict[str, Any]:
         }
     daily_returns_series = list(daily_returns(equity_points).values())
     returns = daily_returns_series
-    gross_profit = sum(trade.pnl for trade in engine.trades if trade.pnl > 0)
-    gross_loss = sum(trade.pnl for trade in engine.trades if trade.pnl < 0)
-    wins = sum(1 for trade in engine.trades if trade.pnl > 0)
-    total = len(engine.trades)
+    pnls, entry_times, exit_times = _trade_columns(engine)
+    gross_profit = sum(pnl for pnl in pnls if pnl > 0)
+    gross_loss = sum(pnl for pnl in pnls if pnl < 0)
+    wins = sum(1 for pnl in pnls if pnl > 0)
+    total = len(pnls)
     win_rate = wins / total if total else 0.0
     win_rate_p_value = None
     if total:
@@ -96,18 +129,14 @@ def build_report(engine: BacktestEngine) -> Dict[str, Any]:
         monthly_win_rate = sum(1 for v in month_returns.values() if v > 0) / len(month_returns)
     weekly_avg = sum(week_returns.values()) / len(week_returns) if week_returns else 0.0
     daily_avg = sum(day_returns.values()) / len(day_returns) if day_returns else 0.0
-    if engine.equity_curve:
-        start_time = engine.equity_curve[0].time
-        end_time = engine.equity_curve[-1].time
-        years = _years_between(start_time, end_time)
+    if equity_times:
+        years = _years_between(equity_times[0], equity_times[-1])
     else:
         years = 0.0
     average_duration = 0.0
-    if engine.trades:
-        total_seconds = sum(
-            (trade.exit_time - trade.entry_time).total_seconds() for trade in engine.trades
-        )
-        average_duration = total_seconds / len(engine.trades)
+    if total:
+        total_seconds = sum((exit_time - entry_time).total_seconds() for entry_time, exit_time in zip(entry_times, exit_times))
+        average_duration = total_seconds / total
 
     avg_trade = (gross_profit + gross_loss) / total if total else 0.0
     avg_win = (gross_profit / wins) if wins else 0.0
@@ -132,7 +161,7 @@ def build_report(engine: BacktestEngine) -> Dict[str, Any]:
         "calmar": calmar_ratio(annual_return, calculate_drawdown(equity_curve)),
         "k_ratio": k_ratio(returns),
         "ulcer_index": ulcer_index(equity_curve),
-        "recovery_factor": recovery_factor(sum(t.pnl for t in engine.trades), calculate_drawdown(equity_curve)),
+        "recovery_factor": recovery_factor(sum(pnls), calculate_drawdown(equity_curve)),
         "monthly_win_rate": monthly_win_rate,
         "daily_avg_return": daily_avg,
         "weekly_avg_return": weekly_avg,
@@ -141,7 +170,7 @@ def build_report(engine: BacktestEngine) -> Dict[str, Any]:
         "avg_loss": avg_loss,
         "win_loss_ratio": win_loss_ratio,
         "expectancy": expectancy,
-        "max_consecutive_losses": _max_consecutive_losses([t.pnl for t in engine.trades]),
+        "max_consecutive_losses": _max_consecutive_losses(pnls),
         "average_trade_duration_seconds": average_duration,
     }
 
@@ -188,7 +217,7 @@ def write_trades(engine: BacktestEngine, output_path: Path) -> None:
 def write_trades_detailed(engine: BacktestEngine, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     trades = sorted(engine.trades, key=lambda t: t.exit_time)
-    equity_curve = engine.equity_curve
+    curve_times, curve_values = _equity_columns(engine)
     equity_points: list[tuple[datetime, float]] = []
     equity_values: list[float] = []
     equity_index = 0
@@ -224,11 +253,11 @@ def write_trades_detailed(engine: BacktestEngine, output_path: Path) -> None:
         ])
 
         for idx, trade in enumerate(trades, start=1):
-            while equity_index < len(equity_curve) and equity_curve[equity_index].time <= trade.exit_time:
-                point = equity_curve[equity_index]
-                equity_points.append((point.time, point.equity))
-                equity_values.append(point.equity)
-                peak_equity = max(peak_equity, point.equity)
+            while equity_index < len(curve_times) and curve_times[equity_index] <= trade.exit_time:
+                point_equity = curve_values[equity_index]
+                equity_points.append((curve_times[equity_index], point_equity))
+                equity_values.append(point_equity)
+                peak_equity = max(peak_equity, point_equity)
                 equity_index += 1
 
             equity_at_exit = equity_values[-1] if equity_values else engine.initial_capital
@@ -39,4 +39,7 @@ DEFAULT_PARAMS = {
     "ma_stop_pct": 0.002,
     "ma_target_multiple": 2.0,
     "ma_cooldown_bars": 1,
+    "profile_engine": False,
+    # JSONL file for WeeklyProfileStrategy signals; off unless the caller names one.
+    "signal_log_path": None,
 }
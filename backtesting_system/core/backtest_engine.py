@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
 from typing import List, Optional
 
+from backtesting_system.core.calendar_features import CalendarColumns, day_id, week_id
+from backtesting_system.core.checkpoint import latest_checkpoint, load_checkpoint, save_checkpoint
 from backtesting_system.core.event_bus import Event, EventBus
+from backtesting_system.core.market_features import MarketFeatures
+from backtesting_system.core.profiling import PhaseTimer
+from backtesting_system.core.strategy_base import (
+    IDLE_FOREVER,
+    strategy_idle,
+    strategy_run_end,
+    strategy_wake_time,
+)
 from backtesting_system.interfaces.execution import ExecutionBroker
 from backtesting_system.interfaces.strategy import StrategyInterface
-from backtesting_system.models.analytics import EquityPoint, TradeRecord
-from backtesting_system.models.orders import Order, OrderSide, OrderType, Position
+from backtesting_system.models.analytics import EquityBuffer, TradeLog
+from backtesting_system.models.orders import Fill, Order, OrderSide, OrderType, Position
 from backtesting_system.core.risk_manager import RiskManager
 
 
@@ -22,27 +35,155 @@ class BacktestEngine:
     stop_slippage_pips: float = 0.5
     max_daily_risk: float | None = None
     max_weekly_risk: float | None = None
+    checkpoint_dir: str | Path | None = None
+    checkpoint_every: int = 0
+    profile: bool = False
+    profile_path: str | Path | None = None
+    profile_strategy_methods: tuple = ()
+    phase_timer: PhaseTimer | None = None
     event_bus: EventBus = field(default_factory=EventBus)
     positions: List[Position] = field(default_factory=list)
-    trades: List[TradeRecord] = field(default_factory=list)
-    equity_curve: List[EquityPoint] = field(default_factory=list)
+    trades: TradeLog = field(default_factory=TradeLog)
+    equity_curve: EquityBuffer = field(default_factory=EquityBuffer)
     cash: float = field(init=False)
     history: List = field(default_factory=list)
-    _current_day: tuple | None = None
-    _current_week: tuple | None = None
+    features: MarketFeatures = field(default_factory=MarketFeatures)
+    calendar: CalendarColumns | None = None
+    _current_day: int | None = None
+    _current_week: int | None = None
     _daily_pnl: float = 0.0
     _weekly_pnl: float = 0.0
+    _pending_entries: dict = field(default_factory=dict)
+    _bars_processed: int = 0
+    _wake_at: datetime | None = None
+    _handler_registered: bool = False
+    # (equity points, trades, byte offset) already in the checkpoint journal.
+    _journaled: tuple | None = None
+
+    # Engine methods timed per phase when profiling.
+    PROFILED_PHASES = {
+        "_rollover_bar": "rollover",
+        "_update_positions": "position_updates",
+        "_process_pending_orders": "pending_orders",
+        "process_signal": "order_execution",
+        "_mark_to_market": "mark_to_market",
+        "_skip_flat_bars": "flat_fast_path",
+    }
 
     def __post_init__(self) -> None:
         self.cash = self.initial_capital
-
-    def run_backtest(self, data, symbol: str, show_progress: bool = False, progress_every: int = 5000) -> None:
-        self.event_bus.register("MarketEvent", self._on_market_event)
-        for idx, bar in enumerate(data, start=1):
-            self.history.append(bar)
-            self.event_bus.emit(Event(type="MarketEvent", payload={"bar": bar, "symbol": symbol}))
-            if show_progress and idx % progress_every == 0:
-                print(f"Processed {idx} bars...")
+        if self.profile and self.phase_timer is None:
+            self.phase_timer = PhaseTimer()
+
+    def run_backtest(
+        self,
+        data,
+        symbol: str,
+        show_progress: bool = False,
+        progress_every: int = 5000,
+        resume: bool = False,
+    ) -> None:
+        self._ensure_handler()
+        data = list(data)
+        start = 0
+        if resume and self.checkpoint_dir is not None:
+            checkpoint = latest_checkpoint(self.checkpoint_dir)
+            if checkpoint is not None:
+                start = load_checkpoint(self, checkpoint, data)
+                print(f"Resumed from {checkpoint.name} at bar {self._bars_processed}")
+        self.calendar = CalendarColumns.from_candles([*self.history, *data[start:]])
+        timer = self.start_profiling()
+        if timer is None:
+            try:
+                self._run_bars(data, start, symbol, show_progress, progress_every)
+            finally:
+                strategy_run_end(self.strategy)
+            return
+        bars_before = self._bars_processed
+        try:
+            with timer.phase("run"):
+                self._run_bars(data, start, symbol, show_progress, progress_every)
+        finally:
+            self.stop_profiling(self._bars_processed - bars_before)
+            strategy_run_end(self.strategy)
+        self.write_profile()
+
+    def start_profiling(self) -> PhaseTimer | None:
+        """Install the phase timer on the engine and strategy methods and enable the strategy's filter funnel; ``None`` when not profiling."""
+        timer = self.phase_timer if self.profile else None
+        if timer is not None:
+            strategy_methods = ("generate_signals", "next_signal_time", *self.profile_strategy_methods)
+            timer.instrument(self, self.PROFILED_PHASES)
+            timer.instrument(self.strategy, {name: f"strategy.{name}" for name in strategy_methods})
+            funnel = getattr(self.strategy, "filter_funnel", None)
+            if funnel is not None:
+                funnel.enabled = True
+        return timer
+
+    def stop_profiling(self, bars: int) -> None:
+        """Undo ``start_profiling`` and count ``bars`` as processed under the timer and the filter funnel."""
+        if self.profile and self.phase_timer is not None:
+            self.phase_timer.restore()
+            self.phase_timer.bars += bars
+            funnel = getattr(self.strategy, "filter_funnel", None)
+            if funnel is not None:
+                funnel.enabled = False
+                funnel.bars += bars
+
+    def write_profile(self) -> None:
+        if self.profile and self.phase_timer is not None and self.profile_path is not None:
+            self.phase_timer.write_json(self.profile_path)
+
+    def _run_bars(self, data: list, start: int, symbol: str, show_progress: bool, progress_every: int) -> None:
+        checkpointing = self.checkpoint_dir is not None and self.checkpoint_every > 0
+        idx = start
+        while idx < len(data):
+            end = self._flat_run_end(data, idx)
+            if checkpointing:
+                end = min(end, idx + self.checkpoint_every - self._bars_processed % self.checkpoint_every)
+            before = self._bars_processed
+            if end > idx:
+                self._skip_flat_bars(data[idx:end])
+                idx = end
+            else:
+                bar = data[idx]
+                self.history.append(bar)
+                self.event_bus.emit(Event(type="MarketEvent", payload={"bar": bar, "symbol": symbol}))
+                self._bars_processed += 1
+                idx += 1
+            if show_progress and self._bars_processed // progress_every != before // progress_every:
+                print(f"Processed {self._bars_processed} bars...")
+            if checkpointing and self._bars_processed % self.checkpoint_every == 0:
+                self._save_checkpoint()
+        if checkpointing and start < len(data):
+            self._save_checkpoint()
+
+    def _save_checkpoint(self) -> None:
+        if self.profile and self.phase_timer is not None:
+            with self.phase_timer.suspended():
+                save_checkpoint(self, self.checkpoint_dir)
+        else:
+            save_checkpoint(self, self.checkpoint_dir)
+
+    def _flat_run_end(self, data: list, idx: int) -> int:
+        """End of the run of bars from ``idx`` that need no work: no exposure and the strategy asleep."""
+        if self.positions or self._pending_entries or self._wake_at is None:
+            return idx
+        if self._wake_at == IDLE_FOREVER:
+            return len(data)
+        return bisect_left(data, self._wake_at, lo=idx, key=lambda c: c.time)
+
+    def _skip_flat_bars(self, bars: list) -> None:
+        # Equity is flat at cash; only the day/week rollover of the last bar matters.
+        self.history.extend(bars)
+        self._rollover_bar(bars[-1], len(self.history) - 1)
+        self.equity_curve.add_flat([bar.time for bar in bars], self.cash)
+        self._bars_processed += len(bars)
+
+    def _ensure_handler(self) -> None:
+        if not self._handler_registered:
+            self.event_bus.register("MarketEvent", self._on_market_event)
+            self._handler_registered = True
 
     def process_signal(self, signal: dict, current_price: float, bar_index: int) -> None:
         direction = signal.get("direction")
@@ -74,32 +215,60 @@ class BacktestEngine:
         confluence = signal.get("confluence")
 
         side = OrderSide.BUY if direction == "long" else OrderSide.SELL
+        order_type = OrderType(signal.get("order_type", OrderType.MARKET))
         order = Order(
             symbol=symbol,
             side=side,
             quantity=size,
-            order_type=OrderType.MARKET,
-            limit_price=entry,
+            order_type=order_type,
+            limit_price=entry if order_type != OrderType.STOP else None,
+            stop_price=entry if order_type == OrderType.STOP else None,
             time=signal.get("time"),
+            expires_at=signal.get("expires_at"),
+            oco_group=signal.get("oco_group"),
         )
-        self.broker.place_order(order)
+        order_id = self.broker.place_order(order)
+        if order_type != OrderType.MARKET:
+            self._pending_entries[order_id] = {"stop": stop, "target": target, "confluence": confluence}
+            return
         fills = self.broker.fetch_fills()
         if not fills:
             return
-        fill = fills[-1]
+        self._open_position(fills[-1], stop, target, confluence)
+
+    def _open_position(self, fill: Fill, stop: float, target, confluence) -> None:
         self.cash -= fill.fees
         position = Position(
-            symbol=symbol,
-            side=side,
+            symbol=fill.order.symbol,
+            side=fill.order.side,
             entry=fill.price,
             stop=stop,
             target=target,
-            size=size,
+            size=fill.order.quantity,
             open_time=fill.time,
+            confluence=confluence,
         )
-        position.confluence = confluence  # type: ignore[attr-defined]
         self.positions.append(position)
 
+    def _process_pending_orders(self, bar, symbol: str) -> None:
+        process_bar = getattr(self.broker, "process_bar", None)
+        if not self._pending_entries or process_bar is None:
+            return
+        process_bar(bar, symbol)
+        for fill in self.broker.fetch_fills():
+            meta = self._pending_entries.pop(fill.order_id, None)
+            if meta is not None:
+                self._open_position(fill, meta["stop"], meta["target"], meta["confluence"])
+        if len(self._pending_entries) != getattr(self.broker, "pending_orders", 0):
+            # Entries that expired or lost their OCO race are no longer resting.
+            self._pending_entries = {
+                order_id: meta for order_id, meta in self._pending_entries.items() if self.broker.is_pending(order_id)
+            }
+
+    def cancel_pending_entry(self, order_id: str) -> None:
+        self.broker.cancel_order(order_id)
+        self._pending_entries.pop(order_id, None)
+
     def apply_risk_management(self, position: Position) -> Position:
         return position
 
@@ -121,35 +290,52 @@ class BacktestEngine:
         return returns
 
     def generate_report(self) -> dict:
-        return {
+        report = {
             "initial_capital": self.initial_capital,
             "final_equity": self.equity_curve[-1].equity if self.equity_curve else self.initial_capital,
             "trades": len(self.trades),
         }
+        if self.profile and self.phase_timer is not None:
+            report["profile"] = self.phase_timer.summary()
+        funnel = getattr(self.strategy, "filter_funnel", None)
+        if funnel is not None and funnel.calls:
+            report["filter_funnel"] = funnel.summary()
+        return report
 
     def _on_market_event(self, event: Event) -> None:
         bar = event.payload["bar"]
         symbol = event.payload["symbol"]
 
-        self._rollover_timeframes(bar.time)
-
-        self._update_positions(bar)
-        signal = self.strategy.generate_signals({
-            "bar": bar,
-            "symbol": symbol,
-            "history": self.history,
-        })
+        self._rollover_bar(bar, len(self.history) - 1)
+
+        if self.positions:
+            self._update_positions(bar)
+        self._process_pending_orders(bar, symbol)
+        signal = {}
+        if not strategy_idle(self._wake_at, bar.time):
+            data = {
+                "bar": bar,
+                "symbol": symbol,
+                "history": self.history,
+                "features": self.features,
+                "calendar": self.calendar,
+            }
+            signal = self.strategy.generate_signals(data)
+            self._wake_at = strategy_wake_time(self.strategy, data)
         if signal and self._risk_limits_ok():
             signal.setdefault("symbol", symbol)
             signal.setdefault("time", bar.time)
             self.process_signal(signal, bar.close, 0)
 
-        equity = self._mark_to_market(bar)
-        self.equity_curve.append(EquityPoint(time=bar.time, equity=equity, drawdown=0.0))
+        equity = self._mark_to_market(bar) if self.positions else self.cash
+        self.equity_curve.add(bar.time, equity)
 
-    def _update_positions(self, bar) -> None:
+    def _update_positions(self, bar, symbol: str | None = None) -> None:
         remaining: List[Position] = []
         for position in self.positions:
+            if symbol is not None and position.symbol != symbol:
+                remaining.append(position)
+                continue
             if self.partial_exit_enabled:
                 self._maybe_partial_exit(position, bar)
             exit_price = self._check_exit(position, bar)
@@ -168,21 +354,19 @@ class BacktestEngine:
             risk_per_unit = abs(position.entry - position.stop) if position.stop is not None else None
             risk_amount = (risk_per_unit * (position.remaining_size or position.size)) if risk_per_unit is not None else None
             r_multiple = (pnl / risk_amount) if risk_amount else None
-            self.trades.append(
-                TradeRecord(
-                    symbol=position.symbol,
-                    entry_time=position.open_time,
-                    exit_time=position.close_time,
-                    entry_price=position.entry,
-                    exit_price=exit_price,
-                    size=position.remaining_size or position.size,
-                    pnl=pnl,
-                    side=position.side.value,
-                    stop=position.stop,
-                    target=position.target,
-                    r_multiple=r_multiple,
-                    confluence=getattr(position, "confluence", None),
-                )
+            self.trades.add(
+                symbol=position.symbol,
+                entry_time=position.open_time,
+                exit_time=position.close_time,
+                entry_price=position.entry,
+                exit_price=exit_price,
+                size=position.remaining_size or position.size,
+                pnl=pnl,
+                side=position.side.value,
+                stop=position.stop,
+                target=position.target,
+                r_multiple=r_multiple,
+                confluence=position.confluence,
             )
         self.positions = remaining
 
@@ -239,14 +423,23 @@ class BacktestEngine:
                 unrealized += (position.entry - bar.close) * size
         return self.cash + unrealized
 
+    def _rollover_bar(self, bar, index: int) -> None:
+        calendar = self.calendar
+        if calendar is not None and 0 <= index < len(calendar):
+            day, week, _weekday = calendar.at(index)
+            self._rollover_ids(day, week)
+        else:
+            self._rollover_timeframes(bar.time)
+
     def _rollover_timeframes(self, timestamp) -> None:
-        day_key = (timestamp.year, timestamp.month, timestamp.day)
-        week_key = timestamp.isocalendar()[:2]
-        if self._current_day != day_key:
-            self._current_day = day_key
+        self._rollover_ids(day_id(timestamp), week_id(timestamp))
+
+    def _rollover_ids(self, day: int, week: int) -> None:
+        if self._current_day != day:
+            self._current_day = day
             self._daily_pnl = 0.0
-        if self._current_week != week_key:
-            self._current_week = week_key
+        if self._current_week != week:
+            self._current_week = week
             self._weekly_pnl = 0.0
 
     def _risk_limits_ok(self) -> bool:
@@ -295,20 +488,18 @@ class BacktestEngine:
         self._weekly_pnl += pnl
         exit_fee = getattr(self.broker, "fee_per_trade", 0.0)
         self.cash -= exit_fee
-        self.trades.append(
-            TradeRecord(
-                symbol=position.symbol,
-                entry_time=position.open_time,
-                exit_time=bar.time,
-                entry_price=position.entry,
-                exit_price=exit_price,
-                size=partial_size,
-                pnl=pnl,
-                side=position.side.value,
-                stop=position.stop,
-                target=position.target,
-                confluence=getattr(position, "confluence", None),
-            )
+        self.trades.add(
+            symbol=position.symbol,
+            entry_time=position.open_time,
+            exit_time=bar.time,
+            entry_price=position.entry,
+            exit_price=exit_price,
+            size=partial_size,
+            pnl=pnl,
+            side=position.side.value,
+            stop=position.stop,
+            target=position.target,
+            confluence=position.confluence,
         )
 
         position.remaining_size = (position.remaining_size or position.size) - partial_size
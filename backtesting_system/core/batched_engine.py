@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+import numpy as np
+
+from backtesting_system.core.backtest_engine import BacktestEngine
+from backtesting_system.core.calendar_features import CalendarColumns
+from backtesting_system.core.market_features import MarketFeatures
+from backtesting_system.core.strategy_base import (
+    IDLE_FOREVER,
+    strategy_idle,
+    strategy_run_end,
+    strategy_wake_time,
+)
+from backtesting_system.interfaces.strategy import StrategyInterface
+from backtesting_system.models.analytics import EquityBuffer, TradeLog
+from backtesting_system.models.orders import OrderSide, OrderType, Position
+
+
+@dataclass
+class _PositionSlot:
+    """One strategy entry, held as per-combination arrays along the parameter axis."""
+
+    symbol: str
+    side: OrderSide
+    target: float | None
+    open_time: object
+    confluence: float | None
+    entry: np.ndarray
+    stop: np.ndarray
+    size: np.ndarray
+    remaining: np.ndarray
+    trail: np.ndarray
+    partial_done: np.ndarray
+    open: np.ndarray
+
+
+@dataclass
+class BatchedBacktestEngine:
+    """
+    Evaluate a grid of execution settings in lockstep over one bar loop.
+
+    ``engines`` are fully configured BacktestEngine instances, one per grid
+    combination, that share ``strategy``. Their execution settings (capital,
+    risk per trade, partial exits, broker costs, stop slippage, risk limits)
+    are read into arrays along a parameter axis; cash, positions and equity
+    are advanced for all combinations at once. Strategy signals do not depend
+    on execution settings, so the strategy runs once per bar for the whole
+    grid. After the run, each engine holds the same cash, trades, positions
+    and equity curve a separate ``run_backtest`` would have produced, so
+    reporting works on them unchanged.
+
+    Only market entries are supported; resting LIMIT/STOP entries depend on
+    the broker's order book and need a per-combination run.
+    """
+
+    strategy: StrategyInterface
+    engines: Sequence[BacktestEngine]
+    history: List = field(default_factory=list)
+    features: MarketFeatures = field(default_factory=MarketFeatures)
+
+    def __post_init__(self) -> None:
+        if not self.engines:
+            raise ValueError("BatchedBacktestEngine needs at least one engine.")
+        managers = [engine.risk_manager for engine in self.engines]
+        if any(manager is None for manager in managers) and any(manager is not None for manager in managers):
+            raise ValueError("Engines must either all or none use a RiskManager.")
+        self.risk_manager = managers[0]
+
+        def column(values) -> np.ndarray:
+            return np.array([float(v) for v in values], dtype=float)
+
+        self.initial_capital = column(e.initial_capital for e in self.engines)
+        self.risk_per_trade = column(e.risk_per_trade for e in self.engines)
+        self.partial_exit_enabled = np.array([bool(e.partial_exit_enabled) for e in self.engines])
+        self.stop_slippage_pips = column(e.stop_slippage_pips for e in self.engines)
+        self.slippage_bps = column(getattr(e.broker, "slippage_bps", 0.0) or 0.0 for e in self.engines)
+        self.spread_bps = column(getattr(e.broker, "spread_bps", 0.0) or 0.0 for e in self.engines)
+        self.fee_per_trade = column(getattr(e.broker, "fee_per_trade", 0.0) for e in self.engines)
+        self.max_daily_risk = column(np.inf if e.max_daily_risk is None else e.max_daily_risk for e in self.engines)
+        self.max_weekly_risk = column(np.inf if e.max_weekly_risk is None else e.max_weekly_risk for e in self.engines)
+        self._check_daily = any(e.max_daily_risk is not None for e in self.engines)
+        self._check_weekly = any(e.max_weekly_risk is not None for e in self.engines)
+
+        width = len(self.engines)
+        self.cash = self.initial_capital.copy()
+        self.trades: List[TradeLog] = [TradeLog() for _ in range(width)]
+        self.slots: List[_PositionSlot] = []
+        self._daily_pnl = np.zeros(width)
+        self._weekly_pnl = np.zeros(width)
+        self._current_day: int | None = None
+        self._current_week: int | None = None
+        self.calendar: CalendarColumns | None = None
+        self._wake_at = None
+
+    def run_backtest(self, data, symbol: str, show_progress: bool = False, progress_every: int = 5000) -> None:
+        data = list(data)
+        self.calendar = CalendarColumns.from_candles([*self.history, *data])
+        equity = np.empty((len(data), len(self.engines)))
+        idx = 0
+        while idx < len(data):
+            end = self._flat_run_end(data, idx)
+            if end > idx:
+                self.history.extend(data[idx:end])
+                self._rollover(len(self.history) - 1)
+                equity[idx:end] = self.cash
+            else:
+                bar = data[idx]
+                self.history.append(bar)
+                self._on_bar(bar, symbol)
+                equity[idx] = self._mark_to_market(bar) if self.slots else self.cash
+                end = idx + 1
+            if show_progress and end // progress_every != idx // progress_every:
+                print(f"Processed {end} bars...")
+            idx = end
+        strategy_run_end(self.strategy)
+        self._write_back(data, equity)
+
+    def _flat_run_end(self, data: list, idx: int) -> int:
+        if self.slots or self._wake_at is None:
+            return idx
+        if self._wake_at == IDLE_FOREVER:
+            return len(data)
+        return bisect_left(data, self._wake_at, lo=idx, key=lambda c: c.time)
+
+    def _on_bar(self, bar, symbol: str) -> None:
+        self._rollover(len(self.history) - 1)
+        self._update_positions(bar)
+        if strategy_idle(self._wake_at, bar.time):
+            return
+        data = {
+            "bar": bar,
+            "symbol": symbol,
+            "history": self.history,
+            "features": self.features,
+            "calendar": self.calendar,
+        }
+        signal = self.strategy.generate_signals(data)
+        self._wake_at = strategy_wake_time(self.strategy, data)
+        if not signal:
+            return
+        allowed = self._risk_limits_ok()
+        if allowed.any():
+            signal.setdefault("symbol", symbol)
+            signal.setdefault("time", bar.time)
+            self._process_signal(signal, bar.close, allowed)
+
+    def _process_signal(self, signal: dict, current_price: float, allowed: np.ndarray) -> None:
+        direction = signal.get("direction")
+        if direction not in {"long", "short"}:
+            return
+        if OrderType(signal.get("order_type", OrderType.MARKET)) != OrderType.MARKET:
+            raise ValueError("BatchedBacktestEngine only supports market entries.")
+
+        entry = float(signal.get("entry", current_price))
+        stop = float(signal.get("stop", entry))
+        size = signal.get("size")
+        if size is None:
+            if self.risk_manager:
+                size = self.risk_manager.calculate_position_size(
+                    account_size=self.cash,
+                    risk_per_trade=self.risk_per_trade,
+                    entry=entry,
+                    stop=stop,
+                )
+            else:
+                size = 1.0
+        if self.risk_manager and "atr" in signal and "average_atr" in signal:
+            volatility_multiplier = self.risk_manager.adjust_risk_for_volatility(
+                atr=float(signal["atr"]),
+                average_atr=float(signal["average_atr"]),
+            )
+            size = size / max(volatility_multiplier, 0.0001)
+        width = len(self.engines)
+        size = np.broadcast_to(np.asarray(size, dtype=float), (width,)).copy()
+
+        side = OrderSide.BUY if direction == "long" else OrderSide.SELL
+        slippage = entry * (self.slippage_bps / 10000.0)
+        spread = entry * (self.spread_bps / 10000.0)
+        fill_price = entry + (slippage + spread) if side == OrderSide.BUY else entry - (slippage + spread)
+        self.cash = np.where(allowed, self.cash - self.fee_per_trade, self.cash)
+        self.slots.append(
+            _PositionSlot(
+                symbol=signal.get("symbol"),
+                side=side,
+                target=signal.get("target"),
+                open_time=signal.get("time"),
+                confluence=signal.get("confluence"),
+                entry=fill_price,
+                stop=np.full(width, stop),
+                size=size,
+                remaining=size.copy(),
+                trail=np.full(width, np.nan),
+                partial_done=np.zeros(width, dtype=bool),
+                open=allowed.copy(),
+            )
+        )
+
+    def _update_positions(self, bar) -> None:
+        for slot in self.slots:
+            partial = slot.open & self.partial_exit_enabled
+            if partial.any():
+                self._maybe_partial_exit(slot, bar, partial)
+            self._close_hits(slot, bar)
+        self.slots = [slot for slot in self.slots if slot.open.any()]
+
+    def _close_hits(self, slot: _PositionSlot, bar) -> None:
+        stop_slip = self.stop_slippage_pips * slot.stop / 10000
+        if slot.side == OrderSide.BUY:
+            stop_hit = bar.low <= slot.stop
+            target_hit = slot.target is not None and bar.high >= slot.target
+            stop_exit = slot.stop - stop_slip
+        else:
+            stop_hit = bar.high >= slot.stop
+            target_hit = slot.target is not None and bar.low <= slot.target
+            stop_exit = slot.stop + stop_slip
+        hit = slot.open & (stop_hit | target_hit)
+        if not hit.any():
+            return
+        exit_price = np.where(stop_hit, stop_exit, slot.target if target_hit else 0.0)
+        exit_price = self._apply_exit_costs(exit_price, slot.side)
+        size = np.where(slot.remaining != 0, slot.remaining, slot.size)
+        pnl = self._calculate_pnl(slot, exit_price, size)
+        self._book_pnl(pnl, hit)
+        risk_amount = np.abs(slot.entry - slot.stop) * size
+        for k in np.flatnonzero(hit):
+            self.trades[k].add(
+                symbol=slot.symbol,
+                entry_time=slot.open_time,
+                exit_time=bar.time,
+                entry_price=float(slot.entry[k]),
+                exit_price=float(exit_price[k]),
+                size=float(size[k]),
+                pnl=float(pnl[k]),
+                side=slot.side.value,
+                stop=float(slot.stop[k]),
+                target=slot.target,
+                r_multiple=float(pnl[k] / risk_amount[k]) if risk_amount[k] else None,
+                confluence=slot.confluence,
+            )
+        slot.open = slot.open & ~hit
+
+    def _maybe_partial_exit(self, slot: _PositionSlot, bar, active: np.ndarray) -> None:
+        trailing = active & slot.partial_done & ~np.isnan(slot.trail)
+        pending = active & ~slot.partial_done
+        if trailing.any():
+            if slot.side == OrderSide.BUY:
+                trail = np.maximum(slot.trail, bar.low)
+                stop = np.maximum(slot.stop, trail)
+            else:
+                trail = np.minimum(slot.trail, bar.high)
+                stop = np.minimum(slot.stop, trail)
+            slot.trail = np.where(trailing, trail, slot.trail)
+            slot.stop = np.where(trailing, stop, slot.stop)
+        if not pending.any():
+            return
+
+        risk = np.abs(slot.entry - slot.stop)
+        if slot.side == OrderSide.BUY:
+            one_r_target = slot.entry + risk
+            hit_one_r = bar.high >= one_r_target
+        else:
+            one_r_target = slot.entry - risk
+            hit_one_r = bar.low <= one_r_target
+        trail_percentage = 0.75
+        if self.risk_manager:
+            target = slot.target if slot.target else one_r_target
+            cfg = self.risk_manager.partial_exit_trail_stop(slot.entry, slot.stop, target)
+            trail_percentage = np.asarray(cfg.get("trail_percentage", trail_percentage), dtype=float)
+        remaining = np.where(slot.remaining != 0, slot.remaining, slot.size)
+        partial_size = np.minimum(slot.size * trail_percentage, remaining)
+        done = pending & (risk > 0) & hit_one_r & (partial_size > 0)
+        if not done.any():
+            return
+
+        exit_price = self._apply_exit_costs(one_r_target, slot.side)
+        pnl = self._calculate_pnl(slot, exit_price, partial_size)
+        self._book_pnl(pnl, done)
+        for k in np.flatnonzero(done):
+            self.trades[k].add(
+                symbol=slot.symbol,
+                entry_time=slot.open_time,
+                exit_time=bar.time,
+                entry_price=float(slot.entry[k]),
+                exit_price=float(exit_price[k]),
+                size=float(partial_size[k]),
+                pnl=float(pnl[k]),
+                side=slot.side.value,
+                stop=float(slot.stop[k]),
+                target=slot.target,
+                confluence=slot.confluence,
+            )
+        slot.remaining = np.where(done, remaining - partial_size, slot.remaining)
+        slot.partial_done = slot.partial_done | done
+        slot.stop = np.where(done, slot.entry, slot.stop)
+        slot.trail = np.where(done, bar.low if slot.side == OrderSide.BUY else bar.high, slot.trail)
+
+    def _book_pnl(self, pnl: np.ndarray, mask: np.ndarray) -> None:
+        self.cash = np.where(mask, self.cash + pnl, self.cash)
+        self._daily_pnl = np.where(mask, self._daily_pnl + pnl, self._daily_pnl)
+        self._weekly_pnl = np.where(mask, self._weekly_pnl + pnl, self._weekly_pnl)
+        self.cash = np.where(mask, self.cash - self.fee_per_trade, self.cash)
+
+    @staticmethod
+    def _calculate_pnl(slot: _PositionSlot, exit_price: np.ndarray, size: np.ndarray) -> np.ndarray:
+        if slot.side == OrderSide.BUY:
+            return (exit_price - slot.entry) * size
+        return (slot.entry - exit_price) * size
+
+    def _apply_exit_costs(self, exit_price: np.ndarray, side: OrderSide) -> np.ndarray:
+        total_bps = self.slippage_bps + self.spread_bps
+        adjustment = exit_price * (total_bps / 10000.0)
+        adjusted = exit_price - adjustment if side == OrderSide.BUY else exit_price + adjustment
+        return np.where(total_bps <= 0, exit_price, adjusted)
+
+    def _mark_to_market(self, bar) -> np.ndarray:
+        unrealized = np.zeros(len(self.engines))
+        for slot in self.slots:
+            size = np.where(slot.remaining != 0, slot.remaining, slot.size)
+            if slot.side == OrderSide.BUY:
+                move = (bar.close - slot.entry) * size
+            else:
+                move = (slot.entry - bar.close) * size
+            unrealized = np.where(slot.open, unrealized + move, unrealized)
+        return self.cash + unrealized
+
+    def _rollover(self, index: int) -> None:
+        day_key, week_key, _weekday = self.calendar.at(index)
+        if self._current_day != day_key:
+            self._current_day = day_key
+            self._daily_pnl = np.zeros(len(self.engines))
+        if self._current_week != week_key:
+            self._current_week = week_key
+            self._weekly_pnl = np.zeros(len(self.engines))
+
+    def _risk_limits_ok(self) -> np.ndarray:
+        allowed = np.ones(len(self.engines), dtype=bool)
+        if not self.risk_manager:
+            return allowed
+        daily_loss = np.maximum(0.0, -self._daily_pnl)
+        weekly_loss = np.maximum(0.0, -self._weekly_pnl)
+        if self._check_daily:
+            allowed &= self.risk_manager.apply_daily_drawdown_limit(daily_loss, self.max_daily_risk)
+        if self._check_weekly:
+            allowed &= self.risk_manager.apply_weekly_risk_limit(weekly_loss, self.max_weekly_risk)
+        return allowed
+
+    def _write_back(self, data: list, equity: np.ndarray) -> None:
+        times = [bar.time for bar in data]
+        for k, engine in enumerate(self.engines):
+            engine.cash = float(self.cash[k])
+            engine.trades = self.trades[k]
+            engine.equity_curve = EquityBuffer.from_columns(times, equity[:, k].tolist())
+            engine.history = self.history
+            engine.features = self.features
+            engine.calendar = self.calendar
+            engine.positions = [self._materialize(slot, k) for slot in self.slots if slot.open[k]]
+            engine._current_day = self._current_day
+            engine._current_week = self._current_week
+            engine._daily_pnl = float(self._daily_pnl[k])
+            engine._weekly_pnl = float(self._weekly_pnl[k])
+            engine._wake_at = self._wake_at
+            engine._bars_processed += len(data)
+
+    @staticmethod
+    def _materialize(slot: _PositionSlot, k: int) -> Position:
+        trail = float(slot.trail[k])
+        return Position(
+            symbol=slot.symbol,
+            side=slot.side,
+            entry=float(slot.entry[k]),
+            stop=float(slot.stop[k]),
+            target=slot.target,
+            size=float(slot.size[k]),
+            open_time=slot.open_time,
+            remaining_size=float(slot.remaining[k]),
+            partial_exit_done=bool(slot.partial_done[k]),
+            trail_stop=None if np.isnan(trail) else trail,
+            confluence=slot.confluence,
+        )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def day_id(dt: datetime) -> int:
+    """Calendar day of ``dt`` (wall-clock date) as days since 1970-01-01."""
+    return dt.toordinal() - EPOCH_ORDINAL
+
+
+def week_id(dt: datetime) -> int:
+    """ISO week of ``dt`` as ``iso_year * 100 + iso_week``."""
+    iso = dt.isocalendar()
+    return iso.year * 100 + iso.week
+
+
+def previous_week_id(week: int) -> int:
+    """Week before ``week``. Week 1 maps to week 52 of the prior ISO year, as the strategies always did."""
+    year, number = divmod(week, 100)
+    if number > 1:
+        return week - 1
+    return (year - 1) * 100 + 52
+
+
+def calendar_ids(dt: datetime) -> Tuple[int, int, int]:
+    return day_id(dt), week_id(dt), dt.weekday()
+
+
+class CalendarColumns:
+    """
+    Day id, ISO week id and weekday of every bar of a dataset, computed once.
+
+    Columns are int32 arrays aligned with the bar index, so per-bar calendar
+    checks compare integers instead of calling ``date()``/``isocalendar()``.
+    """
+
+    def __init__(self, day_ids: np.ndarray, week_ids: np.ndarray, weekdays: np.ndarray) -> None:
+        self.day_ids = day_ids
+        self.week_ids = week_ids
+        self.weekdays = weekdays
+        self._days: List[int] = day_ids.tolist()
+        self._weeks: List[int] = week_ids.tolist()
+        self._weekdays: List[int] = weekdays.tolist()
+        self.sorted = bool(np.all(np.diff(day_ids) >= 0)) if len(day_ids) else True
+
+    @classmethod
+    def from_candles(cls, candles: Sequence) -> "CalendarColumns":
+        days = np.fromiter((c.time.toordinal() - EPOCH_ORDINAL for c in candles), dtype=np.int64, count=len(candles))
+        weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday
+        thursdays = days - weekdays + 3  # the ISO year is the year of the week's Thursday
+        iso_years = thursdays.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+        jan_first = (iso_years - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+        weeks = (thursdays - jan_first) // 7 + 1
+        return cls(
+            day_ids=days.astype(np.int32),
+            week_ids=(iso_years * 100 + weeks).astype(np.int32),
+            weekdays=weekdays.astype(np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def at(self, index: int) -> Tuple[int, int, int]:
+        """``(day_id, week_id, weekday)`` of bar ``index``."""
+        return self._days[index], self._weeks[index], self._weekdays[index]
+
+    def day_start(self, index: int) -> int:
+        """Index of the first bar on the same day as bar ``index``; requires time-ordered bars."""
+        return int(np.searchsorted(self.day_ids[: index + 1], self._days[index], side="left"))
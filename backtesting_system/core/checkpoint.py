@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import pickle
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+CHECKPOINT_PREFIX = "engine_checkpoint_"
+JOURNAL_NAME = "engine_journal.pkl"
+
+# Engine attributes that make up a resumable run. The event bus is rebuilt on
+# resume because its handlers are bound methods of the live engine. ``history``
+# is rebuilt from the data, and equity points and trades go to an append-only
+# journal, so a snapshot does not grow with the run.
+ENGINE_STATE_FIELDS = (
+    "cash",
+    "positions",
+    "strategy",
+    "broker",
+    "_current_day",
+    "_current_week",
+    "_daily_pnl",
+    "_weekly_pnl",
+    "_pending_entries",
+    "_bars_processed",
+    "_wake_at",
+)
+EQUITY_COLUMNS = ("times", "equities", "drawdowns")
+
+
+class _StatePickler(pickle.Pickler):
+    """Pickles references to the engine's history (e.g. held by strategy caches) as a placeholder."""
+
+    def __init__(self, handle, history) -> None:
+        super().__init__(handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self._history = history
+
+    def persistent_id(self, obj):
+        return "history" if obj is self._history else None
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, handle, history) -> None:
+        super().__init__(handle)
+        self._history = history
+
+    def persistent_load(self, pid):
+        if pid != "history":
+            raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+        return self._history
+
+
+def save_checkpoint(engine, directory: str | Path) -> Path:
+    """Snapshot the engine state to ``directory``, replacing any earlier snapshot there."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    history = engine.history
+    state: Dict[str, Any] = {name: getattr(engine, name) for name in ENGINE_STATE_FIELDS}
+    state["history_bars"] = len(history)
+    state["last_bar_time"] = history[-1].time if history else None
+    state["journal"] = _append_journal(engine, directory / JOURNAL_NAME)
+    path = directory / f"{CHECKPOINT_PREFIX}{engine._bars_processed:09d}.pkl"
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("wb") as handle:
+        _StatePickler(handle, history).dump(state)
+    os.replace(tmp_path, path)
+    for stale in directory.glob(f"{CHECKPOINT_PREFIX}*.pkl"):
+        if stale != path:
+            stale.unlink()
+    return path
+
+
+def _append_journal(engine, path: Path) -> tuple:
+    """Append the equity points and trades added since the last snapshot; returns the new journal mark."""
+    equity_points, trade_count, offset = engine._journaled or (0, 0, 0)
+    curve, trades = engine.equity_curve, engine.trades
+    chunk = {
+        "equity": {name: getattr(curve, name)[equity_points:] for name in EQUITY_COLUMNS},
+        "trades": {name: getattr(trades, name)[trade_count:] for name in trades.__slots__},
+    }
+    with path.open("r+b" if offset else "wb") as handle:
+        # Drop anything a save that crashed before its snapshot left behind.
+        handle.truncate(offset)
+        handle.seek(offset)
+        pickle.dump(chunk, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        offset = handle.tell()
+    engine._journaled = (len(curve), len(trades), offset)
+    return engine._journaled
+
+
+def latest_checkpoint(directory: str | Path) -> Optional[Path]:
+    directory = Path(directory)
+    if not directory.exists():
+        return None
+    candidates = sorted(directory.glob(f"{CHECKPOINT_PREFIX}*.pkl"))
+    return candidates[-1] if candidates else None
+
+
+def load_checkpoint(engine, path: str | Path, data: Sequence) -> int:
+    """
+    Restore the engine from the snapshot at ``path``; ``history`` is rebuilt
+    from ``data``. Returns the index into ``data`` to resume from.
+    """
+    path = Path(path)
+    with path.open("rb") as handle:
+        state = _StateUnpickler(handle, engine.history).load()
+    start = 0
+    if state["last_bar_time"] is not None:
+        start = bisect_right(data, state["last_bar_time"], key=lambda c: c.time)
+    bars = state["history_bars"]
+    if start < bars:
+        raise ValueError(f"{path.name} covers {bars} bars, data has only {start} up to its last bar")
+    # Fill in place: the unpickled strategy caches hold this same list.
+    engine.history[:] = data[start - bars : start]
+    for name in ENGINE_STATE_FIELDS:
+        setattr(engine, name, state[name])
+    _load_journal(engine, path.parent / JOURNAL_NAME, state["journal"])
+    return start
+
+
+def _load_journal(engine, path: Path, mark: tuple) -> None:
+    equity_points, trade_count, offset = mark
+    curve = type(engine.equity_curve)()
+    trades = type(engine.trades)()
+    with path.open("rb") as handle:
+        while handle.tell() < offset:
+            chunk = pickle.load(handle)
+            for name, column in chunk["equity"].items():
+                getattr(curve, name).extend(column)
+            for name, column in chunk["trades"].items():
+                getattr(trades, name).extend(column)
+    if len(curve) != equity_points or len(trades) != trade_count:
+        raise ValueError(f"{path.name} does not match its snapshot")
+    engine.equity_curve = curve
+    engine.trades = trades
+    engine._journaled = mark
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+from backtesting_system.core.calendar_features import EPOCH_ORDINAL, week_id
+from backtesting_system.models.market import Candle
+
+
+class DailyBarBuilder:
+    """
+    Daily candles of a growing candle history, maintained incrementally.
+
+    ``candles`` holds one candle per calendar day, stamped at UTC midnight.
+    Every candle but the last is a closed day and never changes again; the
+    last one is the day in progress and is replaced as its bars arrive.
+    ``day_ids``, ``week_ids`` and ``weekdays`` are aligned with ``candles``;
+    ``week_starts`` holds the index of each week's first candle, so a week's
+    candles are one slice (``week_slice``).
+    ``sync`` only consumes bars appended since the previous call, so a
+    time-ordered history costs O(1) per bar. Out-of-order bars fall back to
+    regrouping the whole history on every sync.
+    """
+
+    def __init__(self) -> None:
+        self.candles: List[Candle] = []
+        self.day_ids: List[int] = []
+        self.week_ids: List[int] = []
+        self.weekdays: List[int] = []
+        self.week_starts: List[int] = []
+        self._week_keys: List[int] = []
+        self._history: Sequence[Candle] | None = None
+        self._synced = 0
+        self._ordered = True
+
+    @property
+    def closed_days(self) -> int:
+        """Number of completed days, i.e. every candle before the current one."""
+        return max(len(self.candles) - 1, 0)
+
+    def week_slice(self, week: int) -> slice:
+        """Slice of ``candles`` (and the aligned lists) covering ``week``; empty if absent."""
+        idx = bisect_left(self._week_keys, week)
+        if idx == len(self._week_keys) or self._week_keys[idx] != week:
+            return slice(0, 0)
+        stop = self.week_starts[idx + 1] if idx + 1 < len(self.week_starts) else len(self.candles)
+        return slice(self.week_starts[idx], stop)
+
+    def sync(self, history: Sequence[Candle]) -> List[Candle]:
+        total = len(history)
+        if history is not self._history or total < self._synced:
+            self._reset(history)
+        if total == self._synced:
+            return self.candles
+        if self._ordered:
+            for candle in history[self._synced :]:
+                if not self._add(candle):
+                    self._ordered = False
+                    break
+        if not self._ordered:
+            self._regroup(history)
+        self._synced = total
+        return self.candles
+
+    def _reset(self, history: Sequence[Candle]) -> None:
+        self.candles = []
+        self.day_ids = []
+        self.week_ids = []
+        self.weekdays = []
+        self.week_starts = []
+        self._week_keys = []
+        self._history = history
+        self._synced = 0
+        self._ordered = True
+
+    def _add(self, candle: Candle) -> bool:
+        day = candle.time.toordinal() - EPOCH_ORDINAL
+        if self.day_ids and day == self.day_ids[-1]:
+            today = self.candles[-1]
+            self.candles[-1] = Candle(
+                time=today.time,
+                open=today.open,
+                high=candle.high if candle.high > today.high else today.high,
+                low=candle.low if candle.low < today.low else today.low,
+                close=candle.close,
+                volume=None,
+            )
+            return True
+        if self.day_ids and day < self.day_ids[-1]:
+            return False
+        self._open_day(day, candle, candle.high, candle.low, candle.close)
+        return True
+
+    def _open_day(self, day: int, first: Candle, high: float, low: float, close: float) -> None:
+        start = datetime(first.time.year, first.time.month, first.time.day, tzinfo=timezone.utc)
+        week = week_id(start)
+        if not self._week_keys or self._week_keys[-1] != week:
+            self.week_starts.append(len(self.candles))
+            self._week_keys.append(week)
+        self.candles.append(Candle(time=start, open=first.open, high=high, low=low, close=close, volume=None))
+        self.day_ids.append(day)
+        self.week_ids.append(week)
+        self.weekdays.append((day + 3) % 7)  # 1970-01-01 was a Thursday
+
+    def _regroup(self, history: Sequence[Candle]) -> None:
+        chunks: Dict[int, List[Candle]] = {}
+        for candle in history:
+            chunks.setdefault(candle.time.toordinal() - EPOCH_ORDINAL, []).append(candle)
+        self.candles, self.day_ids, self.week_ids, self.weekdays = [], [], [], []
+        self.week_starts, self._week_keys = [], []
+        for day in sorted(chunks):
+            chunk = chunks[day]
+            self._open_day(
+                day,
+                chunk[0],
+                max(c.high for c in chunk),
+                min(c.low for c in chunk),
+                chunk[-1].close,
+            )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List
 
 from backtesting_system.interfaces.data_source import DataSource
 from backtesting_system.models.market import Candle
@@ -20,6 +20,21 @@ class DataHandler:
             candles, report = self.validator.validate_candles(list(candles), symbol=symbol, timeframe=timeframe)
         return candles
 
+    def iter_ohlcv(self, symbol: str, timeframe: str, start_date, end_date) -> Iterator[Candle]:
+        """
+        Candles of ``load_ohlcv`` as a lazy stream when the source supports it.
+
+        The validator's full report needs the whole series, so only its
+        per-candle cleaning (dropping invalid OHLC) is applied here.
+        """
+        stream = getattr(self.data_source, "iter_ohlcv", None)
+        candles = stream(symbol, timeframe, start_date, end_date) if stream else iter(
+            self.data_source.load_ohlcv(symbol, timeframe, start_date, end_date)
+        )
+        if self.validator:
+            candles = (c for c in candles if self.validator.valid_ohlc(c))
+        return candles
+
     def get_volume_profile(self, symbol: str, date):
         return self.data_source.load_volume_profile(symbol, date)
 
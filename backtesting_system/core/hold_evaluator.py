@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from itertools import repeat
+from typing import List, Sequence
+
+import numpy as np
+
+from backtesting_system.core.backtest_engine import BacktestEngine
+from backtesting_system.core.calendar_features import CalendarColumns
+from backtesting_system.core.event_bus import Event
+from backtesting_system.core.strategy_base import IDLE_FOREVER, strategy_run_end
+from backtesting_system.models.market import Candle
+from backtesting_system.models.orders import OrderSide, Position
+
+_FIRST_WINDOW = 64
+
+
+def evaluate_buy_and_hold(engine: BacktestEngine, data: Sequence[Candle], symbol: str) -> BacktestEngine:
+    """
+    Leave ``engine`` in the state ``engine.run_backtest(data, symbol)`` would,
+    for a strategy that trades on its first bars and then sleeps for good
+    (``BuyHoldStrategy``).
+
+    Bars run through the engine as usual until the strategy reports
+    ``IDLE_FOREVER``. While a position is open after that, only bars where it
+    can change (its stop, target or partial-exit level is touched) go through
+    the engine; the equity of the bars before them is the marked-to-market
+    close computed on arrays with the engine's float operations. Once flat,
+    the rest is the engine's own flat run, so the gain over ``run_backtest``
+    is limited to the bars held. The result matches the engine bar for bar.
+    Engines that resume, checkpoint or profile use ``run_backtest`` instead.
+    """
+    data = list(data)
+    if (
+        engine.history
+        or engine.positions
+        or engine.profile
+        or (engine.checkpoint_dir is not None and engine.checkpoint_every > 0)
+    ):
+        engine.run_backtest(data, symbol)
+        return engine
+    engine._ensure_handler()
+    engine.calendar = CalendarColumns.from_candles(data)
+    try:
+        _evaluate(engine, data, symbol)
+    finally:
+        strategy_run_end(engine.strategy)
+    return engine
+
+
+def _evaluate(engine: BacktestEngine, data: List[Candle], symbol: str) -> None:
+    idx = 0
+    window = _FIRST_WINDOW
+    while idx < len(data):
+        if engine._wake_at != IDLE_FOREVER or engine._pending_entries:
+            _step(engine, data[idx], symbol)
+            idx += 1
+            continue
+        if not engine.positions:
+            engine._skip_flat_bars(data[idx:])
+            return
+        if any(position.partial_exit_done for position in engine.positions):
+            # A trailing stop moves on every bar.
+            _step(engine, data[idx], symbol)
+            idx += 1
+            continue
+        # Scan windows that double in size, so an early exit does not convert the whole series.
+        bars = data[idx : idx + window]
+        low = np.fromiter((c.low for c in bars), dtype=np.float64, count=len(bars))
+        high = np.fromiter((c.high for c in bars), dtype=np.float64, count=len(bars))
+        event = min(_next_event(engine, position, low, high) for position in engine.positions)
+        if event > 0:
+            _hold(engine, bars[:event])
+            idx += event
+        if event < len(bars):
+            _step(engine, data[idx], symbol)
+            idx += 1
+        else:
+            window *= 2
+
+
+def _step(engine: BacktestEngine, bar: Candle, symbol: str) -> None:
+    """One bar through the engine, as ``BacktestEngine._run_bars`` does it."""
+    engine.history.append(bar)
+    engine.event_bus.emit(Event(type="MarketEvent", payload={"bar": bar, "symbol": symbol}))
+    engine._bars_processed += 1
+
+
+def _next_event(engine: BacktestEngine, position: Position, low: np.ndarray, high: np.ndarray) -> int:
+    """First bar on which ``position`` may exit or take its partial; ``len(low)`` if none."""
+    long = position.side == OrderSide.BUY
+    touched = low <= position.stop if long else high >= position.stop
+    if position.target is not None:
+        touched |= high >= position.target if long else low <= position.target
+    if engine.partial_exit_enabled:
+        risk = abs(position.entry - position.stop)
+        if risk > 0:
+            touched |= high >= position.entry + risk if long else low <= position.entry - risk
+    hits = np.flatnonzero(touched)
+    return int(hits[0]) if hits.size else len(low)
+
+
+def _hold(engine: BacktestEngine, bars: List[Candle]) -> None:
+    """Bars with unchanged positions: mark to market, roll the calendar over."""
+    close = np.fromiter((c.close for c in bars), dtype=np.float64, count=len(bars))
+    unrealized = np.zeros(len(bars))
+    for position in engine.positions:
+        if engine.partial_exit_enabled and position.remaining_size is None:
+            # _maybe_partial_exit does this on the first bar it sees.
+            position.remaining_size = position.size
+        size = position.remaining_size or position.size
+        if position.side == OrderSide.BUY:
+            unrealized += (close - position.entry) * size
+        else:
+            unrealized += (position.entry - close) * size
+    engine.history.extend(bars)
+    engine._rollover_bar(bars[-1], len(engine.history) - 1)
+    engine.equity_curve.times.extend(bar.time for bar in bars)
+    engine.equity_curve.equities.extend((engine.cash + unrealized).tolist())
+    engine.equity_curve.drawdowns.extend(repeat(0.0, len(bars)))
+    engine._bars_processed += len(bars)
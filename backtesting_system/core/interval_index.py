@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import List, Tuple
+
+
+class IntervalIndex:
+    """
+    Closed price intervals ``[low, high]`` keyed by a unique integer, sorted by ``low``.
+
+    A price ``p`` lies in an interval widened by ``tolerance`` when
+    ``low - tolerance <= p <= high + tolerance``. The first condition holds
+    for a prefix of the sorted intervals, found by bisection; a running
+    maximum of ``high`` over that prefix tells in one lookup whether any of
+    them reaches ``p``, and ``stab`` only scans the prefix when it has a hit.
+    The comparisons are the ones a plain loop over the zones makes, so both
+    agree to the last bit.
+
+    ``insert`` and ``remove`` are a list insert/delete, and the running
+    maximum is rebuilt on the first query after a change, so a bar that adds
+    or expires a zone costs O(n). That is accepted: a detector window holds
+    about 50 zones, and ``overlaps`` between changes is O(log n).
+    """
+
+    __slots__ = ("_entries", "_reach")
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[float, int, float]] = []
+        self._reach: List[float] | None = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def insert(self, key: int, low: float, high: float) -> None:
+        insort(self._entries, (low, key, high))
+        self._reach = None
+
+    def remove(self, key: int, low: float) -> None:
+        entries = self._entries
+        idx = bisect_left(entries, (low, key))
+        if idx < len(entries) and entries[idx][1] == key:
+            del entries[idx]
+            self._reach = None
+
+    def clear(self) -> None:
+        self._entries = []
+        self._reach = []
+
+    def overlaps(self, price: float, tolerance: float = 0.0) -> bool:
+        """Whether any interval, widened by ``tolerance``, contains ``price``."""
+        count = self._reaching(price, tolerance)
+        return count > 0 and self._prefix_reach()[count - 1] + tolerance >= price
+
+    def stab(self, price: float, tolerance: float = 0.0) -> List[int]:
+        """Keys of the intervals that contain ``price``, in ascending ``low`` order."""
+        if not self.overlaps(price, tolerance):
+            return []
+        count = self._reaching(price, tolerance)
+        return [key for _low, key, high in self._entries[:count] if price <= high + tolerance]
+
+    def near(self, price: float, tolerance: float = 0.0) -> bool:
+        """Whether any interval's ``low`` is within ``tolerance`` of ``price`` (point intervals, e.g. levels)."""
+        entries = self._entries
+        idx = bisect_left(entries, (price,))
+        # abs(low - price) grows away from price, so only the two neighbours can be closest.
+        if idx < len(entries) and abs(entries[idx][0] - price) <= tolerance:
+            return True
+        return idx > 0 and abs(entries[idx - 1][0] - price) <= tolerance
+
+    def _reaching(self, price: float, tolerance: float) -> int:
+        """Number of intervals with ``low - tolerance <= price``."""
+        entries = self._entries
+        lo, hi = 0, len(entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if entries[mid][0] - tolerance <= price:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _prefix_reach(self) -> List[float]:
+        if self._reach is None:
+            reach = []
+            top = float("-inf")
+            for _low, _key, high in self._entries:
+                if high > top:
+                    top = high
+                reach.append(top)
+            self._reach = reach
+        return self._reach
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Hashable, Sequence, TypeVar
+
+from backtesting_system.core.daily_bars import DailyBarBuilder
+
+T = TypeVar("T")
+
+
+class MarketFeatures:
+    """
+    Derived state for one candle history, shared by every strategy reading it.
+
+    Values are memoized per bar (keyed by the history length) and must be
+    treated as read-only by callers, since several strategies may receive the
+    same object. ``daily`` and the ``state`` objects persist across bars
+    and are synced by their users on demand.
+    """
+
+    def __init__(self) -> None:
+        self._memo: Dict[Hashable, object] = {}
+        self._memo_len = -1
+        self.daily = DailyBarBuilder()
+        self._state: Dict[Hashable, object] = {}
+
+    def cached(self, history: Sequence, key: Hashable, factory: Callable[[], T]) -> T:
+        if len(history) != self._memo_len:
+            self._memo.clear()
+            self._memo_len = len(history)
+        try:
+            return self._memo[key]  # type: ignore[return-value]
+        except KeyError:
+            value = factory()
+            self._memo[key] = value
+            return value
+
+    def state(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Long-lived object under ``key``, e.g. an incremental detector, created on first use."""
+        try:
+            return self._state[key]  # type: ignore[return-value]
+        except KeyError:
+            value = factory()
+            self._state[key] = value
+            return value
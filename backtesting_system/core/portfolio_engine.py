@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from backtesting_system.core.backtest_engine import BacktestEngine
+from backtesting_system.core.event_bus import Event
+from backtesting_system.core.market_features import MarketFeatures
+from backtesting_system.core.rolling_history import RollingHistory
+from backtesting_system.core.strategy_base import strategy_idle, strategy_run_end, strategy_wake_time
+from backtesting_system.interfaces.strategy import StrategyInterface
+from backtesting_system.models.market import Candle
+from backtesting_system.models.orders import OrderSide
+
+
+def merge_candle_streams(feeds: Dict[str, Iterable[Candle]]) -> Iterator[Tuple[str, Candle]]:
+    """K-way merge of per-symbol candle streams by timestamp.
+
+    Only one pending candle per symbol is held at a time; ties are broken by
+    the order of ``feeds`` so the merge is deterministic.
+    """
+    heap: List[Tuple[object, int, str, Candle, Iterator[Candle]]] = []
+    for order, (symbol, candles) in enumerate(feeds.items()):
+        iterator = iter(candles)
+        first = next(iterator, None)
+        if first is not None:
+            heap.append((first.time, order, symbol, first, iterator))
+    heapq.heapify(heap)
+    while heap:
+        _time, order, symbol, candle, iterator = heap[0]
+        yield symbol, candle
+        following = next(iterator, None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following.time, order, symbol, following, iterator))
+
+
+@dataclass
+class PortfolioBacktestEngine(BacktestEngine):
+    """
+    Multi-symbol engine with one cash account and one RiskManager.
+
+    Bars from all symbols are processed in timestamp order and dispatched to
+    the symbol's own strategy instance. The equity curve gets one point per
+    timestamp, marked to market after the last symbol's bar at that time.
+
+    Per-symbol histories (``histories``) are bounded to ``lookback`` bars;
+    the equity curve, trades and the strategies' daily aggregates still grow
+    with the run. ``history`` is not filled: there is no single-symbol series
+    to keep, so reporting reads the equity curve and trades only.
+    """
+
+    strategy: StrategyInterface | None = None
+    strategies: Dict[str, StrategyInterface] = field(default_factory=dict)
+    lookback: int = 2000
+    histories: Dict[str, RollingHistory] = field(default_factory=dict)
+    symbol_features: Dict[str, MarketFeatures] = field(default_factory=dict)
+    _last_close: Dict[str, float] = field(default_factory=dict)
+    _wake_times: Dict[str, datetime | None] = field(default_factory=dict)
+
+    def run_portfolio(
+        self,
+        feeds: Dict[str, Iterable[Candle]],
+        show_progress: bool = False,
+        progress_every: int = 5000,
+    ) -> None:
+        missing = set(feeds) - set(self.strategies)
+        if missing:
+            raise ValueError(f"No strategy configured for: {', '.join(sorted(missing))}")
+        self._ensure_handler()
+        for symbol in feeds:
+            self.histories.setdefault(symbol, RollingHistory(self.lookback))
+            self.symbol_features.setdefault(symbol, MarketFeatures())
+        for symbol, bar in merge_candle_streams(feeds):
+            self.histories[symbol].append(bar)
+            self.event_bus.emit(Event(type="MarketEvent", payload={"bar": bar, "symbol": symbol}))
+            self._bars_processed += 1
+            if show_progress and self._bars_processed % progress_every == 0:
+                print(f"Processed {self._bars_processed} bars...")
+        for symbol in feeds:
+            strategy_run_end(self.strategies[symbol])
+
+    def run_backtest(self, data, symbol: str, show_progress: bool = False, progress_every: int = 5000, resume: bool = False) -> None:
+        if resume:
+            raise ValueError("Checkpoint resume is not supported for portfolio runs.")
+        self.run_portfolio({symbol: data}, show_progress=show_progress, progress_every=progress_every)
+
+    def _on_market_event(self, event: Event) -> None:
+        bar = event.payload["bar"]
+        symbol = event.payload["symbol"]
+        self._last_close[symbol] = bar.close
+
+        self._rollover_timeframes(bar.time)
+
+        if self.positions:
+            self._update_positions(bar, symbol)
+        self._process_pending_orders(bar, symbol)
+        signal = {}
+        if not strategy_idle(self._wake_times.get(symbol), bar.time):
+            strategy = self.strategies[symbol]
+            data = {
+                "bar": bar,
+                "symbol": symbol,
+                "history": self.histories[symbol],
+                "features": self.symbol_features[symbol],
+            }
+            signal = strategy.generate_signals(data)
+            self._wake_times[symbol] = strategy_wake_time(strategy, data)
+        if signal and self._risk_limits_ok():
+            signal.setdefault("symbol", symbol)
+            signal.setdefault("time", bar.time)
+            self.process_signal(signal, bar.close, 0)
+
+        equity = self._mark_to_market(bar) if self.positions else self.cash
+        curve = self.equity_curve
+        if curve.times and curve.times[-1] == bar.time:
+            # Another symbol's bar at the same time: the point covers the whole timestamp.
+            curve.equities[-1] = equity
+        else:
+            curve.add(bar.time, equity)
+
+    def _mark_to_market(self, bar) -> float:
+        unrealized = 0.0
+        for position in self.positions:
+            price = self._last_close.get(position.symbol, position.entry)
+            size = position.remaining_size or position.size
+            if position.side == OrderSide.BUY:
+                unrealized += (price - position.entry) * size
+            else:
+                unrealized += (position.entry - price) * size
+        return self.cash + unrealized
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Mapping, Tuple
+
+
+class PhaseTimer:
+    """
+    Wall-clock accumulators (``perf_counter``) and call counts per named phase.
+
+    Methods are timed by shadowing them on the instance with a timing wrapper
+    (``instrument``) and removing the wrapper again (``restore``), so code runs
+    untouched whenever no timer is installed. Times are inclusive: a phase
+    called from inside another phase is counted in both.
+    """
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.bars = 0
+        self._targets: List[Tuple[object, str, str, Callable]] = []
+
+    def add(self, phase: str, seconds: float, calls: int = 1) -> None:
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - started)
+
+    def instrument(self, obj: object, methods: Mapping[str, str]) -> None:
+        """Time calls to ``obj.<method>`` under the mapped phase name until ``restore``."""
+        for name, phase in methods.items():
+            method = getattr(obj, name, None)
+            if callable(method):
+                self._targets.append((obj, name, phase, method))
+                setattr(obj, name, self._timed(phase, method))
+
+    def restore(self) -> None:
+        for obj, name, _phase, _method in reversed(self._targets):
+            vars(obj).pop(name, None)
+        self._targets.clear()
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Remove the wrappers for the duration of the block, e.g. while pickling a checkpoint."""
+        targets = list(self._targets)
+        self.restore()
+        try:
+            yield
+        finally:
+            for obj, name, phase, _method in targets:
+                self.instrument(obj, {name: phase})
+
+    def _timed(self, phase: str, method: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add(phase, perf_counter() - started)
+
+        return timed
+
+    def summary(self) -> dict:
+        elapsed = self.seconds.get("run", 0.0)
+        phases = {
+            phase: {
+                "seconds": seconds,
+                "calls": self.calls.get(phase, 0),
+                "share_of_run": seconds / elapsed if elapsed else 0.0,
+            }
+            for phase, seconds in sorted(self.seconds.items(), key=lambda item: -item[1])
+        }
+        return {
+            "bars": self.bars,
+            "run_seconds": elapsed,
+            "bars_per_second": self.bars / elapsed if elapsed else 0.0,
+            "phases": phases,
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump(self.summary(), handle, indent=2)
+        return path
+
+
+class FilterFunnel:
+    """
+    Per-stage pass/reject counts and cumulative time of a strategy's filter chain.
+
+    A strategy takes one ``perf_counter`` reading per stage boundary and hands
+    it to ``passed``/``rejected``/``emitted``, which return the next reading,
+    so the bookkeeping costs a clock call and two dict updates per stage.
+    It only records while ``enabled``, which a profiled engine switches on for
+    its run; otherwise every call returns at once without reading the clock.
+
+    ``calls`` counts the bars the strategy was asked for a signal. A sleeping
+    strategy (``next_signal_time``) is not asked, so the engine reports the
+    bars it ran in ``bars`` and the summary shows the difference as
+    ``skipped_bars``; stage counts are per evaluation, not per bar.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.bars = 0
+        self.calls = 0
+        self.passes: Dict[str, int] = {}
+        self.rejects: Dict[str, int] = {}
+        self.signals: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def start(self) -> float:
+        if not self.enabled:
+            return 0.0
+        self.calls += 1
+        return perf_counter()
+
+    def passed(self, stage: str, started: float) -> float:
+        if not self.enabled:
+            return started
+        now = perf_counter()
+        self.passes[stage] = self.passes.get(stage, 0) + 1
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + (now - started)
+        return now
+
+    def rejected(self, stage: str, started: float) -> dict:
+        if self.enabled:
+            self.rejects[stage] = self.rejects.get(stage, 0) + 1
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + (perf_counter() - started)
+        return {}
+
+    def emitted(self, stage: str, started: float) -> None:
+        if not self.enabled:
+            return
+        self.signals[stage] = self.signals.get(stage, 0) + 1
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + (perf_counter() - started)
+
+    def summary(self) -> dict:
+        stages = {}
+        for stage, seconds in self.seconds.items():
+            passes = self.passes.get(stage, 0)
+            rejects = self.rejects.get(stage, 0)
+            signals = self.signals.get(stage, 0)
+            evaluated = passes + rejects + signals
+            stages[stage] = {
+                "evaluated": evaluated,
+                "passed": passes,
+                "rejected": rejects,
+                "signals": signals,
+                "reject_rate": rejects / evaluated if evaluated else 0.0,
+                "seconds": seconds,
+                "us_per_call": seconds / evaluated * 1e6 if evaluated else 0.0,
+            }
+        return {
+            "bars": self.bars,
+            "calls": self.calls,
+            "skipped_bars": max(self.bars - self.calls, 0),
+            "stages": stages,
+        }
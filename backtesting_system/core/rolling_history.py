@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Iterator, List
+
+from backtesting_system.models.market import Candle
+
+
+class RollingHistory:
+    """
+    Append-only candle history that only retains the newest ``maxlen`` bars.
+
+    Behaves like the engine's history list for the access patterns strategies
+    use: ``len()`` counts every bar ever appended, non-negative indices and
+    slice bounds are absolute bar positions, negative ones count from the
+    newest bar. Slices that reach back past the retained window are clipped to
+    it, so ``maxlen`` must cover the deepest lookback of the strategies fed
+    from this history.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        if maxlen <= 0:
+            raise ValueError("maxlen must be positive.")
+        self.maxlen = maxlen
+        self._items: List[Candle] = []
+        self._base = 0
+
+    def append(self, candle: Candle) -> None:
+        self._items.append(candle)
+        if len(self._items) >= 2 * self.maxlen:
+            drop = len(self._items) - self.maxlen
+            del self._items[:drop]
+            self._base += drop
+
+    def __len__(self) -> int:
+        return self._base + len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Candle]:
+        start = max(len(self._items) - self.maxlen, 0)
+        return iter(self._items[start:])
+
+    def __getitem__(self, key):
+        total = len(self)
+        oldest = max(total - self.maxlen, 0)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(total)
+            start = max(start, oldest)
+            stop = max(stop, oldest)
+            return self._items[start - self._base : stop - self._base : step]
+        index = key + total if key < 0 else key
+        if index < oldest or index >= total:
+            raise IndexError("history index outside the retained window")
+        return self._items[index - self._base]
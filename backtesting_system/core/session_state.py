@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Dict, Sequence
+
+from backtesting_system.core.calendar_features import EPOCH_ORDINAL
+from backtesting_system.core.clock import SessionWindow
+from backtesting_system.models.market import Candle
+from backtesting_system.utils.timezones import ASIA, LONDON, NY
+
+
+class SessionState:
+    """
+    Today's running OHLC and per-session first open / last close of a growing history.
+
+    "Today" is the calendar day of the last bar. ``first`` is today's first
+    bar, ``open``/``high``/``low``/``close`` its OHLC so far; ``opens`` and
+    ``closes`` map a session name to the open of its first bar today and the
+    close of its latest one (sessions without bars today are absent). A bar
+    belongs to a session when ``start <= time <= end``, so overlapping windows
+    share bars. Like ``DailyBarBuilder``, ``sync`` only consumes new bars of a
+    time-ordered history and rescans today's bars otherwise.
+    """
+
+    def __init__(self, sessions: Sequence[SessionWindow] = (ASIA, LONDON, NY)) -> None:
+        self.sessions = tuple(sessions)
+        self.day: int | None = None
+        self.first: Candle | None = None
+        self.open = self.high = self.low = self.close = 0.0
+        self.bars = 0
+        self.opens: Dict[str, float] = {}
+        self.closes: Dict[str, float] = {}
+        self._history: Sequence[Candle] | None = None
+        self._synced = 0
+        self._ordered = True
+
+    def sync(self, history: Sequence[Candle]) -> "SessionState":
+        total = len(history)
+        if history is not self._history or total < self._synced:
+            self._history = history
+            self._synced = 0
+            self._ordered = True
+            self._start_day(None)
+        if total == self._synced:
+            return self
+        if self._ordered:
+            for candle in history[self._synced :]:
+                if not self._add(candle):
+                    self._ordered = False
+                    break
+        if not self._ordered:
+            self._rescan(history)
+        self._synced = total
+        return self
+
+    def _start_day(self, day: int | None) -> None:
+        self.day = day
+        self.first = None
+        self.bars = 0
+        self.opens = {}
+        self.closes = {}
+
+    def _add(self, candle: Candle) -> bool:
+        day = candle.time.toordinal() - EPOCH_ORDINAL
+        if self.day is not None and day < self.day:
+            return False
+        if day != self.day:
+            self._start_day(day)
+        self._extend(candle)
+        return True
+
+    def _extend(self, candle: Candle) -> None:
+        if self.first is None:
+            self.first = candle
+            self.open, self.high, self.low = candle.open, candle.high, candle.low
+        else:
+            if candle.high > self.high:
+                self.high = candle.high
+            if candle.low < self.low:
+                self.low = candle.low
+        self.close = candle.close
+        self.bars += 1
+        t = candle.time.time()
+        for session in self.sessions:
+            if session.start <= t <= session.end:
+                self.opens.setdefault(session.name, candle.open)
+                self.closes[session.name] = candle.close
+
+    def _rescan(self, history: Sequence[Candle]) -> None:
+        if not history:
+            self._start_day(None)
+            return
+        day = history[-1].time.toordinal() - EPOCH_ORDINAL
+        self._start_day(day)
+        for candle in history:
+            if candle.time.toordinal() - EPOCH_ORDINAL == day:
+                self._extend(candle)
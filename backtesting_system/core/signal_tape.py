@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Sequence
+
+from backtesting_system.core.calendar_features import CalendarColumns
+from backtesting_system.core.market_features import MarketFeatures
+from backtesting_system.core.strategy_base import strategy_idle, strategy_run_end, strategy_wake_time
+from backtesting_system.interfaces.strategy import StrategyInterface
+from backtesting_system.utils.hashing import md5_candles, md5_params
+
+# Parameters that only change how signals are executed, never which signals a
+# strategy emits. Runs that differ only in these can share one signal tape.
+EXECUTION_PARAM_KEYS = frozenset(
+    {
+        "risk_per_trade",
+        "partial_exit_enabled",
+        "slippage_bps",
+        "spread_bps",
+        "fee_per_trade",
+        "stop_slippage_pips",
+        "max_daily_risk",
+        "max_weekly_risk",
+    }
+)
+
+
+def signal_tape_key(strategy: StrategyInterface, data_checksum: str, params: Mapping) -> str:
+    strategy_params = {k: v for k, v in params.items() if k not in EXECUTION_PARAM_KEYS}
+    return f"{type(strategy).__name__}_{data_checksum[:12]}_{md5_params(strategy_params)[:12]}"
+
+
+@dataclass
+class SignalTape:
+    """Per-bar signals of one strategy over one dataset, indexed by bar position."""
+
+    key: str
+    bars: int
+    signals: Dict[int, dict] = field(default_factory=dict)
+
+    @classmethod
+    def record(cls, strategy: StrategyInterface, data: Sequence, symbol: str, key: str = "") -> "SignalTape":
+        """Run ``strategy`` over ``data`` without an engine and keep every non-empty signal."""
+        tape = cls(key=key, bars=len(data))
+        history: list = []
+        features = MarketFeatures()
+        calendar = CalendarColumns.from_candles(data)
+        wake_at = None
+        for idx, bar in enumerate(data):
+            history.append(bar)
+            if strategy_idle(wake_at, bar.time):
+                continue
+            payload = {
+                "bar": bar,
+                "symbol": symbol,
+                "history": history,
+                "features": features,
+                "calendar": calendar,
+            }
+            signal = strategy.generate_signals(payload)
+            wake_at = strategy_wake_time(strategy, payload)
+            if signal:
+                tape.signals[idx] = dict(signal)
+        strategy_run_end(strategy)
+        return tape
+
+
+class ReplayStrategy:
+    """Strategy stand-in that returns the signals recorded on a SignalTape."""
+
+    def __init__(self, tape: SignalTape) -> None:
+        self.tape = tape
+        self.params: dict = {}
+
+    def generate_signals(self, data) -> dict:
+        signal = self.tape.signals.get(len(data["history"]) - 1)
+        return dict(signal) if signal else {}
+
+    def identify_setup(self, data) -> bool:
+        return (len(data["history"]) - 1) in self.tape.signals
+
+    def validate_context(self, data) -> bool:
+        return True
+
+
+@dataclass
+class SignalTapeCache:
+    """In-memory signal tapes, optionally persisted as pickles under ``directory``."""
+
+    directory: str | Path | None = None
+    _tapes: Dict[str, SignalTape] = field(default_factory=dict)
+
+    def get_or_record(
+        self,
+        strategy: StrategyInterface,
+        data: Sequence,
+        symbol: str,
+        params: Mapping | None = None,
+    ) -> SignalTape:
+        """Return the tape for ``strategy`` configured with ``params`` (default: ``strategy.params``) over ``data``."""
+        if params is None:
+            params = getattr(strategy, "params", {}) or {}
+        key = signal_tape_key(strategy, md5_candles(data), params)
+        tape = self._tapes.get(key) or self._load(key)
+        if tape is None or tape.bars != len(data):
+            tape = SignalTape.record(strategy, data, symbol, key=key)
+            self._save(tape)
+        self._tapes[key] = tape
+        return tape
+
+    def _path(self, key: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return Path(self.directory) / f"signal_tape_{key}.pkl"
+
+    def _load(self, key: str) -> SignalTape | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        with path.open("rb") as handle:
+            return pickle.load(handle)
+
+    def _save(self, tape: SignalTape) -> None:
+        path = self._path(tape.key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(tape, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
@@ -1,6 +1,32 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Tuple
+
+from backtesting_system.core.calendar_features import calendar_ids
+from backtesting_system.core.daily_bars import DailyBarBuilder
+from backtesting_system.core.session_state import SessionState
+
+# Returned by ``Strategy.next_signal_time`` when no future bar can produce a signal.
+IDLE_FOREVER = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def strategy_wake_time(strategy, data) -> datetime | None:
+    """Ask ``strategy`` when it next needs bars; strategies without the hook need every bar."""
+    hook = getattr(strategy, "next_signal_time", None)
+    return hook(data) if hook is not None else None
+
+
+def strategy_idle(wake_at: datetime | None, now: datetime) -> bool:
+    return wake_at is not None and (wake_at == IDLE_FOREVER or now < wake_at)
+
+
+def strategy_run_end(strategy) -> None:
+    """Tell ``strategy`` that the run is over, if it has the hook."""
+    hook = getattr(strategy, "on_run_end", None)
+    if hook is not None:
+        hook()
 
 
 class Strategy(ABC):
@@ -20,11 +46,63 @@ class Strategy(ABC):
     def validate_context(self, data) -> bool:
         ...
 
+    def next_signal_time(self, data) -> datetime | None:
+        """
+        Earliest bar time at which ``generate_signals`` can act again, given the
+        bar just processed. Engines skip the strategy for bars before it; ``None``
+        means the next bar is needed. Skipped calls must have been no-ops.
+        """
+        return None
+
+    def on_run_end(self) -> None:
+        """Called by engines after the last bar; flush or release per-run resources here."""
+
     def calculate_position_size(self, account_size: float, risk_per_trade: float, stop_distance: float) -> float:
         if stop_distance <= 0:
             return 0.0
         return (account_size * risk_per_trade) / stop_distance
 
+    def cached_feature(self, data, key, factory):
+        """Return ``factory()``, memoized for the current bar in the shared ``data["features"]`` if present."""
+        features = data.get("features")
+        if features is None:
+            return factory()
+        return features.cached(data.get("history", []), key, factory)
+
+    def feature_state(self, data, key, factory):
+        """Long-lived ``factory()`` object, shared through ``data["features"]`` if present, else kept per strategy."""
+        features = data.get("features")
+        if features is not None:
+            return features.state(key, factory)
+        own = self.__dict__.setdefault("_feature_state", {})
+        if key not in own:
+            own[key] = factory()
+        return own[key]
+
+    def daily_bars(self, data) -> DailyBarBuilder:
+        """Daily candles of ``data["history"]``, shared through ``data["features"]`` when present."""
+        features = data.get("features")
+        if features is not None:
+            builder = features.daily
+        else:
+            builder = self.__dict__.get("_daily_builder")
+            if builder is None:
+                builder = self._daily_builder = DailyBarBuilder()
+        builder.sync(data.get("history", []))
+        return builder
+
+    def session_state(self, data) -> SessionState:
+        """Today's OHLC and session opens/closes of ``data["history"]``, shared through ``data["features"]`` when present."""
+        return self.feature_state(data, "session_state", SessionState).sync(data.get("history", []))
+
+    def bar_calendar(self, data) -> Tuple[int, int, int]:
+        """``(day_id, week_id, weekday)`` of the current bar, read from ``data["calendar"]`` when present."""
+        calendar = data.get("calendar")
+        index = len(data.get("history", [])) - 1
+        if calendar is not None and 0 <= index < len(calendar):
+            return calendar.at(index)
+        return calendar_ids(data["bar"].time)
+
     def get_confluences(self, data) -> dict:
         return {}
 
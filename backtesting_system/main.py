@@ -41,9 +41,12 @@ from backtesting_system.config.trading_parameters import (
 )
 from backtesting_system.core.backtest_engine import BacktestEngine
 from backtesting_system.core.data_handler import DataHandler
+from backtesting_system.core.hold_evaluator import evaluate_buy_and_hold
+from backtesting_system.core.portfolio_engine import PortfolioBacktestEngine
 from backtesting_system.core.risk_manager import RiskManager
 from backtesting_system.pipelines.backtest_pipeline import BacktestPipeline
 from backtesting_system.pipelines.csv_resample_pipeline import CSVResamplePipeline
+from backtesting_system.pipelines.fan_out import FanOutRunner
 from backtesting_system.pipelines.parameter_sensitivity import ParameterSensitivityPipeline
 from backtesting_system.pipelines.stress_testing import StrategyStressTest
 from backtesting_system.pipelines.walk_forward import WalkForwardPipeline
@@ -53,7 +56,7 @@ from backtesting_system.strategies.benchmark_random import RandomBaselineStrateg
 from backtesting_system.strategies.composite_strategies import CompositeStrategy
 from backtesting_system.strategies.weekly_profile_extended import WeeklyProfileExtendedStrategy
 from backtesting_system.strategies.daily_swing_framework import DailySwingFrameworkStrategy
-from backtesting_system.strategies.weekly_profiles import WeeklyProfileStrategy
+from backtesting_system.strategies.weekly_profiles import WeeklyProfileStrategy, WeeklyProfileTable
 from backtesting_system.utils.hashing import md5_file
 from backtesting_system.utils.logging import configure_logging
 from backtesting_system.utils.validation import DataValidator, summarize_validation_reports
@@ -107,22 +110,55 @@ def main() -> None:
     }
     write_report(metadata, results_dir / "metadata.json")
 
+    def build_engine(strategy, partial_exits: bool = True, label: str | None = None) -> BacktestEngine:
+        profile = bool(DEFAULT_PARAMS.get("profile_engine", False))
+        broker = SimulatedBroker(
+            slippage_bps=DEFAULT_PARAMS.get("slippage_bps", 0.0),
+            spread_bps=DEFAULT_PARAMS.get("spread_bps", 0.0),
+            fee_per_trade=DEFAULT_PARAMS.get("fee_per_trade", 0.0),
+        )
+        return BacktestEngine(
+            initial_capital=10000.0,
+            broker=broker,
+            strategy=strategy,
+            risk_manager=RiskManager(),
+            risk_per_trade=DEFAULT_PARAMS.get("risk_per_trade", 0.01),
+            partial_exit_enabled=partial_exits,
+            stop_slippage_pips=DEFAULT_PARAMS.get("stop_slippage_pips", 0.5),
+            profile=profile,
+            profile_path=results_dir / "profiles" / f"{label}.json" if profile and label else None,
+        )
+
+    def write_strategy_outputs(engine: BacktestEngine, label: str) -> dict:
+        try:
+            report = build_report(engine)
+        except Exception as exc:
+            logger.error("%s report failed: %s", label, exc)
+            report = {}
+        logger.info("%s report: %s", label, report)
+        write_report(report, results_dir / f"report_{label}.json")
+        try:
+            write_pdf_report(report, results_dir / "pdf_reports", label)
+        except ImportError as exc:
+            logger.warning("PDF report skipped: %s", exc)
+        write_trades(engine, results_dir / f"trades_{label}.csv")
+        write_trades_detailed(engine, results_dir / f"trades_{label}_detailed.csv")
+        charts_dir = results_dir / "charts" / label
+        equity_values = [p.equity for p in engine.equity_curve]
+        drawdowns = []
+        peak = float("-inf")
+        for value in equity_values:
+            peak = max(peak, value)
+            drawdowns.append(0.0 if peak <= 0 else (peak - value) / peak)
+        plot_equity_curve(equity_values, charts_dir / "equity_curve.png")
+        plot_drawdown(drawdowns, charts_dir / "drawdown.png")
+        plot_pnl_distribution([t.pnl for t in engine.trades], charts_dir / "pnl_distribution.png")
+        plot_trades_with_levels(engine.history, engine.trades, charts_dir / "trades_plotly.html")
+        return report
+
     def run_strategy(strategy, label: str, start_date: datetime, end_date: datetime, partial_exits: bool = True):
         try:
-            broker = SimulatedBroker(
-                slippage_bps=DEFAULT_PARAMS.get("slippage_bps", 0.0),
-                spread_bps=DEFAULT_PARAMS.get("spread_bps", 0.0),
-                fee_per_trade=DEFAULT_PARAMS.get("fee_per_trade", 0.0),
-            )
-            engine = BacktestEngine(
-                initial_capital=10000.0,
-                broker=broker,
-                strategy=strategy,
-                risk_manager=RiskManager(),
-                risk_per_trade=DEFAULT_PARAMS.get("risk_per_trade", 0.01),
-                partial_exit_enabled=partial_exits,
-                stop_slippage_pips=DEFAULT_PARAMS.get("stop_slippage_pips", 0.5),
-            )
+            engine = build_engine(strategy, partial_exits, label)
             backtest = BacktestPipeline(data_handler=handler, engine=engine)
             backtest.run(
                 symbol="EURUSD",
@@ -131,85 +167,77 @@ def main() -> None:
                 end_date=end_date,
                 show_progress=True,
             )
-            try:
-                report = build_report(engine)
-            except Exception as exc:
-                logger.error("%s report failed: %s", label, exc)
-                report = {}
-            logger.info("%s report: %s", label, report)
-            write_report(report, results_dir / f"report_{label}.json")
-            try:
-                write_pdf_report(report, results_dir / "pdf_reports", label)
-            except ImportError as exc:
-                logger.warning("PDF report skipped: %s", exc)
-            write_trades(engine, results_dir / f"trades_{label}.csv")
-            write_trades_detailed(engine, results_dir / f"trades_{label}_detailed.csv")
-            charts_dir = results_dir / "charts" / label
-            equity_values = [p.equity for p in engine.equity_curve]
-            drawdowns = []
-            peak = float("-inf")
-            for value in equity_values:
-                peak = max(peak, value)
-                drawdowns.append(0.0 if peak <= 0 else (peak - value) / peak)
-            plot_equity_curve(equity_values, charts_dir / "equity_curve.png")
-            plot_drawdown(drawdowns, charts_dir / "drawdown.png")
-            plot_pnl_distribution([t.pnl for t in engine.trades], charts_dir / "pnl_distribution.png")
-            plot_trades_with_levels(engine.history, engine.trades, charts_dir / "trades_plotly.html")
-            return engine, report
+            return engine, write_strategy_outputs(engine, label)
         except Exception as exc:
             logger.error("%s failed: %s", label, exc)
             return BacktestEngine(0.0, SimulatedBroker(), strategy), {}
 
+    def run_strategies(strategies: dict, start_date: datetime, end_date: datetime) -> dict:
+        """Run ``{label: (strategy, partial_exits)}`` in lockstep over one load of the data."""
+        engines = {
+            label: build_engine(strategy, partial_exits, label) for label, (strategy, partial_exits) in strategies.items()
+        }
+        results = {}
+        try:
+            data = list(handler.load_ohlcv("EURUSD", "H1", start_date, end_date))
+            profiles = WeeklyProfileTable.from_candles(data)
+            for strategy, _partial_exits in strategies.values():
+                if hasattr(strategy, "profile_table"):
+                    strategy.profile_table = profiles
+            # Buy & hold trades once, so it skips the bar loop instead of riding along in the fan-out.
+            held = {label for label, engine in engines.items() if isinstance(engine.strategy, BuyHoldStrategy)}
+            runner = FanOutRunner(engines={label: engine for label, engine in engines.items() if label not in held})
+            runner.run(data, "EURUSD", show_progress=True)
+        except Exception as exc:
+            logger.error("Strategy fan-out failed: %s", exc)
+            return {label: (BacktestEngine(0.0, SimulatedBroker(), strategy), {}) for label, (strategy, _p) in strategies.items()}
+        failed = set(runner.errors)
+        for label in held:
+            try:
+                evaluate_buy_and_hold(engines[label], data, "EURUSD")
+            except Exception as exc:
+                logger.error("%s failed: %s", label, exc)
+                failed.add(label)
+        for label, engine in engines.items():
+            if label in failed:
+                results[label] = (BacktestEngine(0.0, SimulatedBroker(), engine.strategy), {})
+                continue
+            try:
+                results[label] = (engine, write_strategy_outputs(engine, label))
+            except Exception as exc:
+                logger.error("%s failed: %s", label, exc)
+                results[label] = (BacktestEngine(0.0, SimulatedBroker(), engine.strategy), {})
+        return results
+
     base_params = dict(DEFAULT_PARAMS)
-    buy_hold_engine, buy_hold_report = run_strategy(
-        BuyHoldStrategy(params=base_params),
-        "buy_hold",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-    )
-    random_engine, random_report = run_strategy(
-        RandomBaselineStrategy(params=base_params),
-        "random_baseline",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-    )
-    ma_engine, ma_report = run_strategy(
-        MovingAverageCrossoverStrategy(params=base_params),
-        "ma_crossover",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-    )
-    weekly_engine, weekly_report = run_strategy(
-        WeeklyProfileStrategy(params=base_params),
-        "weekly_profile",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-    )
-    weekly_fixed_engine, weekly_fixed_report = run_strategy(
-        WeeklyProfileStrategy(params=base_params),
-        "weekly_profile_fixed_exit",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-        partial_exits=False,
-    )
-    ict_engine, ict_report = run_strategy(
-        WeeklyProfileExtendedStrategy(params=base_params),
-        "weekly_profile_extended",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-    )
-    daily_swing_engine, daily_swing_report = run_strategy(
-        DailySwingFrameworkStrategy(params=base_params),
-        "daily_swing_framework",
-        START_DATE_CALIBRATION,
-        END_DATE_FORWARD,
-    )
-    composite_engine, composite_report = run_strategy(
-        CompositeStrategy(params=base_params),
-        "composite",
+
+    def logged_params(label: str) -> dict:
+        """``base_params`` with the signal log of the ``label`` run, replacing the previous run's file."""
+        path = results_dir / "signal_logs" / f"{label}.jsonl"
+        path.unlink(missing_ok=True)
+        return {**base_params, "signal_log_path": path}
+    full_runs = run_strategies(
+        {
+            "buy_hold": (BuyHoldStrategy(params=base_params), True),
+            "random_baseline": (RandomBaselineStrategy(params=base_params), True),
+            "ma_crossover": (MovingAverageCrossoverStrategy(params=base_params), True),
+            "weekly_profile": (WeeklyProfileStrategy(params=logged_params("weekly_profile")), True),
+            "weekly_profile_fixed_exit": (WeeklyProfileStrategy(params=logged_params("weekly_profile_fixed_exit")), False),
+            "weekly_profile_extended": (WeeklyProfileExtendedStrategy(params=logged_params("weekly_profile_extended")), True),
+            "daily_swing_framework": (DailySwingFrameworkStrategy(params=base_params), True),
+            "composite": (CompositeStrategy(params=base_params), True),
+        },
         START_DATE_CALIBRATION,
         END_DATE_FORWARD,
     )
+    buy_hold_engine, buy_hold_report = full_runs["buy_hold"]
+    random_engine, random_report = full_runs["random_baseline"]
+    ma_engine, ma_report = full_runs["ma_crossover"]
+    weekly_engine, weekly_report = full_runs["weekly_profile"]
+    weekly_fixed_engine, weekly_fixed_report = full_runs["weekly_profile_fixed_exit"]
+    ict_engine, ict_report = full_runs["weekly_profile_extended"]
+    daily_swing_engine, daily_swing_report = full_runs["daily_swing_framework"]
+    composite_engine, composite_report = full_runs["composite"]
     summary_reports = {
         "buy_hold": buy_hold_report,
         "random_baseline": random_report,
@@ -456,6 +484,36 @@ def main() -> None:
         multi_asset_results[symbol] = report
     write_report({"multi_asset_validation": multi_asset_results}, results_dir / "multi_asset_validation.json")
 
+    portfolio_feeds = {}
+    for symbol in multi_asset_symbols:
+        try:
+            portfolio_feeds[symbol] = handler.iter_ohlcv(
+                symbol,
+                "H1",
+                START_DATE_OOS_VALIDATION,
+                END_DATE_OOS_VALIDATION,
+            )
+        except FileNotFoundError as exc:
+            logger.warning("Portfolio feed skipped for %s: %s", symbol, exc)
+    if portfolio_feeds:
+        portfolio_engine = PortfolioBacktestEngine(
+            initial_capital=10000.0,
+            broker=SimulatedBroker(
+                slippage_bps=DEFAULT_PARAMS.get("slippage_bps", 0.0),
+                spread_bps=DEFAULT_PARAMS.get("spread_bps", 0.0),
+                fee_per_trade=DEFAULT_PARAMS.get("fee_per_trade", 0.0),
+            ),
+            strategies={symbol: WeeklyProfileStrategy(params=dict(base_params)) for symbol in portfolio_feeds},
+            risk_manager=RiskManager(),
+            risk_per_trade=DEFAULT_PARAMS.get("risk_per_trade", 0.01),
+            stop_slippage_pips=DEFAULT_PARAMS.get("stop_slippage_pips", 0.5),
+        )
+        portfolio_engine.run_portfolio(portfolio_feeds, show_progress=True)
+        write_report(
+            {"symbols": list(portfolio_feeds), "report": build_report(portfolio_engine)},
+            results_dir / "portfolio_validation.json",
+        )
+
 
 if __name__ == "__main__":
     main()
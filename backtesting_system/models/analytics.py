@@ -1,18 +1,20 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from itertools import repeat
+from typing import Iterable, Iterator, List, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EquityPoint:
     time: datetime
     equity: float
     drawdown: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TradeRecord:
     symbol: str
     entry_time: datetime
@@ -26,3 +28,145 @@ class TradeRecord:
     target: Optional[float] = None
     r_multiple: Optional[float] = None
     confluence: Optional[float] = None
+
+
+class EquityBuffer:
+    """
+    Append-only equity curve stored column-wise.
+
+    Behaves like a list of EquityPoint for reading (len, indexing, slicing,
+    iteration); points are built on access. ``times`` and ``equities`` are the
+    raw columns for code that only needs the numbers.
+    """
+
+    __slots__ = ("times", "equities", "drawdowns")
+
+    def __init__(self, points: Iterable[EquityPoint] = ()) -> None:
+        self.times: List[datetime] = []
+        self.equities = array("d")
+        self.drawdowns = array("d")
+        self.extend(points)
+
+    @classmethod
+    def from_columns(cls, times: Iterable[datetime], equities: Iterable[float]) -> "EquityBuffer":
+        buffer = cls()
+        buffer.times.extend(times)
+        buffer.equities.extend(equities)
+        buffer.drawdowns.extend(repeat(0.0, len(buffer.times)))
+        return buffer
+
+    def add(self, time: datetime, equity: float, drawdown: float = 0.0) -> None:
+        self.times.append(time)
+        self.equities.append(equity)
+        self.drawdowns.append(drawdown)
+
+    def add_flat(self, times: List[datetime], equity: float) -> None:
+        """Append a run of points that all share one equity value."""
+        self.times.extend(times)
+        self.equities.extend(repeat(equity, len(times)))
+        self.drawdowns.extend(repeat(0.0, len(times)))
+
+    def append(self, point: EquityPoint) -> None:
+        self.add(point.time, point.equity, point.drawdown)
+
+    def extend(self, points: Iterable[EquityPoint]) -> None:
+        for point in points:
+            self.add(point.time, point.equity, point.drawdown)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.times)))]
+        return EquityPoint(time=self.times[index], equity=self.equities[index], drawdown=self.drawdowns[index])
+
+    def __iter__(self) -> Iterator[EquityPoint]:
+        for time, equity, drawdown in zip(self.times, self.equities, self.drawdowns):
+            yield EquityPoint(time=time, equity=equity, drawdown=drawdown)
+
+
+class TradeLog:
+    """
+    Append-only trade list stored column-wise.
+
+    Prices, sizes and PnL live in ``array('d')`` columns; indexing and
+    iteration yield TradeRecord views, so it reads like a list of trades.
+    """
+
+    __slots__ = (
+        "symbol",
+        "entry_time",
+        "exit_time",
+        "entry_price",
+        "exit_price",
+        "size",
+        "pnl",
+        "side",
+        "stop",
+        "target",
+        "r_multiple",
+        "confluence",
+    )
+
+    def __init__(self, records: Iterable[TradeRecord] = ()) -> None:
+        self.symbol: List[str] = []
+        self.entry_time: List[datetime] = []
+        self.exit_time: List[datetime] = []
+        self.entry_price = array("d")
+        self.exit_price = array("d")
+        self.size = array("d")
+        self.pnl = array("d")
+        self.side: List[Optional[str]] = []
+        self.stop: List[Optional[float]] = []
+        self.target: List[Optional[float]] = []
+        self.r_multiple: List[Optional[float]] = []
+        self.confluence: List[Optional[float]] = []
+        self.extend(records)
+
+    def add(
+        self,
+        symbol: str,
+        entry_time: datetime,
+        exit_time: datetime,
+        entry_price: float,
+        exit_price: float,
+        size: float,
+        pnl: float,
+        side: Optional[str] = None,
+        stop: Optional[float] = None,
+        target: Optional[float] = None,
+        r_multiple: Optional[float] = None,
+        confluence: Optional[float] = None,
+    ) -> None:
+        self.symbol.append(symbol)
+        self.entry_time.append(entry_time)
+        self.exit_time.append(exit_time)
+        self.entry_price.append(entry_price)
+        self.exit_price.append(exit_price)
+        self.size.append(size)
+        self.pnl.append(pnl)
+        self.side.append(side)
+        self.stop.append(stop)
+        self.target.append(target)
+        self.r_multiple.append(r_multiple)
+        self.confluence.append(confluence)
+
+    def append(self, record: TradeRecord) -> None:
+        self.add(*(getattr(record, name) for name in self.__slots__))
+
+    def extend(self, records: Iterable[TradeRecord]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.symbol)))]
+        return TradeRecord(*(getattr(self, name)[index] for name in self.__slots__))
+
+    def __iter__(self) -> Iterator[TradeRecord]:
+        for index in range(len(self.symbol)):
+            yield self[index]
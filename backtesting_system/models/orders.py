@@ -26,6 +26,8 @@ class Order:
     limit_price: Optional[float] = None
     stop_price: Optional[float] = None
     time: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    oco_group: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -35,9 +37,10 @@ class Fill:
     fees: float
     slippage: float
     time: datetime
+    order_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     side: OrderSide
@@ -11,6 +11,19 @@ class BacktestPipeline:
     data_handler: DataHandler
     engine: BacktestEngine
 
-    def run(self, symbol: str, timeframe: str, start_date, end_date, show_progress: bool = False) -> None:
-        data = self.data_handler.load_ohlcv(symbol, timeframe, start_date, end_date)
-        self.engine.run_backtest(data, symbol, show_progress=show_progress)
+    def run(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date,
+        end_date,
+        show_progress: bool = False,
+        resume: bool = False,
+    ) -> None:
+        timer = self.engine.phase_timer if self.engine.profile else None
+        if timer is None:
+            data = self.data_handler.load_ohlcv(symbol, timeframe, start_date, end_date)
+        else:
+            with timer.phase("data_loading"):
+                data = list(self.data_handler.load_ohlcv(symbol, timeframe, start_date, end_date))
+        self.engine.run_backtest(data, symbol, show_progress=show_progress, resume=resume)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, Iterable, List
+
+from backtesting_system.core.backtest_engine import BacktestEngine
+from backtesting_system.core.calendar_features import CalendarColumns
+from backtesting_system.core.event_bus import Event
+from backtesting_system.core.market_features import MarketFeatures
+from backtesting_system.core.strategy_base import strategy_run_end
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FanOutRunner:
+    """
+    Drive several independent engine/strategy pairs over a single data pass.
+
+    All engines share one history list and one MarketFeatures instance, so
+    per-bar derived data (PDA arrays, daily aggregates, session candles) is
+    computed once and read by every strategy. Each engine keeps its own cash,
+    positions, trades and equity curve, so results match separate runs.
+    An engine that raises is dropped from the pass and its error recorded.
+    Engines with ``profile`` on are instrumented for the pass; their "run"
+    phase is the time spent in their own event handling.
+    """
+
+    engines: Dict[str, BacktestEngine]
+    features: MarketFeatures = field(default_factory=MarketFeatures)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def run(self, data: Iterable, symbol: str, show_progress: bool = False, progress_every: int = 5000) -> None:
+        data = list(data)
+        history: List = []
+        calendar = CalendarColumns.from_candles(data)
+        active = dict(self.engines)
+        for engine in active.values():
+            engine.history = history
+            engine.features = self.features
+            engine.calendar = calendar
+            engine._ensure_handler()
+        # Profiled engines get their phase timers here, since run_backtest is bypassed.
+        timers = {label: engine.start_profiling() for label, engine in active.items()}
+        timers = {label: timer for label, timer in timers.items() if timer is not None}
+        bars_before = {label: self.engines[label]._bars_processed for label in timers}
+        try:
+            for idx, bar in enumerate(data, start=1):
+                history.append(bar)
+                event = Event(type="MarketEvent", payload={"bar": bar, "symbol": symbol})
+                for label, engine in list(active.items()):
+                    timer = timers.get(label)
+                    started = perf_counter() if timer is not None else 0.0
+                    try:
+                        engine.event_bus.emit(event)
+                    except Exception as exc:
+                        logger.error("%s failed at %s: %s", label, bar.time, exc)
+                        self.errors[label] = str(exc)
+                        del active[label]
+                        continue
+                    if timer is not None:
+                        timer.add("run", perf_counter() - started, calls=0)
+                    engine._bars_processed += 1
+                if show_progress and idx % progress_every == 0:
+                    print(f"Processed {idx} bars...")
+        finally:
+            for label, timer in timers.items():
+                engine = self.engines[label]
+                timer.add("run", 0.0)
+                engine.stop_profiling(engine._bars_processed - bars_before[label])
+        for engine in self.engines.values():
+            strategy_run_end(engine.strategy)
+        for label in timers:
+            self.engines[label].write_profile()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import product
 from typing import Callable, Dict, Iterable, List
 
 from backtesting_system.analytics.reporting import build_report
 from backtesting_system.core.backtest_engine import BacktestEngine
+from backtesting_system.core.batched_engine import BatchedBacktestEngine
 from backtesting_system.core.data_handler import DataHandler
+from backtesting_system.core.signal_tape import EXECUTION_PARAM_KEYS, ReplayStrategy, SignalTapeCache
 from backtesting_system.interfaces.strategy import StrategyInterface
 
 
@@ -15,6 +17,8 @@ class ParameterSensitivityPipeline:
     data_handler: DataHandler
     strategy_factory: Callable[[dict], StrategyInterface]
     engine_factory: Callable[[StrategyInterface, dict], BacktestEngine]
+    batched: bool = True
+    signal_tapes: SignalTapeCache = field(default_factory=SignalTapeCache)
 
     def run(
         self,
@@ -25,9 +29,11 @@ class ParameterSensitivityPipeline:
         param_grid: Dict[str, Iterable],
     ) -> List[Dict[str, object]]:
         keys = list(param_grid.keys())
+        combinations = [dict(zip(keys, values)) for values in product(*[param_grid[k] for k in keys])]
+        if combinations and set(keys) <= EXECUTION_PARAM_KEYS:
+            return self._run_replay(symbol, timeframe, start_date, end_date, combinations)
         results: List[Dict[str, object]] = []
-        for values in product(*[param_grid[k] for k in keys]):
-            params = dict(zip(keys, values))
+        for params in combinations:
             strategy = self.strategy_factory(params)
             engine = self.engine_factory(strategy, params)
             data = self.data_handler.load_ohlcv(symbol, timeframe, start_date, end_date)
@@ -36,3 +42,25 @@ class ParameterSensitivityPipeline:
             report.update({"params": params})
             results.append(report)
         return results
+
+    def _run_replay(self, symbol: str, timeframe: str, start_date, end_date, combinations: List[dict]) -> List[Dict[str, object]]:
+        """Record the strategy's signals once and re-simulate only execution per combination."""
+        data = list(self.data_handler.load_ohlcv(symbol, timeframe, start_date, end_date))
+        # Keyed by the strategy's own params: the execution grid says nothing about how it was configured.
+        tape = self.signal_tapes.get_or_record(self.strategy_factory(combinations[0]), data, symbol)
+        if self.batched:
+            strategy = ReplayStrategy(tape)
+            engines = [self.engine_factory(strategy, params) for params in combinations]
+            BatchedBacktestEngine(strategy=strategy, engines=engines).run_backtest(data, symbol)
+        else:
+            engines = []
+            for params in combinations:
+                engine = self.engine_factory(ReplayStrategy(tape), params)
+                engine.run_backtest(data, symbol)
+                engines.append(engine)
+        results: List[Dict[str, object]] = []
+        for params, engine in zip(combinations, engines):
+            report = build_report(engine)
+            report.update({"params": params})
+            results.append(report)
+        return results
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from backtesting_system.core.strategy_base import Strategy
+from backtesting_system.core.strategy_base import IDLE_FOREVER, Strategy
 
 
 class BuyHoldStrategy(Strategy):
@@ -24,5 +24,8 @@ class BuyHoldStrategy(Strategy):
             "size": 1.0,
         }
 
+    def next_signal_time(self, data):
+        return IDLE_FOREVER if self._entered else None
+
     def validate_context(self, data) -> bool:
         return True
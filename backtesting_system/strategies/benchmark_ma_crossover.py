@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+from itertools import accumulate
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
 from backtesting_system.core.strategy_base import Strategy
 
 
 class MovingAverageCrossoverStrategy(Strategy):
+    """
+    Fast/slow moving-average crossover benchmark.
+
+    Window sums are exact and rounded once (``math.fsum`` semantics) rather
+    than the left-to-right ``sum()`` earlier versions used, so signals can
+    differ from older results on bars where the two averages are within
+    rounding of each other.
+    """
+
     def __init__(self, params: dict):
         super().__init__(params)
         self.fast_window = int(params.get("ma_fast", 20))
@@ -12,6 +26,13 @@ class MovingAverageCrossoverStrategy(Strategy):
         self.target_multiple = float(params.get("ma_target_multiple", params.get("target_multiple", 2.0)))
         self._last_signal_index = -10_000
         self._cooldown_bars = int(params.get("ma_cooldown_bars", 1))
+        # Exact window sums ending at the last synced bar, and (previous, current) rounded sums.
+        self._history = None
+        self._synced = 0
+        self._fast_window_sum = _ExactSum()
+        self._slow_window_sum = _ExactSum()
+        self._fast_sums = (0.0, 0.0)
+        self._slow_sums = (0.0, 0.0)
 
     def identify_setup(self, data) -> bool:
         return True
@@ -23,14 +44,14 @@ class MovingAverageCrossoverStrategy(Strategy):
         if bar_index - self._last_signal_index < self._cooldown_bars:
             return {}
 
-        closes = [c.close for c in history]
-        if len(closes) < self.slow_window + 1:
+        if len(history) < self.slow_window + 1:
             return {}
 
-        fast_prev = sum(closes[-self.fast_window - 1 : -1]) / self.fast_window
-        fast_curr = sum(closes[-self.fast_window :]) / self.fast_window
-        slow_prev = sum(closes[-self.slow_window - 1 : -1]) / self.slow_window
-        slow_curr = sum(closes[-self.slow_window :]) / self.slow_window
+        (fast_prev, fast_curr), (slow_prev, slow_curr) = self._window_sums(history)
+        fast_prev /= self.fast_window
+        fast_curr /= self.fast_window
+        slow_prev /= self.slow_window
+        slow_curr /= self.slow_window
 
         direction = None
         if fast_prev <= slow_prev and fast_curr > slow_curr:
@@ -57,5 +78,134 @@ class MovingAverageCrossoverStrategy(Strategy):
             "size": None,
         }
 
+    def _window_sums(self, history) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """
+        Fast and slow window sums ending at the previous and the current bar.
+
+        The sums are exact (``_ExactSum``) and rounded once, i.e. equal to
+        ``math.fsum`` over each window, so a new bar costs one add and one
+        remove per window and equal means compare equal however they were
+        reached.
+        """
+        total = len(history)
+        fast, slow = self.fast_window, self.slow_window
+        if history is not self._history or total < self._synced or self._synced <= max(fast, slow):
+            self._history = history
+            self._synced = total
+            self._fast_window_sum = _ExactSum(c.close for c in history[-fast:])
+            self._slow_window_sum = _ExactSum(c.close for c in history[-slow:])
+            self._fast_sums = _ExactSum(c.close for c in history[-fast - 1 : -1]).value, self._fast_window_sum.value
+            self._slow_sums = _ExactSum(c.close for c in history[-slow - 1 : -1]).value, self._slow_window_sum.value
+            return self._fast_sums, self._slow_sums
+        for idx in range(self._synced, total):
+            close = history[idx].close
+            self._fast_window_sum.add(close)
+            self._fast_window_sum.remove(history[idx - fast].close)
+            self._slow_window_sum.add(close)
+            self._slow_window_sum.remove(history[idx - slow].close)
+            self._fast_sums = self._fast_sums[1], self._fast_window_sum.value
+            self._slow_sums = self._slow_sums[1], self._slow_window_sum.value
+        self._synced = total
+        return self._fast_sums, self._slow_sums
+
     def validate_context(self, data) -> bool:
         return True
+
+
+class _ExactSum:
+    """
+    Running sum of floats without rounding error.
+
+    Floats are dyadic rationals, so the sum is kept as an integer numerator
+    over the largest power-of-two denominator seen; adding and removing a
+    value is integer arithmetic, and ``value`` rounds the exact sum once.
+    """
+
+    __slots__ = ("numerator", "scale")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.numerator = 0
+        self.scale = 1
+        for value in values:
+            self.add(value)
+
+    def add(self, value: float, sign: int = 1) -> None:
+        numerator, denominator = float(value).as_integer_ratio()
+        if denominator > self.scale:
+            self.numerator *= denominator // self.scale
+            self.scale = denominator
+        self.numerator += sign * numerator * (self.scale // denominator)
+
+    def remove(self, value: float) -> None:
+        self.add(value, -1)
+
+    @property
+    def value(self) -> float:
+        # int / int is correctly rounded.
+        return self.numerator / self.scale
+
+
+def crossover_signal_grid(
+    closes: Sequence[float] | np.ndarray,
+    fast_windows: Iterable[int],
+    slow_windows: Iterable[int],
+    cooldown_bars: int = 1,
+    stop_pct: float = 0.002,
+) -> Dict[Tuple[int, int], np.ndarray]:
+    """
+    Signals of ``MovingAverageCrossoverStrategy`` for every ``(ma_fast, ma_slow)``
+    pair, from one exact prefix sum of ``closes``.
+
+    Each array is aligned with ``closes`` and holds +1 (long), -1 (short) or 0
+    per bar. Window sums are differences of the integer-scaled prefix sum,
+    rounded once like the strategy's ``_ExactSum``, so the signals match the
+    strategy's. A pair with ``ma_fast > ma_slow`` starts at bar ``ma_fast``
+    instead of averaging a truncated window as the strategy does before then.
+    """
+    prices = np.asarray(closes, dtype=np.float64)
+    count = len(prices)
+    ratios = [value.as_integer_ratio() for value in prices.tolist()]
+    scale = max((denominator for _numerator, denominator in ratios), default=1)
+    cumulative = [0, *accumulate(numerator * (scale // denominator) for numerator, denominator in ratios)]
+    tradable = prices * stop_pct > 0
+    means: Dict[int, np.ndarray] = {}
+
+    def rolling_mean(window: int) -> np.ndarray:
+        if window not in means:
+            mean = np.full(count, np.nan)
+            if window <= count:
+                sums = [(cumulative[idx] - cumulative[idx - window]) / scale for idx in range(window, count + 1)]
+                mean[window - 1 :] = np.array(sums) / window
+            means[window] = mean
+        return means[window]
+    slow_windows = list(slow_windows)
+    grid: Dict[Tuple[int, int], np.ndarray] = {}
+    for fast in fast_windows:
+        fast_mean = rolling_mean(int(fast))
+        for slow in slow_windows:
+            slow_mean = rolling_mean(int(slow))
+            signals = np.zeros(count, dtype=np.int8)
+            # The strategy needs slow + 1 bars, so the first candidate is bar ``slow``.
+            first = max(int(slow), int(fast))
+            if first < count:
+                fp, fc = fast_mean[first - 1 : -1], fast_mean[first:]
+                sp, sc = slow_mean[first - 1 : -1], slow_mean[first:]
+                live = tradable[first:]
+                signals[first:][(fp <= sp) & (fc > sc) & live] = 1
+                signals[first:][(fp >= sp) & (fc < sc) & live] = -1
+            if cooldown_bars > 1:
+                signals = _apply_cooldown(signals, cooldown_bars)
+            grid[(int(fast), int(slow))] = signals
+    return grid
+
+
+def _apply_cooldown(signals: np.ndarray, cooldown_bars: int) -> np.ndarray:
+    """Drop signals within ``cooldown_bars`` of the previous kept one, as the strategy skips those bars."""
+    kept = np.zeros_like(signals)
+    last = -cooldown_bars
+    for idx in np.flatnonzero(signals):
+        if idx - last >= cooldown_bars:
+            kept[idx] = signals[idx]
+            last = idx
+    return kept
+
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import random
-from datetime import date
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
 
+import numpy as np
+
+from backtesting_system.core.calendar_features import CalendarColumns
 from backtesting_system.core.strategy_base import Strategy
+from backtesting_system.models.market import Candle
 
 
 class RandomBaselineStrategy(Strategy):
@@ -16,7 +21,7 @@ class RandomBaselineStrategy(Strategy):
         self.target_multiple = float(params.get("random_target_multiple", params.get("target_multiple", 2.0)))
         self.cooldown_bars = int(params.get("random_cooldown_bars", 24))
         self._last_entry_index = -10_000
-        self._last_signal_day: date | None = None
+        self._last_signal_day: int | None = None
 
     def identify_setup(self, data) -> bool:
         return True
@@ -27,7 +32,8 @@ class RandomBaselineStrategy(Strategy):
         bar_index = len(history)
         if bar_index - self._last_entry_index < self.cooldown_bars:
             return {}
-        if self._last_signal_day == bar.time.date():
+        day, _week, _weekday = self.bar_calendar(data)
+        if self._last_signal_day == day:
             return {}
         if self._rng.random() > self.trade_probability:
             return {}
@@ -41,7 +47,7 @@ class RandomBaselineStrategy(Strategy):
         target = self.project_target(entry, stop, direction, multiple=self.target_multiple)
 
         self._last_entry_index = bar_index
-        self._last_signal_day = bar.time.date()
+        self._last_signal_day = day
         return {
             "direction": direction,
             "entry": entry,
@@ -52,3 +58,170 @@ class RandomBaselineStrategy(Strategy):
 
     def validate_context(self, data) -> bool:
         return True
+
+
+@dataclass
+class RandomNullDistribution:
+    """Per-seed metrics of simulated random-baseline runs, one array entry per seed."""
+
+    sharpe: np.ndarray
+    cagr: np.ndarray
+    max_drawdown: np.ndarray
+    final_equity: np.ndarray
+    trades: np.ndarray
+
+    def p_value(self, metric: str, observed: float) -> float:
+        """Share of seeds at least as good as ``observed`` (lower is better for ``max_drawdown``)."""
+        values = getattr(self, metric)
+        if not len(values):
+            return 1.0
+        better = values <= observed if metric == "max_drawdown" else values >= observed
+        return float(np.mean(better))
+
+    def summary(self, percentiles: Sequence[float] = (5, 50, 95)) -> Dict[str, dict]:
+        out = {}
+        for metric in ("sharpe", "cagr", "max_drawdown", "final_equity", "trades"):
+            values = getattr(self, metric)
+            out[metric] = {
+                "mean": float(np.mean(values)) if len(values) else 0.0,
+                **{f"p{q:g}": float(np.percentile(values, q)) if len(values) else 0.0 for q in percentiles},
+            }
+        return out
+
+
+def random_null_distribution(
+    candles: Sequence[Candle],
+    params: dict,
+    seeds: int = 1000,
+    initial_capital: float = 10000.0,
+    risk_per_trade: float = 0.01,
+    periods_per_year: int = 252,
+) -> RandomNullDistribution:
+    """
+    Metrics of ``seeds`` random-baseline runs over ``candles`` in one batch.
+
+    Entries follow ``RandomBaselineStrategy``'s rules, drawn from one NumPy
+    Generator (statistically, not draw-for-draw, equivalent). Trades exit at
+    their stop, target or the last close without costs, each risking
+    ``risk_per_trade`` of equity; metrics come from end-of-day equity.
+    """
+    count = len(candles)
+    empty = np.zeros(seeds)
+    if count < 2 or seeds <= 0:
+        return RandomNullDistribution(empty, empty.copy(), empty.copy(), empty + initial_capital, np.zeros(seeds, dtype=np.int64))
+
+    probability = float(params.get("random_trade_probability", 0.02))
+    stop_pct = float(params.get("random_stop_pct", 0.002))
+    multiple = float(params.get("random_target_multiple", params.get("target_multiple", 2.0)))
+    cooldown = int(params.get("random_cooldown_bars", 24))
+    rng = np.random.default_rng(params.get("random_seed", 42))
+
+    high = np.fromiter((c.high for c in candles), dtype=np.float64, count=count)
+    low = np.fromiter((c.low for c in candles), dtype=np.float64, count=count)
+    close = np.fromiter((c.close for c in candles), dtype=np.float64, count=count)
+    day_ids = CalendarColumns.from_candles(candles).day_ids
+    tradable = close * stop_pct > 0
+    exits = {side: _stop_target_exits(high, low, close, stop_pct, multiple, side) for side in (1, -1)}
+
+    # Candidate entries of every bar and seed, drawn a chunk of bars at a time to bound memory.
+    candidate_seed, candidate_bar, candidate_side = [], [], []
+    chunk = 1024
+    for start in range(0, count, chunk):
+        rows = min(chunk, count - start)
+        trade_draws = rng.random((rows, seeds))
+        side_draws = rng.random((rows, seeds))
+        row, seed = np.nonzero((trade_draws <= probability) & tradable[start : start + rows, None])
+        candidate_seed.append(seed)
+        candidate_bar.append(start + row)
+        candidate_side.append(np.where(side_draws[row, seed] >= 0.5, 1, -1))
+    candidate_seed = np.concatenate(candidate_seed)
+    candidate_bar = np.concatenate(candidate_bar)
+    order = np.lexsort((candidate_bar, candidate_seed))
+    keys = candidate_seed[order] * count + candidate_bar[order]
+    next_day = np.searchsorted(day_ids, day_ids, side="right")
+    taken = _cooldown_entries(keys, seeds, count, cooldown, next_day)
+    entry_seed = candidate_seed[order][taken]
+    entry_bar = candidate_bar[order][taken]
+    entry_side = np.concatenate(candidate_side)[order][taken]
+
+    day_index = np.concatenate(([0], np.cumsum(day_ids[1:] != day_ids[:-1])))
+    log_growth = np.zeros((seeds, int(day_index[-1]) + 1))
+    trades = np.zeros(seeds, dtype=np.int64)
+    if entry_seed.size:
+        who, bars, sides = entry_seed, entry_bar, entry_side
+        exit_bar = np.where(sides == 1, exits[1][0][bars], exits[-1][0][bars])
+        r_multiple = np.where(sides == 1, exits[1][1][bars], exits[-1][1][bars])
+        # Sized from equity on the exit day, not at entry as the engine does, so
+        # overlapping trades compound slightly differently.
+        np.add.at(log_growth, (who, day_index[exit_bar]), np.log1p(risk_per_trade * r_multiple))
+        trades = np.bincount(who, minlength=seeds)
+
+    equity = initial_capital * np.exp(np.cumsum(log_growth, axis=1))
+    curve = np.concatenate((np.full((seeds, 1), initial_capital), equity), axis=1)
+    returns = curve[:, 1:] / curve[:, :-1] - 1
+    std = returns.std(axis=1)
+    sharpe = np.divide(returns.mean(axis=1), std, out=np.zeros(seeds), where=std > 0) * periods_per_year**0.5
+    years = max((candles[-1].time - candles[0].time).days / 365.25, 0.0)
+    final = equity[:, -1]
+    cagr = (final / initial_capital) ** (1 / years) - 1 if years > 0 else np.zeros(seeds)
+    peaks = np.maximum.accumulate(curve, axis=1)
+    max_drawdown = ((peaks - curve) / peaks).max(axis=1)
+    return RandomNullDistribution(sharpe, cagr, max_drawdown, final, trades)
+
+
+def _cooldown_entries(keys: np.ndarray, seeds: int, count: int, cooldown: int, next_day: np.ndarray) -> np.ndarray:
+    """Positions in ``keys`` (sorted ``seed * count + bar``) of the entries the cooldown and one-per-day rules keep."""
+    taken = []
+    earliest = np.zeros(seeds, dtype=np.int64)
+    active = np.arange(seeds, dtype=np.int64)
+    while active.size:
+        pos = np.searchsorted(keys, active * count + earliest[active])
+        found = pos < keys.size
+        found[found] = keys[pos[found]] < (active[found] + 1) * count
+        active, pos = active[found], pos[found]
+        taken.append(pos)
+        bars = keys[pos] - active * count
+        # Bars are time-ordered, so "another day" means at or after the next day's first bar.
+        earliest[active] = np.maximum(bars + cooldown, next_day[bars])
+    return np.sort(np.concatenate(taken)) if taken else np.zeros(0, dtype=np.int64)
+
+
+def _stop_target_exits(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    stop_pct: float,
+    multiple: float,
+    side: int,
+    block: int = 64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Exit bar and R multiple of a ``side`` (+1 long, -1 short) trade entered at each bar's close."""
+    count = len(close)
+    distance = close * stop_pct
+    leg = np.maximum(distance, 0.00001)  # Strategy.calculate_manipulation_leg
+    stop = close - side * distance
+    target = close + side * multiple * leg
+    exit_bar = np.full(count, count - 1)
+    r_multiple = side * (close[-1] - close) / leg
+    stop_r = -distance / leg
+    pending = np.arange(count - 1)
+    offset = 1
+    while pending.size:
+        idx = pending[:, None] + np.arange(offset, offset + block)[None, :]
+        valid = idx < count
+        idx = np.minimum(idx, count - 1)
+        if side == 1:
+            stop_hit = low[idx] <= stop[pending, None]
+            target_hit = high[idx] >= target[pending, None]
+        else:
+            stop_hit = high[idx] >= stop[pending, None]
+            target_hit = low[idx] <= target[pending, None]
+        hit = (stop_hit | target_hit) & valid
+        done = hit.any(axis=1)
+        first = hit.argmax(axis=1)[done]
+        rows = pending[done]
+        exit_bar[rows] = rows + offset + first
+        r_multiple[rows] = np.where(stop_hit[done, first], stop_r[rows], multiple)
+        pending = pending[~done & valid[:, -1]]
+        offset += block
+    return exit_bar, r_multiple
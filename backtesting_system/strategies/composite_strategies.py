@@ -37,6 +37,10 @@ class CompositeStrategy(Strategy):
             adr_remaining_pct=adr_remaining_pct,
         )
 
+    def on_run_end(self) -> None:
+        self.weekly_profile_strategy.on_run_end()
+        self.ict_strategy.on_run_end()
+
     def generate_signals(self, data) -> dict:
         weekly_signal = self.weekly_profile_strategy.generate_signals(data)
         ict_signal = self.ict_strategy.generate_signals(data)
@@ -72,15 +76,10 @@ class CompositeStrategy(Strategy):
         return True
 
     def _build_context(self, data, signal) -> dict:
-        history = data.get("history", [])
-        daily_candles = self._daily_from_history(history)
+        daily_candles = self.ict_strategy.daily_candles(data)
         bar = data.get("bar")
 
-        h1_arrays = {
-            "fvgs": self.ict_strategy.pda_detector.identify_fair_value_gaps(history[-50:]),
-            "order_blocks": self.ict_strategy.pda_detector.identify_order_blocks(history[-50:]),
-            "breakers": self.ict_strategy.identify_breaker_blocks(history[-50:]),
-        }
+        h1_arrays = self.ict_strategy.h1_arrays(data)
         entry_price = signal.get("entry") or (bar.close if bar else None)
         pda_at_entry = False
         pda_type = ""
@@ -92,15 +91,8 @@ class CompositeStrategy(Strategy):
 
         opening_range_aligned = False
         if bar is not None:
-            day_candles = [c for c in history if c.time.date() == bar.time.date()]
-            if day_candles:
-                day_low = min(c.low for c in day_candles)
-                day_high = max(c.high for c in day_candles)
-                opening_range = self.ict_strategy.opening_range.calculate_opening_range(
-                    day_candles[0],
-                    day_low,
-                    day_high,
-                )
+            opening_range = self.ict_strategy.session_opening_range(data)
+            if opening_range:
                 opening_range_aligned = self.ict_strategy.opening_range.is_entry_in_zone(
                     float(entry_price) if entry_price is not None else bar.close,
                     opening_range,
@@ -113,7 +105,7 @@ class CompositeStrategy(Strategy):
                 swing_level = daily_candles[-2].low if len(daily_candles) >= 2 else daily_candles[-1].low
             else:
                 swing_level = daily_candles[-2].high if len(daily_candles) >= 2 else daily_candles[-1].high
-            stop_hunt = self.ict_strategy.stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)
+            stop_hunt = self.ict_strategy.detect_stop_hunt(data, swing_level)
             stop_hunt_confirmed = bool(stop_hunt.get("detected"))
 
         return {
@@ -125,7 +117,7 @@ class CompositeStrategy(Strategy):
             "opening_range_aligned": opening_range_aligned,
             "stop_hunt_confirmed": stop_hunt_confirmed,
             "news_impact": self._identify_news_impact(bar, data.get("symbol", "")),
-            "adr_remaining_pct": self._adr_remaining_pct(history),
+            "adr_remaining_pct": self._adr_remaining_pct(daily_candles),
         }
 
     def _identify_news_impact(self, bar, symbol: str) -> str:
@@ -138,30 +130,7 @@ class CompositeStrategy(Strategy):
             return "high_impact"
         return "none"
 
-    def _daily_from_history(self, history):
-        if not history:
-            return []
-        daily = {}
-        for c in history:
-            key = (c.time.year, c.time.month, c.time.day)
-            daily.setdefault(key, []).append(c)
-        result = []
-        for key in sorted(daily.keys()):
-            chunk = daily[key]
-            result.append(
-                type(chunk[0])(
-                    time=chunk[0].time.replace(hour=0, minute=0, second=0, microsecond=0),
-                    open=chunk[0].open,
-                    high=max(x.high for x in chunk),
-                    low=min(x.low for x in chunk),
-                    close=chunk[-1].close,
-                    volume=None,
-                )
-            )
-        return result
-
-    def _adr_remaining_pct(self, history) -> float:
-        daily = self._daily_from_history(history)
+    def _adr_remaining_pct(self, daily) -> float:
         if len(daily) < 2:
             return 0.0
         ranges = [d.high - d.low for d in daily[-15:-1]]
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Dict, List
+from typing import List
 
 from backtesting_system.core.strategy_base import Strategy
 from backtesting_system.models.market import Candle
@@ -24,9 +23,6 @@ class DailySwingFrameworkStrategy(Strategy):
         self._stop_helper = ICTFramework(params)
         self.killzone_validator = KillzoneValidator()
         self.enforce_killzones = params.get("enforce_killzones", True)
-        self._daily_cache: Dict[datetime, List[Candle]] = {}
-        self._daily_series: List[Candle] = []
-        self._last_hist_len: int = 0
 
     def identify_setup(self, data) -> bool:
         return True
@@ -85,16 +81,12 @@ class DailySwingFrameworkStrategy(Strategy):
         bar = data["bar"]
         if self.enforce_killzones and not self.killzone_validator.is_valid_killzone(bar.time):
             return {}
-        daily_candles = self._aggregate_daily(history)
+        daily_candles = self.daily_bars(data).candles
         framework = self.identify_daily_swing_framework(daily_candles)
         if framework.get("type") == "neutral":
             return {}
 
-        h1_arrays = {
-            "fvgs": self.pda_detector.identify_fair_value_gaps(history[-50:]),
-            "order_blocks": self.pda_detector.identify_order_blocks(history[-50:]),
-            "breakers": self._stop_helper.identify_breaker_blocks(history[-50:]),
-        }
+        h1_arrays = self._stop_helper.h1_arrays(data)
         entry_ok, pda_type = self.pda_detector.validate_entry_at_pda(bar.close, h1_arrays)
         if not entry_ok:
             return {}
@@ -120,35 +112,3 @@ class DailySwingFrameworkStrategy(Strategy):
 
     def validate_context(self, data) -> bool:
         return True
-
-    def _aggregate_daily(self, history: List[Candle]) -> List[Candle]:
-        if not history:
-            return []
-        if len(history) == self._last_hist_len:
-            return self._daily_series
-
-        for candle in history[self._last_hist_len :]:
-            day_key = datetime(
-                candle.time.year,
-                candle.time.month,
-                candle.time.day,
-                tzinfo=timezone.utc,
-            )
-            self._daily_cache.setdefault(day_key, []).append(candle)
-        self._last_hist_len = len(history)
-
-        result: List[Candle] = []
-        for day in sorted(self._daily_cache.keys()):
-            chunk = self._daily_cache[day]
-            result.append(
-                Candle(
-                    time=day,
-                    open=chunk[0].open,
-                    high=max(c.high for c in chunk),
-                    low=min(c.low for c in chunk),
-                    close=chunk[-1].close,
-                    volume=None,
-                )
-            )
-        self._daily_series = result
-        return result
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
 
 from backtesting_system.core.strategy_base import Strategy
 from backtesting_system.models.market import Candle
+from backtesting_system.strategies.pda_stream import StreamingPDADetector, zones_contain
+from backtesting_system.strategies.pda_table import PDATable
 from backtesting_system.utils.timezones import ASIA, LONDON, NY
 
 
@@ -29,6 +31,22 @@ class KillzoneValidator:
                 return True
         return False
 
+    def next_valid_time(
+        self,
+        dt: datetime,
+        timezone_offset: int = -5,
+        allow_monday: bool = False,
+    ) -> datetime:
+        """First time at or after ``dt`` that falls inside a killzone."""
+        if self.is_valid_killzone(dt, timezone_offset, allow_monday):
+            return dt
+        candidate = dt.replace(minute=0, second=0, microsecond=0)
+        for _ in range(8 * 24):
+            candidate += timedelta(hours=1)
+            if self.is_valid_killzone(candidate, timezone_offset, allow_monday):
+                return candidate
+        return candidate
+
 
 class PDAArrayDetector:
     def identify_fair_value_gaps(self, candles: List[Candle]) -> List[dict]:
@@ -140,17 +158,15 @@ class PDAArrayDetector:
         
         return rejection_blocks
 
+    def precompute(self, candles: List[Candle]) -> PDATable:
+        """Batch mode: every PDA array of ``candles`` at once, queried per bar via ``PDATable.window_arrays``."""
+        return PDATable.from_candles(candles)
+
     def validate_entry_at_pda(self, entry_price: float, arrays: dict, tolerance_pips: float = 5.0) -> tuple[bool, str | None]:
         tolerance = tolerance_pips / 10000
-        for fvg in arrays.get("fvgs", []):
-            if fvg["low"] - tolerance <= entry_price <= fvg["high"] + tolerance:
-                return True, "fvg"
-        for ob in arrays.get("order_blocks", []):
-            if ob["low"] - tolerance <= entry_price <= ob["high"] + tolerance:
-                return True, "order_block"
-        for rb in arrays.get("rejection_blocks", []):
-            if rb["low"] - tolerance <= entry_price <= rb["high"] + tolerance:
-                return True, "rejection_block"
+        for key, name in (("fvgs", "fvg"), ("order_blocks", "order_block"), ("rejection_blocks", "rejection_block")):
+            if zones_contain(arrays.get(key, []), entry_price, tolerance):
+                return True, name
         return False, None
 
 
@@ -198,30 +214,96 @@ class StopHuntDetector:
             return {"detected": False}
         avg_range = sum(c.high - c.low for c in recent) / len(recent)
         for candle in recent:
-            body = abs(candle.close - candle.open)
-            if candle.low < swing_level < candle.high:
-                lower_wick = swing_level - candle.low
-                if lower_wick > 0 and body > 0 and lower_wick >= body * 2.5 and lower_wick >= avg_range * 0.5 and candle.close > candle.open:
-                    return {
-                        "detected": True,
-                        "type": "bullish",
-                        "level_swept": swing_level,
-                        "wick_size": lower_wick,
-                        "body_size": body,
-                        "wick_ratio": lower_wick / body if body > 0 else 0,
-                        "strength": "strong" if (lower_wick / body) > 3.0 else "medium",
-                    }
-                upper_wick = candle.high - swing_level
-                if upper_wick > 0 and body > 0 and upper_wick >= body * 2.5 and upper_wick >= avg_range * 0.5 and candle.close < candle.open:
-                    return {
-                        "detected": True,
-                        "type": "bearish",
-                        "level_swept": swing_level,
-                        "wick_size": upper_wick,
-                        "body_size": body,
-                        "wick_ratio": upper_wick / body if body > 0 else 0,
-                        "strength": "strong" if (upper_wick / body) > 3.0 else "medium",
-                    }
+            hunt = self.sweep(candle, swing_level, avg_range)
+            if hunt is not None:
+                return hunt
+        return {"detected": False}
+
+    @staticmethod
+    def pierces(candle: Candle, swing_level: float) -> bool:
+        """``sweep`` without the range condition, i.e. whether ``candle`` can sweep ``swing_level`` at all."""
+        if not candle.low < swing_level < candle.high:
+            return False
+        body = abs(candle.close - candle.open)
+        if body <= 0:
+            return False
+        if candle.close > candle.open:
+            return swing_level - candle.low >= body * 2.5
+        return candle.close < candle.open and candle.high - swing_level >= body * 2.5
+
+    @staticmethod
+    def sweep(candle: Candle, swing_level: float, avg_range: float) -> dict | None:
+        body = abs(candle.close - candle.open)
+        if candle.low < swing_level < candle.high:
+            lower_wick = swing_level - candle.low
+            if lower_wick > 0 and body > 0 and lower_wick >= body * 2.5 and lower_wick >= avg_range * 0.5 and candle.close > candle.open:
+                return {
+                    "detected": True,
+                    "type": "bullish",
+                    "level_swept": swing_level,
+                    "wick_size": lower_wick,
+                    "body_size": body,
+                    "wick_ratio": lower_wick / body if body > 0 else 0,
+                    "strength": "strong" if (lower_wick / body) > 3.0 else "medium",
+                }
+            upper_wick = candle.high - swing_level
+            if upper_wick > 0 and body > 0 and upper_wick >= body * 2.5 and upper_wick >= avg_range * 0.5 and candle.close < candle.open:
+                return {
+                    "detected": True,
+                    "type": "bearish",
+                    "level_swept": swing_level,
+                    "wick_size": upper_wick,
+                    "body_size": body,
+                    "wick_ratio": upper_wick / body if body > 0 else 0,
+                    "strength": "strong" if (upper_wick / body) > 3.0 else "medium",
+                }
+        return None
+
+
+class StreamingStopHunt:
+    """
+    ``StopHuntDetector.detect_stop_hunt(history[-lookback:], level)`` for a growing history.
+
+    Per swing level it remembers which bars of the window pierce the level
+    with a long enough wick (``StopHuntDetector.pierces``) and only checks
+    the bars added since the last call. The average range is needed only
+    when such a bar exists, which is rare, so it is summed then over the
+    window exactly as the detector does. The few most recent levels are
+    kept, since callers alternate between the previous day's high and low.
+    """
+
+    MAX_LEVELS = 8
+
+    def __init__(self, lookback: int = 20, detector: StopHuntDetector | None = None) -> None:
+        self.lookback = lookback
+        self.detector = detector or StopHuntDetector()
+        self._history: Sequence[Candle] | None = None
+        self._levels: Dict[float, Tuple[int, List[int]]] = {}
+
+    def detect(self, history: Sequence[Candle], swing_level: float) -> dict:
+        total = len(history)
+        if history is not self._history or any(scanned > total for scanned, _bars in self._levels.values()):
+            self._history = history
+            self._levels = {}
+        first = max(total - self.lookback, 0)
+        if total == first:
+            return {"detected": False}
+        scanned, bars = self._levels.pop(swing_level, (first, []))
+        if scanned < first:
+            scanned, bars = first, []
+        pierces = self.detector.pierces
+        bars = [idx for idx in bars if idx >= first]
+        bars.extend(idx for idx in range(scanned, total) if pierces(history[idx], swing_level))
+        self._levels[swing_level] = (total, bars)
+        if len(self._levels) > self.MAX_LEVELS:
+            del self._levels[next(iter(self._levels))]
+        if not bars:
+            return {"detected": False}
+        avg_range = sum(c.high - c.low for c in history[first:total]) / (total - first)
+        for idx in bars:
+            hunt = self.detector.sweep(history[idx], swing_level, avg_range)
+            if hunt is not None:
+                return hunt
         return {"detected": False}
 
 
@@ -387,6 +469,45 @@ class ICTFramework(Strategy):
                 breakers.append({"type": "bullish", "level": curr.low, "index": i})
         return breakers
 
+    def h1_arrays(self, data, rejection_blocks: bool = False) -> dict:
+        """PDA arrays over the last 50 H1 bars, kept up to date by a StreamingPDADetector shared through ``data["features"]``."""
+        stream = self.feature_state(data, "pda_stream", StreamingPDADetector)
+        stream.sync(data.get("history", []))
+        arrays = {
+            "fvgs": stream.fvgs(),
+            "order_blocks": stream.order_blocks(),
+            "breakers": stream.breakers(),
+        }
+        if rejection_blocks:
+            arrays["rejection_blocks"] = stream.rejection_blocks()
+        return arrays
+
+    def detect_stop_hunt(self, data, swing_level: float) -> dict:
+        """``stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)`` via a StreamingStopHunt shared through ``data["features"]``."""
+        return self.feature_state(data, "stop_hunt", StreamingStopHunt).detect(data.get("history", []), swing_level)
+
+    def session_opening_range(self, data) -> dict:
+        """``OpeningRangeFramework.calculate_opening_range`` for today so far, or ``{}`` before the first bar."""
+        session = self.session_state(data)
+        if session.first is None:
+            return {}
+        return self.opening_range.calculate_opening_range(session.first, session.low, session.high)
+
+    def day_candles(self, data) -> List[Candle]:
+        return self.cached_feature(data, "day_candles", lambda: self._day_candles(data))
+
+    def _day_candles(self, data) -> List[Candle]:
+        history = data.get("history", [])
+        calendar = data.get("calendar")
+        index = len(history) - 1
+        if calendar is not None and calendar.sorted and 0 <= index < len(calendar):
+            return list(history[calendar.day_start(index) : index + 1])
+        day = data["bar"].time.date()
+        return [c for c in history if c.time.date() == day]
+
+    def daily_candles(self, data) -> List[Candle]:
+        return self.daily_bars(data).candles
+
     def calculate_stop_loss(
         self,
         direction: str,
@@ -499,23 +620,24 @@ class ICTFramework(Strategy):
         return {"low": low, "high": high}
 
     def identify_ny_reversal(self, data) -> dict:
+        return self.cached_feature(data, "ny_reversal", lambda: self._identify_ny_reversal(data))
+
+    def _identify_ny_reversal(self, data) -> dict:
         history = data.get("history", [])
         if len(history) < 30:
             return {}
-        day = history[-1].time.date()
-        asia = [c for c in history if c.time.date() == day and ASIA.start <= c.time.time() <= ASIA.end]
-        london = [c for c in history if c.time.date() == day and LONDON.start <= c.time.time() <= LONDON.end]
-        ny = [c for c in history if c.time.date() == day and NY.start <= c.time.time() <= NY.end]
-        if not asia or not london or not ny:
+        session = self.session_state(data)
+        opens, closes = session.opens, session.closes
+        if ASIA.name not in opens or LONDON.name not in opens or NY.name not in opens:
             return {}
-        asia_trend_down = asia[-1].close < asia[0].open
-        london_trend_down = london[-1].close < london[0].open
-        ny_reversal = ny[-1].close > ny[0].open
+        asia_trend_down = closes[ASIA.name] < opens[ASIA.name]
+        london_trend_down = closes[LONDON.name] < opens[LONDON.name]
+        ny_reversal = closes[NY.name] > opens[NY.name]
         if asia_trend_down and london_trend_down and ny_reversal:
             return {"direction": "long"}
-        asia_trend_up = asia[-1].close > asia[0].open
-        london_trend_up = london[-1].close > london[0].open
-        ny_reversal_down = ny[-1].close < ny[0].open
+        asia_trend_up = closes[ASIA.name] > opens[ASIA.name]
+        london_trend_up = closes[LONDON.name] > opens[LONDON.name]
+        ny_reversal_down = closes[NY.name] < opens[NY.name]
         if asia_trend_up and london_trend_up and ny_reversal_down:
             return {"direction": "short"}
         return {}
@@ -560,24 +682,14 @@ class ICTFramework(Strategy):
         if not self.killzone.is_valid_killzone(bar.time):
             return {}
 
-        daily = self._daily_from_history(history)
+        daily = self.daily_candles(data)
         cisd = self.cisd_validator.detect_cisd(daily, history)
         if not cisd.get("detected"):
             return {}
 
-        day_candles = [c for c in history if c.time.date() == bar.time.date()]
-        if day_candles:
-            day_low = min(c.low for c in day_candles)
-            day_high = max(c.high for c in day_candles)
-            opening_range = self.opening_range.calculate_opening_range(day_candles[0], day_low, day_high)
-        else:
-            opening_range = {}
-
-        h1_arrays = {
-            "fvgs": self.pda_detector.identify_fair_value_gaps(history[-50:]),
-            "order_blocks": self.pda_detector.identify_order_blocks(history[-50:]),
-            "breakers": self.identify_breaker_blocks(history[-50:]),
-        }
+        opening_range = self.session_opening_range(data)
+
+        h1_arrays = self.h1_arrays(data)
 
         fvg_list = self.identify_fvg(history[-50:])
         if not fvg_list:
@@ -594,7 +706,7 @@ class ICTFramework(Strategy):
                 if opening_range and not self.opening_range.is_entry_in_zone(bar.close, opening_range):
                     return {}
                 swing_level = daily[-2].low if len(daily) >= 2 else stop
-                stop_hunt = self.stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)
+                stop_hunt = self.detect_stop_hunt(data, swing_level)
                 if not stop_hunt.get("detected"):
                     return {}
                 return {"direction": "long", "entry": bar.close, "stop": stop, "target": target}
@@ -606,7 +718,7 @@ class ICTFramework(Strategy):
             if opening_range and not self.opening_range.is_entry_in_zone(bar.close, opening_range):
                 return {}
             swing_level = daily[-2].high if len(daily) >= 2 else stop
-            stop_hunt = self.stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)
+            stop_hunt = self.detect_stop_hunt(data, swing_level)
             if not stop_hunt.get("detected"):
                 return {}
             return {"direction": "short", "entry": bar.close, "stop": stop, "target": target}
@@ -621,7 +733,7 @@ class ICTFramework(Strategy):
             if opening_range and not self.opening_range.is_entry_in_zone(bar.close, opening_range):
                 return {}
             swing_level = daily[-2].low if len(daily) >= 2 else stop
-            stop_hunt = self.stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)
+            stop_hunt = self.detect_stop_hunt(data, swing_level)
             if not stop_hunt.get("detected"):
                 return {}
             return {"direction": "long", "entry": bar.close, "stop": stop, "target": target}
@@ -634,33 +746,11 @@ class ICTFramework(Strategy):
             if opening_range and not self.opening_range.is_entry_in_zone(bar.close, opening_range):
                 return {}
             swing_level = daily[-2].high if len(daily) >= 2 else stop
-            stop_hunt = self.stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)
+            stop_hunt = self.detect_stop_hunt(data, swing_level)
             if not stop_hunt.get("detected"):
                 return {}
             return {"direction": "short", "entry": bar.close, "stop": stop, "target": target}
         return {}
 
-    def _daily_from_history(self, history: List[Candle]) -> List[Candle]:
-        if not history:
-            return []
-        daily = {}
-        for c in history:
-            key = (c.time.year, c.time.month, c.time.day)
-            daily.setdefault(key, []).append(c)
-        result = []
-        for key in sorted(daily.keys()):
-            chunk = daily[key]
-            result.append(
-                Candle(
-                    time=chunk[0].time.replace(hour=0, minute=0, second=0, microsecond=0),
-                    open=chunk[0].open,
-                    high=max(x.high for x in chunk),
-                    low=min(x.low for x in chunk),
-                    close=chunk[-1].close,
-                    volume=None,
-                )
-            )
-        return result
-
     def validate_context(self, data) -> bool:
         return True
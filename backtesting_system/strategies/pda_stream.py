@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from backtesting_system.core.interval_index import IntervalIndex
+from backtesting_system.models.market import Candle
+
+
+class ZoneView(Sequence):
+    """
+    Read-only list of zone dicts over one slice of a ZoneSeries.
+
+    The dicts are built on first access, with ``index_key`` set to the zone's
+    position relative to ``offset``, so they match what the batch scanners
+    return for the same window. Appends and expiry after the view was taken
+    do not change it.
+
+    While the series has not moved on, ``contains`` and ``near`` answer from
+    the series' interval index; afterwards they scan the view's own zones.
+    """
+
+    __slots__ = ("_zones", "_positions", "_lo", "_hi", "_offset", "_index_key", "_items", "_series")
+
+    def __init__(
+        self,
+        zones: List[dict],
+        positions: List[int],
+        lo: int,
+        hi: int,
+        offset: int,
+        index_key: str,
+        series: "ZoneSeries | None" = None,
+    ) -> None:
+        self._zones = zones
+        self._positions = positions
+        self._lo = lo
+        self._hi = hi
+        self._offset = offset
+        self._index_key = index_key
+        self._items: List[dict] | None = None
+        self._series = series
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def _materialize(self) -> List[dict]:
+        if self._items is None:
+            key, offset, positions = self._index_key, self._offset, self._positions
+            items = []
+            for idx in range(self._lo, self._hi):
+                zone = dict(self._zones[idx])
+                zone[key] = positions[idx] - offset
+                items.append(zone)
+            self._items = items
+        return self._items
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._materialize())
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+    def contains(self, price: float, tolerance: float = 0.0, side: str | None = None) -> bool:
+        """Whether a zone (of ``side``, if given) satisfies ``low - tolerance <= price <= high + tolerance``."""
+        index = self._index()
+        if index is not None:
+            sides = index.values() if side is None else [index[side]] if side in index else []
+            return any(tree.overlaps(price, tolerance) for tree in sides)
+        for idx in range(self._lo, self._hi):
+            zone = self._zones[idx]
+            if (side is None or zone["type"] == side) and zone["low"] - tolerance <= price <= zone["high"] + tolerance:
+                return True
+        return False
+
+    def near(self, price: float, tolerance: float = 0.0, side: str | None = None) -> bool:
+        """Whether a level (of ``side``, if given) satisfies ``abs(level - price) <= tolerance``."""
+        index = self._index()
+        if index is not None:
+            sides = index.values() if side is None else [index[side]] if side in index else []
+            return any(tree.near(price, tolerance) for tree in sides)
+        for idx in range(self._lo, self._hi):
+            zone = self._zones[idx]
+            if (side is None or zone["type"] == side) and abs(zone["level"] - price) <= tolerance:
+                return True
+        return False
+
+    def _index(self) -> Dict[str, IntervalIndex] | None:
+        series = self._series
+        if (
+            series is None
+            or series.zones is not self._zones
+            or series.start != self._lo
+            or len(series.zones) != self._hi
+        ):
+            return None
+        return series.index
+
+
+class ZoneSeries:
+    """
+    Zones in formation order with the absolute bar position they are indexed by,
+    plus an ``IntervalIndex`` per side over the ``bounds`` fields of the live zones.
+    """
+
+    __slots__ = ("zones", "positions", "start", "bounds", "index")
+
+    def __init__(self, bounds: Tuple[str, str] = ("low", "high")) -> None:
+        self.zones: List[dict] = []
+        self.positions: List[int] = []
+        self.start = 0
+        self.bounds = bounds
+        self.index: Dict[str, IntervalIndex] = {}
+
+    def append(self, position: int, zone: dict) -> None:
+        self.zones.append(zone)
+        self.positions.append(position)
+        low, high = self.bounds
+        side = self.index.get(zone["type"])
+        if side is None:
+            side = self.index[zone["type"]] = IntervalIndex()
+        side.insert(position, zone[low], zone[high])
+
+    def expire(self, oldest: int) -> None:
+        """Drop zones positioned before ``oldest``."""
+        positions = self.positions
+        start = self.start
+        low = self.bounds[0]
+        while start < len(positions) and positions[start] < oldest:
+            zone = self.zones[start]
+            self.index[zone["type"]].remove(positions[start], zone[low])
+            start += 1
+        self.start = start
+        if start > 256 and start * 2 > len(positions):
+            # New lists rather than in-place deletes, so views taken earlier stay valid.
+            self.zones = self.zones[start:]
+            self.positions = self.positions[start:]
+            self.start = 0
+
+    def clear(self) -> None:
+        self.zones, self.positions, self.start = [], [], 0
+        self.index = {}
+
+    def view(self, offset: int, index_key: str = "index") -> ZoneView:
+        return ZoneView(self.zones, self.positions, self.start, len(self.zones), offset, index_key, self)
+
+
+class StreamingPDADetector:
+    """
+    Fair value gaps, order blocks, breakers and rejection blocks of the last
+    ``window`` bars, maintained as the history grows.
+
+    Each new bar adds the zones it completes and expires those that left the
+    window, so a time-ordered history costs O(1) amortized per bar instead of
+    a rescan. The views equal what ``PDAArrayDetector.identify_fair_value_gaps``,
+    ``identify_order_blocks``, ``identify_rejection_blocks`` and
+    ``ICTFramework.identify_breaker_blocks`` return for ``history[-window:]``
+    with their default lookbacks.
+
+    Each series keeps an interval index per side over its live zones for
+    ``ZoneView.contains``/``near`` on a current view; see ``IntervalIndex``
+    for its cost.
+    """
+
+    def __init__(self, window: int = 50, breaker_lookback: int = 5, rejection_lookback: int = 20) -> None:
+        self.window = window
+        self.breaker_lookback = breaker_lookback
+        self.rejection_lookback = rejection_lookback
+        self._fvgs = ZoneSeries()
+        self._order_blocks = ZoneSeries()
+        self._breakers = ZoneSeries(bounds=("level", "level"))
+        self._rejection_blocks = ZoneSeries()
+        self._history: Sequence[Candle] | None = None
+        self._synced = 0
+
+    def sync(self, history: Sequence[Candle]) -> None:
+        total = len(history)
+        if history is not self._history or total < self._synced:
+            self._reset(history)
+        if total == self._synced:
+            return
+        # Zones formed before this point cannot reach the current window.
+        begin = max(self._synced, total - self.window - 3)
+        if begin > self._synced:
+            self._clear()
+        lead = min(begin, 3)
+        candles = history[begin - lead : total]
+        for pos in range(begin, total):
+            self._add_bar(candles, pos - begin + lead, pos)
+        self._synced = total
+        self._expire(total)
+
+    def fvgs(self) -> ZoneView:
+        start = max(self._synced - self.window, 0)
+        return self._fvgs.view(start)
+
+    def order_blocks(self) -> ZoneView:
+        start = max(self._synced - self.window, 0)
+        return self._order_blocks.view(start, "reversal_index")
+
+    def breakers(self) -> ZoneView:
+        size = self.breaker_lookback + 2
+        if min(self._synced, self.window) < size:
+            return self._empty()
+        return self._breakers.view(self._synced - size)
+
+    def rejection_blocks(self) -> ZoneView:
+        if min(self._synced, self.window) < self.rejection_lookback + 3:
+            return self._empty()
+        return self._rejection_blocks.view(self._synced - self.rejection_lookback)
+
+    def _empty(self) -> ZoneView:
+        return ZoneView([], [], 0, 0, 0, "index")
+
+    def _reset(self, history: Sequence[Candle]) -> None:
+        self._history = history
+        self._synced = 0
+        self._clear()
+
+    def _clear(self) -> None:
+        self._fvgs.clear()
+        self._order_blocks.clear()
+        self._breakers.clear()
+        self._rejection_blocks.clear()
+
+    def _expire(self, total: int) -> None:
+        start = max(total - self.window, 0)
+        self._fvgs.expire(start + 2)
+        self._order_blocks.expire(start + 1)
+        self._breakers.expire(total - self.breaker_lookback - 1)
+        self._rejection_blocks.expire(total - self.rejection_lookback)
+
+    def _add_bar(self, candles: Sequence[Candle], i: int, pos: int) -> None:
+        """Record the zones completed by bar ``pos`` (``candles[i]``)."""
+        curr = candles[i]
+        if i >= 1:
+            prev = candles[i - 1]
+            if prev.close < prev.open and curr.close > curr.open:
+                self._order_blocks.append(pos, {
+                    "type": "bullish",
+                    "low": prev.low,
+                    "high": prev.close,
+                    "reversal_index": 0,
+                    "liquidity_level": prev.close,
+                })
+            elif prev.close > prev.open and curr.close < curr.open:
+                self._order_blocks.append(pos, {
+                    "type": "bearish",
+                    "low": prev.close,
+                    "high": prev.high,
+                    "reversal_index": 0,
+                    "liquidity_level": prev.close,
+                })
+            if curr.high > prev.high and curr.close < curr.open:
+                self._breakers.append(pos, {"type": "bearish", "level": curr.high, "index": 0})
+            if curr.low < prev.low and curr.close > curr.open:
+                self._breakers.append(pos, {"type": "bullish", "level": curr.low, "index": 0})
+        if i >= 2:
+            c1 = candles[i - 2]
+            if c1.high < curr.low:
+                self._fvgs.append(pos, {
+                    "type": "bullish",
+                    "low": c1.high,
+                    "high": curr.low,
+                    "mid": (c1.high + curr.low) / 2,
+                    "size_pips": (curr.low - c1.high) * 10000,
+                    "index": 0,
+                })
+            elif c1.low > curr.high:
+                self._fvgs.append(pos, {
+                    "type": "bearish",
+                    "low": curr.high,
+                    "high": c1.low,
+                    "mid": (curr.high + c1.low) / 2,
+                    "size_pips": (c1.low - curr.high) * 10000,
+                    "index": 0,
+                })
+        if i >= 3:
+            self._add_rejection_block(candles[i - 3], candles[i - 2 : i + 1], pos - 3)
+
+    def _add_rejection_block(self, candle: Candle, next_candles: Sequence[Candle], pos: int) -> None:
+        body = abs(candle.close - candle.open)
+        upper_wick = candle.high - max(candle.open, candle.close)
+        lower_wick = min(candle.open, candle.close) - candle.low
+        if lower_wick >= body * 2.0 and candle.close > candle.open:
+            if not any(c.close < candle.low for c in next_candles):
+                self._rejection_blocks.append(pos, {
+                    "type": "bullish",
+                    "level": candle.low,
+                    "high": min(candle.open, candle.close),
+                    "low": candle.low,
+                    "wick_size": lower_wick,
+                    "body_size": body,
+                    "wick_ratio": lower_wick / body if body > 0 else 0,
+                    "index": 0,
+                })
+        if upper_wick >= body * 2.0 and candle.close < candle.open:
+            if not any(c.close > candle.high for c in next_candles):
+                self._rejection_blocks.append(pos, {
+                    "type": "bearish",
+                    "level": candle.high,
+                    "low": max(candle.open, candle.close),
+                    "high": candle.high,
+                    "wick_size": upper_wick,
+                    "body_size": body,
+                    "wick_ratio": upper_wick / body if body > 0 else 0,
+                    "index": 0,
+                })
+
+
+def zones_contain(zones: Sequence[dict], price: float, tolerance: float, side: str | None = None) -> bool:
+    """``ZoneView.contains`` for any zone sequence; plain lists are scanned."""
+    contains = getattr(zones, "contains", None)
+    if contains is not None:
+        return contains(price, tolerance, side)
+    for zone in zones:
+        if (side is None or zone["type"] == side) and zone["low"] - tolerance <= price <= zone["high"] + tolerance:
+            return True
+    return False
+
+
+def levels_near(zones: Sequence[dict], price: float, tolerance: float, side: str | None = None) -> bool:
+    """``ZoneView.near`` for any zone sequence; plain lists are scanned."""
+    near = getattr(zones, "near", None)
+    if near is not None:
+        return near(price, tolerance, side)
+    for zone in zones:
+        if (side is None or zone["type"] == side) and abs(zone["level"] - price) <= tolerance:
+            return True
+    return False
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from backtesting_system.models.market import Candle
+
+BULLISH = 1
+BEARISH = -1
+
+_ZONE_FIELDS = [("bar", np.int64), ("type", np.int8), ("low", np.float64), ("high", np.float64)]
+FVG_DTYPE = np.dtype(_ZONE_FIELDS + [("mid", np.float64), ("size_pips", np.float64)])
+ORDER_BLOCK_DTYPE = np.dtype(_ZONE_FIELDS + [("liquidity_level", np.float64)])
+BREAKER_DTYPE = np.dtype([("bar", np.int64), ("type", np.int8), ("level", np.float64)])
+REJECTION_BLOCK_DTYPE = np.dtype(
+    _ZONE_FIELDS
+    + [("level", np.float64), ("wick_size", np.float64), ("body_size", np.float64), ("wick_ratio", np.float64)]
+)
+
+
+def _records(dtype: np.dtype, bar: np.ndarray, side: np.ndarray, **columns: np.ndarray) -> np.ndarray:
+    out = np.empty(len(bar), dtype=dtype)
+    out["bar"] = bar
+    out["type"] = side
+    for name, values in columns.items():
+        out[name] = values
+    return out
+
+
+def _side_name(side: int) -> str:
+    return "bullish" if side == BULLISH else "bearish"
+
+
+@dataclass
+class PDATable:
+    """
+    Every FVG, order block, breaker and rejection block of a candle series,
+    computed in one vectorized pass.
+
+    Each kind is a structured array sorted by ``bar``, the absolute position
+    of the candle that completes the zone (for rejection blocks: the wick
+    candle). Which zones a scanner would report at any bar is then a
+    ``searchsorted`` slice, see ``active`` and ``window_arrays``.
+    """
+
+    fvgs: np.ndarray
+    order_blocks: np.ndarray
+    breakers: np.ndarray
+    rejection_blocks: np.ndarray
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle]) -> "PDATable":
+        count = len(candles)
+        o = np.fromiter((c.open for c in candles), dtype=np.float64, count=count)
+        h = np.fromiter((c.high for c in candles), dtype=np.float64, count=count)
+        lo = np.fromiter((c.low for c in candles), dtype=np.float64, count=count)
+        c = np.fromiter((c.close for c in candles), dtype=np.float64, count=count)
+        return cls(
+            fvgs=cls._fair_value_gaps(h, lo),
+            order_blocks=cls._order_blocks(o, h, lo, c),
+            breakers=cls._breakers(o, h, lo, c),
+            rejection_blocks=cls._rejection_blocks(o, h, lo, c),
+        )
+
+    @staticmethod
+    def _fair_value_gaps(h: np.ndarray, lo: np.ndarray) -> np.ndarray:
+        bars = np.arange(2, len(h))
+        bull = h[:-2] < lo[2:]
+        bear = ~bull & (lo[:-2] > h[2:])
+        keep = bull | bear
+        low = np.where(bull, h[:-2], h[2:])[keep]
+        high = np.where(bull, lo[2:], lo[:-2])[keep]
+        return _records(
+            FVG_DTYPE,
+            bars[keep],
+            np.where(bull[keep], BULLISH, BEARISH),
+            low=low,
+            high=high,
+            mid=(low + high) / 2,
+            size_pips=(high - low) * 10000,
+        )
+
+    @staticmethod
+    def _order_blocks(o: np.ndarray, h: np.ndarray, lo: np.ndarray, c: np.ndarray) -> np.ndarray:
+        bars = np.arange(1, len(o))
+        down_prev, up_prev = c[:-1] < o[:-1], c[:-1] > o[:-1]
+        down_curr, up_curr = c[1:] < o[1:], c[1:] > o[1:]
+        bull = down_prev & up_curr
+        bear = ~bull & up_prev & down_curr
+        keep = bull | bear
+        return _records(
+            ORDER_BLOCK_DTYPE,
+            bars[keep],
+            np.where(bull[keep], BULLISH, BEARISH),
+            low=np.where(bull, lo[:-1], c[:-1])[keep],
+            high=np.where(bull, c[:-1], h[:-1])[keep],
+            liquidity_level=c[:-1][keep],
+        )
+
+    @staticmethod
+    def _breakers(o: np.ndarray, h: np.ndarray, lo: np.ndarray, c: np.ndarray) -> np.ndarray:
+        bars = np.arange(1, len(o))
+        bear = (h[1:] > h[:-1]) & (c[1:] < o[1:])
+        bull = (lo[1:] < lo[:-1]) & (c[1:] > o[1:])
+        bear_rows = _records(BREAKER_DTYPE, bars[bear], np.full(int(bear.sum()), BEARISH), level=h[1:][bear])
+        bull_rows = _records(BREAKER_DTYPE, bars[bull], np.full(int(bull.sum()), BULLISH), level=lo[1:][bull])
+        # The scanner reports the bearish breaker of a bar before its bullish one.
+        rows = np.concatenate([bear_rows, bull_rows])
+        return rows[np.argsort(rows["bar"], kind="stable")]
+
+    @staticmethod
+    def _rejection_blocks(o: np.ndarray, h: np.ndarray, lo: np.ndarray, c: np.ndarray) -> np.ndarray:
+        count = len(o) - 3
+        if count <= 0:
+            return np.empty(0, dtype=REJECTION_BLOCK_DTYPE)
+        o, h, lo, c_all = o[:count], h[:count], lo[:count], c
+        c = c_all[:count]
+        next_min = np.minimum.reduce([c_all[1 : count + 1], c_all[2 : count + 2], c_all[3 : count + 3]])
+        next_max = np.maximum.reduce([c_all[1 : count + 1], c_all[2 : count + 2], c_all[3 : count + 3]])
+        body = np.abs(c - o)
+        upper = h - np.maximum(o, c)
+        lower = np.minimum(o, c) - lo
+        bull = (lower >= body * 2.0) & (c > o) & ~(next_min < lo)
+        bear = (upper >= body * 2.0) & (c < o) & ~(next_max > h)
+        keep = bull | bear
+        wick = np.where(bull, lower, upper)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(body > 0, wick / body, 0.0)
+        return _records(
+            REJECTION_BLOCK_DTYPE,
+            np.arange(count)[keep],
+            np.where(bull[keep], BULLISH, BEARISH),
+            low=np.where(bull, lo, np.maximum(o, c))[keep],
+            high=np.where(bull, np.minimum(o, c), h)[keep],
+            level=np.where(bull, lo, h)[keep],
+            wick_size=wick[keep],
+            body_size=body[keep],
+            wick_ratio=ratio[keep],
+        )
+
+    def active(self, kind: str, end: int, lookback: int) -> np.ndarray:
+        """Zones of ``kind`` completed within the ``lookback`` bars before position ``end``."""
+        return self._between(getattr(self, kind), end - lookback, end)
+
+    def window_arrays(self, end: int, window: int = 50, rejection_blocks: bool = True) -> Dict[str, List[dict]]:
+        """
+        The dicts ``PDAArrayDetector``/``ICTFramework.identify_breaker_blocks``
+        return for ``candles[:end][-window:]``, with their default lookbacks.
+        """
+        start = max(end - window, 0)
+        size = min(end, window)
+        arrays = {
+            "fvgs": [
+                {
+                    "type": _side_name(row["type"]),
+                    "low": row["low"],
+                    "high": row["high"],
+                    "mid": row["mid"],
+                    "size_pips": row["size_pips"],
+                    "index": row["bar"] - start,
+                }
+                for row in _rows(self._between(self.fvgs, start + 2, end))
+            ],
+            "order_blocks": [
+                {
+                    "type": _side_name(row["type"]),
+                    "low": row["low"],
+                    "high": row["high"],
+                    "reversal_index": row["bar"] - start,
+                    "liquidity_level": row["liquidity_level"],
+                }
+                for row in _rows(self._between(self.order_blocks, start + 1, end))
+            ],
+            "breakers": [],
+        }
+        if size >= 7:
+            offset = end - 7
+            arrays["breakers"] = [
+                {"type": _side_name(row["type"]), "level": row["level"], "index": row["bar"] - offset}
+                for row in _rows(self._between(self.breakers, end - 6, end))
+            ]
+        if rejection_blocks:
+            arrays["rejection_blocks"] = []
+            if size >= 23:
+                offset = end - 20
+                arrays["rejection_blocks"] = [
+                    self._rejection_dict(row, row["bar"] - offset)
+                    for row in _rows(self._between(self.rejection_blocks, offset, end - 3))
+                ]
+        return arrays
+
+    @staticmethod
+    def _rejection_dict(row: dict, index: int) -> dict:
+        bullish = row["type"] == BULLISH
+        zone = {"type": _side_name(row["type"]), "level": row["level"]}
+        if bullish:
+            zone.update(high=row["high"], low=row["low"])
+        else:
+            zone.update(low=row["low"], high=row["high"])
+        zone.update(
+            wick_size=row["wick_size"],
+            body_size=row["body_size"],
+            wick_ratio=row["wick_ratio"],
+            index=index,
+        )
+        return zone
+
+    @staticmethod
+    def _between(rows: np.ndarray, first: int, stop: int) -> np.ndarray:
+        bars = rows["bar"]
+        return rows[int(np.searchsorted(bars, first, side="left")) : int(np.searchsorted(bars, stop, side="left"))]
+
+
+def _rows(rows: np.ndarray) -> List[dict]:
+    names = rows.dtype.names
+    return [dict(zip(names, values)) for values in rows.tolist()]
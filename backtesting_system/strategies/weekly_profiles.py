@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
-import json
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence
 
 from backtesting_system.adapters.data_sources.economic_calendar import EconomicCalendar
 from backtesting_system.analytics.intermarket import IntermarketAnalyzer
+from backtesting_system.core.calendar_features import calendar_ids, previous_week_id
+from backtesting_system.core.daily_bars import DailyBarBuilder
+from backtesting_system.core.profiling import FilterFunnel
 from backtesting_system.core.strategy_base import Strategy
 from backtesting_system.models.market import Candle
 from backtesting_system.strategies.ict_framework import (
@@ -17,7 +19,10 @@ from backtesting_system.strategies.ict_framework import (
     OpeningRangeFramework,
     PDAArrayDetector,
     StopHuntDetector,
+    StreamingStopHunt,
 )
+from backtesting_system.strategies.pda_stream import levels_near, zones_contain
+from backtesting_system.utils.jsonl_writer import AsyncJsonlWriter
 
 
 @dataclass
@@ -26,7 +31,52 @@ class WeeklyProfileContext:
     confidence: float | None
     mon_tue_low: Optional[float]
     mon_tue_high: Optional[float]
-    week_key: Optional[tuple]
+    week_key: Optional[int]
+
+
+# Trading days per profile; TGIF setups are additionally checked on Fridays.
+PROFILE_DAYS: Dict[str, FrozenSet[int]] = {
+    "classic_expansion_long": frozenset({2, 3}),
+    "classic_expansion_short": frozenset({2, 3}),
+    "midweek_reversal_long": frozenset({2}),
+    "midweek_reversal_short": frozenset({2}),
+    "consolidation_reversal_long": frozenset({3, 4}),
+    "consolidation_reversal_short": frozenset({3, 4}),
+}
+TGIF_WEEKDAY = 4
+# Zone kinds whose containment of the Mon-Tue extreme counts as PDA engagement.
+ENGAGEMENT_ZONES = ("fvgs", "order_blocks", "rejection_blocks")
+
+
+@dataclass(frozen=True)
+class FilterStage:
+    """
+    One pass/reject gate of ``generate_signals``.
+
+    ``cost`` is a rough relative per-call cost; stages run cheapest first,
+    after every stage named in ``requires``.
+    """
+
+    name: str
+    cost: int
+    check: Callable[["WeeklyProfileStrategy", dict], bool]
+    requires: FrozenSet[str] = frozenset()
+
+
+def order_stages(stages: Sequence[FilterStage]) -> List[FilterStage]:
+    """Cheapest-first order that respects ``requires``; ties keep declaration order."""
+    ordered: List[FilterStage] = []
+    done: set[str] = set()
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if stage.requires <= done]
+        if not ready:
+            raise ValueError(f"Unresolvable filter stage requirements: {[s.name for s in pending]}")
+        stage = min(ready, key=lambda s: s.cost)
+        ordered.append(stage)
+        done.add(stage.name)
+        pending.remove(stage)
+    return ordered
 
 
 class WeeklyProfileStrategy(Strategy):
@@ -36,10 +86,14 @@ class WeeklyProfileStrategy(Strategy):
         self.dol = None
         self.doh = None
         self._last_signal_week = None
-        self._daily_cache: Dict[datetime, List[Candle]] = {}
-        self._daily_series: List[Candle] = []
-        self._last_hist_len: int = 0
+        self._daily: DailyBarBuilder | None = None
+        self._last_context: WeeklyProfileContext | None = None
+        self._context_days: List[Candle] | None = None
+        self._context_day_count = -1
         self.detector = WeeklyProfileDetector()
+        # Prebuilt WeeklyProfileTable for the run's data, e.g. shared by a sweep; else built as weeks close.
+        self.profile_table: WeeklyProfileTable | None = params.get("profile_table")
+        self._own_profiles = WeeklyProfileTable(self.detector)
         self.pda_detector = PDAArrayDetector()
         self.cisd_validator = CISDValidator()
         self.stop_hunt_detector = StopHuntDetector()
@@ -61,8 +115,14 @@ class WeeklyProfileStrategy(Strategy):
         self.opening_range_penalty = params.get("opening_range_penalty", 0.05)
         self.news_confluence_boost = params.get("news_confluence_boost", 0.05)
         self.tgif_tolerance_pips = float(params.get("tgif_tolerance_pips", 10.0))
-        self._signal_log: List[Dict[str, object]] = []
-        self._signal_log_path: Path | None = None
+        log_path = params.get("signal_log_path")
+        self.signal_log = AsyncJsonlWriter(Path(log_path)) if log_path else None
+        self.filter_funnel = FilterFunnel()
+        self.allowed_days = {
+            profile: days | {0} if self.allow_monday else days for profile, days in PROFILE_DAYS.items()
+        }
+        self._signal_days = frozenset().union(*self.allowed_days.values(), {TGIF_WEEKDAY})
+        self._gates = order_stages(self.FILTER_STAGES)
 
     def identify_weekly_profile(self, weekly_data, daily_data) -> str | None:
         profile_type, confidence, _details = self.detector.detect_profile(daily_data, weekly_data, {})
@@ -80,62 +140,38 @@ class WeeklyProfileStrategy(Strategy):
     def identify_setup(self, data) -> bool:
         bar = data["bar"]
         history = data.get("history", [])
-        ctx = self._build_context(history)
+        ctx = self._build_context(self._sync_daily(data))
         if ctx.profile_type is None:
             return False
-        allowed_days = {
-            "classic_expansion_long": {2, 3},
-            "classic_expansion_short": {2, 3},
-            "midweek_reversal_long": {2},
-            "midweek_reversal_short": {2},
-            "consolidation_reversal_long": {3, 4},
-            "consolidation_reversal_short": {3, 4},
-        }
-        if self.allow_monday:
-            allowed_days = {key: days | {0} for key, days in allowed_days.items()}
-        if bar.time.weekday() not in allowed_days.get(ctx.profile_type, set()):
+        if self.bar_calendar(data)[2] not in self.allowed_days.get(ctx.profile_type, ()):
             return False
         return ctx.week_key != self._last_signal_week
 
     def generate_signals(self, data) -> dict:
         bar = data["bar"]
         history = data.get("history", [])
-        if self.enforce_killzones and not self.killzone_validator.is_valid_killzone(
-            bar.time,
-            allow_monday=self.allow_monday,
-        ):
-            return {}
-        ctx = self._build_context(history)
-        if ctx.profile_type is None:
-            return {}
-        if ctx.week_key == self._last_signal_week:
-            return {}
-
-        day = bar.time.weekday()
-        daily_candles = self._aggregate_daily(history)
-        h1_arrays = {
-            "fvgs": self.pda_detector.identify_fair_value_gaps(history[-50:]),
-            "order_blocks": self.pda_detector.identify_order_blocks(history[-50:]),
-            "breakers": self._stop_helper.identify_breaker_blocks(history[-50:]),
-            "rejection_blocks": self.pda_detector.identify_rejection_blocks(history[-50:]),
-        }
-        tgif_signal = self._maybe_tgif_signal(bar, daily_candles, h1_arrays)
-        if tgif_signal:
-            self._last_signal_week = ctx.week_key
-            self._record_signal(bar.time, tgif_signal, ctx)
-            return tgif_signal
-        allowed_days = {
-            "classic_expansion_long": {2, 3},
-            "classic_expansion_short": {2, 3},
-            "midweek_reversal_long": {2},
-            "midweek_reversal_short": {2},
-            "consolidation_reversal_long": {3, 4},
-            "consolidation_reversal_short": {3, 4},
-        }
-        if self.allow_monday:
-            allowed_days = {key: days | {0} for key, days in allowed_days.items()}
-        if day not in allowed_days.get(ctx.profile_type, set()):
-            return {}
+        funnel = self.filter_funnel
+        clock = funnel.start()
+        for stage in self._gates:
+            if not stage.check(self, data):
+                return funnel.rejected(stage.name, clock)
+            clock = funnel.passed(stage.name, clock)
+        ctx = self._last_context
+
+        _day_id, current_week, day = self.bar_calendar(data)
+        daily_candles = self._sync_daily(data).candles
+        h1_arrays = None
+        if day == TGIF_WEEKDAY:
+            h1_arrays = self._stop_helper.h1_arrays(data, rejection_blocks=True)
+            tgif_signal = self._maybe_tgif_signal(bar, daily_candles, h1_arrays, day, current_week)
+            if tgif_signal:
+                self._last_signal_week = ctx.week_key
+                self._record_signal(bar.time, tgif_signal, ctx)
+                funnel.emitted("tgif", clock)
+                return tgif_signal
+            if day not in self.allowed_days.get(ctx.profile_type, ()):
+                return funnel.rejected("tgif", clock)
+            clock = funnel.passed("tgif", clock)
 
         if (
             self.require_high_impact_news
@@ -143,12 +179,13 @@ class WeeklyProfileStrategy(Strategy):
             and ctx.profile_type in {"midweek_reversal_long", "midweek_reversal_short"}
         ):
             if not self.news_calendar:
-                return {}
+                return funnel.rejected("news", clock)
             currencies = self._extract_currencies(data.get("symbol", ""))
             if not self.news_calendar.get_high_impact_events(bar.time, currencies=currencies):
-                return {}
+                return funnel.rejected("news", clock)
             if not self.news_calendar.has_relevant_event_near(bar.time, currencies=currencies):
-                return {}
+                return funnel.rejected("news", clock)
+        clock = funnel.passed("news", clock)
 
         cisd = self.cisd_validator.detect_cisd(daily_candles, history[-20:])
         cisd_type = cisd.get("type", "").lower()
@@ -159,13 +196,11 @@ class WeeklyProfileStrategy(Strategy):
             swing_level = ctx.mon_tue_low if ctx.mon_tue_low is not None else min(c.low for c in history[-20:])
         else:
             swing_level = ctx.mon_tue_high if ctx.mon_tue_high is not None else max(c.high for c in history[-20:])
-        stop_hunt = self.stop_hunt_detector.detect_stop_hunt(history[-20:], swing_level)
+        stop_hunt = self.feature_state(data, "stop_hunt", StreamingStopHunt).detect(history, swing_level)
 
-        day_candles = [c for c in history if c.time.date() == bar.time.date()]
-        if day_candles:
-            day_low = min(c.low for c in day_candles)
-            day_high = max(c.high for c in day_candles)
-            opening_range = self.opening_range.calculate_opening_range(day_candles[0], day_low, day_high)
+        session = self.session_state(data)
+        if session.first is not None:
+            opening_range = self.opening_range.calculate_opening_range(session.first, session.low, session.high)
         else:
             opening_range = {}
 
@@ -190,7 +225,10 @@ class WeeklyProfileStrategy(Strategy):
         if self.news_confluence_boost and self._has_relevant_news(bar.time, data.get("symbol", "")):
             confluence_score += self.news_confluence_boost
         if confluence_score < self.min_confluence:
-            return {}
+            return funnel.rejected("confluence", clock)
+        clock = funnel.passed("confluence", clock)
+        if h1_arrays is None:
+            h1_arrays = self._stop_helper.h1_arrays(data, rejection_blocks=True)
 
         intermarket_boost = self.intermarket.get_confluence_boost(
             data.get("symbol", ""),
@@ -200,8 +238,7 @@ class WeeklyProfileStrategy(Strategy):
 
         direction = signal_direction
         entry = bar.close
-        current_week = self._current_week_key(bar.time)
-        week_candles = [c for c in daily_candles if self._current_week_key(c.time) == current_week]
+        week_candles = self._week_candles(daily_candles, current_week)
         weekly_high = max(c.high for c in week_candles) if week_candles else entry * 1.01
         weekly_low = min(c.low for c in week_candles) if week_candles else entry * 0.99
         if direction == "long":
@@ -232,7 +269,7 @@ class WeeklyProfileStrategy(Strategy):
             )
 
         if not self.validate_pda_array(entry, h1_arrays):
-            return {}
+            return funnel.rejected("pda", clock)
 
         self._last_signal_week = ctx.week_key
         signal = {
@@ -244,19 +281,79 @@ class WeeklyProfileStrategy(Strategy):
             "profile_type": ctx.profile_type,
         }
         self._record_signal(bar.time, signal, ctx)
+        funnel.emitted("pda", clock)
         return signal
 
-        
-    def _maybe_tgif_signal(self, bar: Candle, daily_candles: List[Candle], h1_arrays: dict) -> dict:
+    def _in_killzone(self, data) -> bool:
+        return not self.enforce_killzones or self.killzone_validator.is_valid_killzone(
+            data["bar"].time,
+            allow_monday=self.allow_monday,
+        )
+
+    def _on_signal_day(self, data) -> bool:
+        return self.bar_calendar(data)[2] in self._signal_days
+
+    def _has_profile(self, data) -> bool:
+        return self._build_context(self._sync_daily(data)).profile_type is not None
+
+    def _week_open(self, data) -> bool:
+        return self._last_context.week_key != self._last_signal_week
+
+    def _on_profile_day(self, data) -> bool:
+        day = self.bar_calendar(data)[2]
+        return day == TGIF_WEEKDAY or day in self.allowed_days.get(self._last_context.profile_type, ())
+
+    FILTER_STAGES = (
+        FilterStage("killzone", 2, _in_killzone),
+        FilterStage("calendar", 1, _on_signal_day),
+        FilterStage("context", 100, _has_profile),
+        FilterStage("week_traded", 1, _week_open, frozenset({"context"})),
+        FilterStage("weekday", 1, _on_profile_day, frozenset({"context"})),
+    )
+
+    def next_signal_time(self, data) -> datetime | None:
+        bar = data["bar"]
+        if not self._in_killzone(data):
+            return self._next_killzone_time(bar.time)
+        _day_id, _week, weekday = self.bar_calendar(data)
+        day_start = datetime(bar.time.year, bar.time.month, bar.time.day, tzinfo=bar.time.tzinfo)
+        if weekday not in self._signal_days:
+            return self._next_signal_day(day_start, weekday)
+        ctx = self._build_context(self._sync_daily(data))
+        if ctx.profile_type is None:
+            # The context only changes once a new daily candle starts.
+            return self._next_killzone_time(day_start + timedelta(days=1))
+        if ctx.week_key == self._last_signal_week:
+            return self._next_killzone_time(day_start + timedelta(days=7 - weekday))
+        return None
+
+    def _next_signal_day(self, day_start: datetime, weekday: int) -> datetime:
+        days = 1
+        while (weekday + days) % 7 not in self._signal_days:
+            days += 1
+        return self._next_killzone_time(day_start + timedelta(days=days))
+
+    def _next_killzone_time(self, dt: datetime) -> datetime:
+        if not self.enforce_killzones:
+            return dt
+        return self.killzone_validator.next_valid_time(dt, allow_monday=self.allow_monday)
+
+    def _maybe_tgif_signal(
+        self,
+        bar: Candle,
+        daily_candles: List[Candle],
+        h1_arrays: dict,
+        weekday: int,
+        current_week: int,
+    ) -> dict:
         if self.enforce_killzones and not self.killzone_validator.is_valid_killzone(
             bar.time,
             allow_monday=self.allow_monday,
         ):
             return {}
-        if bar.time.weekday() != 4:
+        if weekday != 4:
             return {}
-        current_week = self._current_week_key(bar.time)
-        week_candles = [c for c in daily_candles if self._current_week_key(c.time) == current_week]
+        week_candles = self._week_candles(daily_candles, current_week)
         if len(week_candles) < 3:
             return {}
         week_high = max(c.high for c in week_candles)
@@ -395,86 +492,67 @@ class WeeklyProfileStrategy(Strategy):
     def check_negative_conditions(self, daily_data) -> bool:
         return False
 
-    def _build_context(self, history: List[Candle]) -> WeeklyProfileContext:
-        daily = self._aggregate_daily(history)
+    def _sync_daily(self, data) -> DailyBarBuilder:
+        self._daily = self.daily_bars(data)
+        return self._daily
+
+    def _build_context(self, daily_bars: DailyBarBuilder) -> WeeklyProfileContext:
+        # Only today's candle changes within a day, and it only enters the context
+        # as a Mon/Tue candle, when fewer than two Tue-Fri days exist and no profile
+        # is returned. So the context is fixed until a new day starts.
+        daily = daily_bars.candles
+        if daily is self._context_days and len(daily) == self._context_day_count:
+            return self._last_context
+        ctx = self._compute_context(daily_bars)
+        self._last_context, self._context_days, self._context_day_count = ctx, daily, len(daily)
+        return ctx
+
+    def _compute_context(self, daily_bars: DailyBarBuilder) -> WeeklyProfileContext:
+        daily = daily_bars.candles
         if len(daily) < 10:
             return WeeklyProfileContext(None, None, None, None, None)
 
-        current_week = self._current_week_key(daily[-1].time)
+        weekdays = daily_bars.weekdays
+        current_week = daily_bars.week_ids[-1]
         prev_week_key = self._previous_week_key(current_week)
 
-        prev_week = [c for c in daily if self._current_week_key(c.time) == prev_week_key]
-        prev_week = sorted([c for c in prev_week if c.time.weekday() <= 4], key=lambda c: c.time)
-        this_week = [c for c in daily if self._current_week_key(c.time) == current_week]
-        this_week = sorted([c for c in this_week if c.time.weekday() <= 4], key=lambda c: c.time)
-        this_week_no_mon = [c for c in this_week if c.time.weekday() != 0]
-        mon_tue_current = [c for c in this_week if c.time.weekday() in (0, 1)]
-        if not prev_week or len(this_week_no_mon) < 2:
+        week = daily_bars.week_slice(current_week)
+        this_week = [(c, d) for c, d in zip(daily[week], weekdays[week]) if d <= 4]
+        this_week_no_mon = [c for c, d in this_week if d != 0]
+        mon_tue_current = [c for c, d in this_week if d in (0, 1)]
+        prev_week = self._profile_row(daily_bars, prev_week_key)
+        if prev_week is None or len(this_week_no_mon) < 2:
             return WeeklyProfileContext(None, None, None, None, current_week)
 
-        prev_low = min(c.low for c in prev_week)
-        prev_high = max(c.high for c in prev_week)
-        mid = (prev_low + prev_high) / 2
-        weekly_ohlc = {
-            "open": prev_week[0].open,
-            "high": max(c.high for c in prev_week),
-            "low": min(c.low for c in prev_week),
-            "close": prev_week[-1].close,
-        }
-        profile_type, confidence, _details = self.detector.detect_profile(prev_week, weekly_ohlc, {})
+        profile_type, confidence = prev_week.profile_type, prev_week.confidence
 
         if mon_tue_current:
             mon_tue_low = min(c.low for c in mon_tue_current)
             mon_tue_high = max(c.high for c in mon_tue_current)
         else:
-            mon_tue_low = min(c.low for c in prev_week)
-            mon_tue_high = max(c.high for c in prev_week)
+            mon_tue_low = prev_week.low
+            mon_tue_high = prev_week.high
 
         return WeeklyProfileContext(profile_type, confidence, mon_tue_low, mon_tue_high, current_week)
 
-    def _aggregate_daily(self, history: List[Candle]) -> List[Candle]:
-        if not history:
-            return []
-        if len(history) == self._last_hist_len:
-            return self._daily_series
-
-        for candle in history[self._last_hist_len :]:
-            day_key = datetime(
-                candle.time.year,
-                candle.time.month,
-                candle.time.day,
-                tzinfo=timezone.utc,
-            )
-            self._daily_cache.setdefault(day_key, []).append(candle)
-        self._last_hist_len = len(history)
-
-        result: List[Candle] = []
-        for day in sorted(self._daily_cache.keys()):
-            chunk = self._daily_cache[day]
-            result.append(
-                Candle(
-                    time=day,
-                    open=chunk[0].open,
-                    high=max(c.high for c in chunk),
-                    low=min(c.low for c in chunk),
-                    close=chunk[-1].close,
-                    volume=None,
-                )
-            )
-        self._daily_series = result
-        return result
+    def _profile_row(self, daily_bars: DailyBarBuilder, week: int) -> WeeklyProfileRow | None:
+        """Profile of a completed ``week``, from the shared table when it covers the week."""
+        table = self.profile_table
+        if table is None or not table.covers(week):
+            table = self._own_profiles.sync(daily_bars)
+        return table.get(week)
 
-    def _current_week_key(self, dt: datetime) -> tuple:
-        iso = dt.isocalendar()
-        return iso.year, iso.week
+    def _week_candles(self, daily_candles: List[Candle], week: int) -> List[Candle]:
+        if self._daily is None or daily_candles is not self._daily.candles:
+            return [c for c in daily_candles if calendar_ids(c.time)[1] == week]
+        return daily_candles[self._daily.week_slice(week)]
 
-    def _previous_week_key(self, week_key: tuple) -> tuple:
-        year, week = week_key
-        if week > 1:
-            return year, week - 1
-        return year - 1, 52
+    def _previous_week_key(self, week_key: int) -> int:
+        return previous_week_id(week_key)
 
     def _record_signal(self, timestamp: datetime, signal: dict, ctx: WeeklyProfileContext) -> None:
+        if self.signal_log is None:
+            return
         entry = {
             "time": timestamp.isoformat(),
             "profile_type": ctx.profile_type,
@@ -487,13 +565,11 @@ class WeeklyProfileStrategy(Strategy):
             "mon_tue_high": ctx.mon_tue_high,
             "week_key": ctx.week_key,
         }
-        self._signal_log.append(entry)
-        if self._signal_log_path is None:
-            Path("backtest_logs").mkdir(parents=True, exist_ok=True)
-            stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            self._signal_log_path = Path("backtest_logs") / f"weekly_profile_signals_{stamp}.json"
-        with self._signal_log_path.open("w", encoding="utf-8") as handle:
-            json.dump(self._signal_log, handle, indent=2, default=str)
+        self.signal_log.write(entry)
+
+    def on_run_end(self) -> None:
+        if self.signal_log is not None:
+            self.signal_log.close()
 
 class WeeklyProfileDetector:
     def __init__(self):
@@ -552,49 +628,16 @@ class WeeklyProfileDetector:
         tolerance_pips = 5.0
         tolerance = tolerance_pips / 10000
         
-        if direction == "bullish":
-            # Prüfe Discount Arrays (FVG, OB, Breaker, RB)
-            for fvg in h1_arrays.get("fvgs", []):
-                if fvg["type"] == "bullish":
-                    if fvg["low"] - tolerance <= mon_tue_low <= fvg["high"] + tolerance:
-                        return True, "fvg"
-            
-            for ob in h1_arrays.get("order_blocks", []):
-                if ob["type"] == "bullish":
-                    if ob["low"] - tolerance <= mon_tue_low <= ob["high"] + tolerance:
-                        return True, "order_block"
-                        
-            for brk in h1_arrays.get("breakers", []):
-                if brk["type"] == "bullish":
-                    if abs(brk["level"] - mon_tue_low) <= tolerance:
-                        return True, "breaker"
-            
-            for rb in h1_arrays.get("rejection_blocks", []):
-                if rb["type"] == "bullish":
-                    if rb["low"] - tolerance <= mon_tue_low <= rb["high"] + tolerance:
-                        return True, "rejection_block"
-        
-        else:  # bearish
-            # Prüfe Premium Arrays
-            for fvg in h1_arrays.get("fvgs", []):
-                if fvg["type"] == "bearish":
-                    if fvg["low"] - tolerance <= mon_tue_high <= fvg["high"] + tolerance:
-                        return True, "fvg"
-            
-            for ob in h1_arrays.get("order_blocks", []):
-                if ob["type"] == "bearish":
-                    if ob["low"] - tolerance <= mon_tue_high <= ob["high"] + tolerance:
-                        return True, "order_block"
-                        
-            for brk in h1_arrays.get("breakers", []):
-                if brk["type"] == "bearish":
-                    if abs(brk["level"] - mon_tue_high) <= tolerance:
-                        return True, "breaker"
-            
-            for rb in h1_arrays.get("rejection_blocks", []):
-                if rb["type"] == "bearish":
-                    if rb["low"] - tolerance <= mon_tue_high <= rb["high"] + tolerance:
-                        return True, "rejection_block"
+        # Bullish: Discount Arrays am Low, bearish: Premium Arrays am High
+        side, price = ("bullish", mon_tue_low) if direction == "bullish" else ("bearish", mon_tue_high)
+        if zones_contain(h1_arrays.get("fvgs", []), price, tolerance, side):
+            return True, "fvg"
+        if zones_contain(h1_arrays.get("order_blocks", []), price, tolerance, side):
+            return True, "order_block"
+        if levels_near(h1_arrays.get("breakers", []), price, tolerance, side):
+            return True, "breaker"
+        if zones_contain(h1_arrays.get("rejection_blocks", []), price, tolerance, side):
+            return True, "rejection_block"
         
         return False, "none"
 
@@ -698,43 +741,13 @@ class WeeklyProfileDetector:
             mon_tue_high = max(mon.high, tue.high)
             tolerance = 5.0 / 10000  # 5 pips tolerance
             
-            # Discount Engagement: Interaktion mit bullish PDA
-            discount_engaged = False
-            for fvg in h1_arrays.get("fvgs", []):
-                if fvg["type"] == "bullish" and fvg["low"] - tolerance <= mon_tue_low <= fvg["high"] + tolerance:
-                    discount_engaged = True
-                    break
-            
-            if not discount_engaged:
-                for ob in h1_arrays.get("order_blocks", []):
-                    if ob["type"] == "bullish" and ob["low"] - tolerance <= mon_tue_low <= ob["high"] + tolerance:
-                        discount_engaged = True
-                        break
-            
-            if not discount_engaged:
-                for rb in h1_arrays.get("rejection_blocks", []):
-                    if rb["type"] == "bullish" and rb["low"] - tolerance <= mon_tue_low <= rb["high"] + tolerance:
-                        discount_engaged = True
-                        break
-            
-            # Premium Engagement: Interaktion mit bearish PDA
-            premium_engaged = False
-            for fvg in h1_arrays.get("fvgs", []):
-                if fvg["type"] == "bearish" and fvg["low"] - tolerance <= mon_tue_high <= fvg["high"] + tolerance:
-                    premium_engaged = True
-                    break
-            
-            if not premium_engaged:
-                for ob in h1_arrays.get("order_blocks", []):
-                    if ob["type"] == "bearish" and ob["low"] - tolerance <= mon_tue_high <= ob["high"] + tolerance:
-                        premium_engaged = True
-                        break
-            
-            if not premium_engaged:
-                for rb in h1_arrays.get("rejection_blocks", []):
-                    if rb["type"] == "bearish" and rb["low"] - tolerance <= mon_tue_high <= rb["high"] + tolerance:
-                        premium_engaged = True
-                        break
+            # Discount Engagement: Interaktion mit bullish PDA, Premium: mit bearish PDA
+            discount_engaged = any(
+                zones_contain(h1_arrays.get(key, []), mon_tue_low, tolerance, "bullish") for key in ENGAGEMENT_ZONES
+            )
+            premium_engaged = any(
+                zones_contain(h1_arrays.get(key, []), mon_tue_high, tolerance, "bearish") for key in ENGAGEMENT_ZONES
+            )
             
             # Klassifizierung basierend auf PDA-Engagement
             if discount_engaged and tue.close > tue.open:
@@ -791,3 +804,103 @@ class WeeklyProfileDetector:
             "weekly_target": weekly_ohlc["high"] + weekly_range * 0.1,
             "confidence": 0.7,
         }
+
+
+@dataclass(frozen=True)
+class WeeklyProfileRow:
+    """Classification of one completed ISO week (Mon-Fri daily candles)."""
+
+    week: int
+    profile_type: Optional[str]
+    confidence: float
+    open: float
+    high: float
+    low: float
+    close: float
+    mon_tue_low: Optional[float]
+    mon_tue_high: Optional[float]
+    rejection: Optional[str]
+
+    @property
+    def negative_condition(self) -> bool:
+        """The midweek reversal negative condition (two same-direction closes Mon-Tue) vetoed the profile."""
+        return self.rejection == "negative_condition_midweek"
+
+    @property
+    def missing_htf_engagement(self) -> bool:
+        return self.rejection == "no_htf_pda_engagement"
+
+
+class WeeklyProfileTable:
+    """
+    ``WeeklyProfileDetector`` results for every completed week of a daily
+    series, keyed by week id.
+
+    A week counts as complete once the series holds a day of a later week, so
+    the table never contains a week still in progress and a prebuilt table
+    (``from_candles``) can be shared by every run and sweep over the same
+    data without look-ahead. ``sync`` extends a table from a growing
+    ``DailyBarBuilder`` one finished week at a time.
+    """
+
+    def __init__(self, detector: WeeklyProfileDetector | None = None) -> None:
+        self.detector = detector or WeeklyProfileDetector()
+        self.rows: Dict[int, WeeklyProfileRow] = {}
+        self.last_complete_week: int | None = None
+        self._source: List[Candle] | None = None
+        self._consumed = 0
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle], detector: WeeklyProfileDetector | None = None) -> "WeeklyProfileTable":
+        daily = DailyBarBuilder()
+        daily.sync(candles)
+        table = cls(detector)
+        table.sync(daily)
+        return table
+
+    def covers(self, week: int) -> bool:
+        return self.last_complete_week is not None and week <= self.last_complete_week
+
+    def get(self, week: int) -> WeeklyProfileRow | None:
+        """Row of a covered week; ``None`` when it had no weekday candles."""
+        return self.rows.get(week)
+
+    def sync(self, daily: DailyBarBuilder) -> "WeeklyProfileTable":
+        if daily.candles is not self._source or len(daily.candles) < self._consumed:
+            self.rows = {}
+            self.last_complete_week = None
+            self._source = daily.candles
+            self._consumed = 0
+        week_ids = daily.week_ids
+        start = self._consumed
+        for idx in range(start + 1, len(week_ids)):
+            if week_ids[idx] != week_ids[start]:
+                self._classify(daily, start, idx)
+                start = idx
+        self._consumed = start
+        return self
+
+    def _classify(self, daily: DailyBarBuilder, start: int, stop: int) -> None:
+        week = daily.week_ids[start]
+        self.last_complete_week = week
+        weekdays = daily.weekdays[start:stop]
+        days = [c for c, d in zip(daily.candles[start:stop], weekdays) if d <= 4]
+        if not days:
+            return
+        mon_tue = [c for c, d in zip(daily.candles[start:stop], weekdays) if d in (0, 1)]
+        weekly_ohlc = {
+            "open": days[0].open,
+            "high": max(c.high for c in days),
+            "low": min(c.low for c in days),
+            "close": days[-1].close,
+        }
+        profile_type, confidence, details = self.detector.detect_profile(days, weekly_ohlc, {})
+        self.rows[week] = WeeklyProfileRow(
+            week=week,
+            profile_type=profile_type,
+            confidence=confidence,
+            mon_tue_low=min(c.low for c in mon_tue) if mon_tue else None,
+            mon_tue_high=max(c.high for c in mon_tue) if mon_tue else None,
+            rejection=details.get("reason"),
+            **weekly_ohlc,
+        )
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import hashlib
+import json
 from pathlib import Path
+from typing import Iterable, Mapping
 
 
 def md5_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
@@ -13,3 +15,17 @@ def md5_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
                 break
             hasher.update(chunk)
     return hasher.hexdigest()
+
+
+def md5_candles(candles: Iterable) -> str:
+    """Checksum of a candle series, independent of the file it was loaded from."""
+    hasher = hashlib.md5()
+    for candle in candles:
+        payload = f"{candle.time.isoformat()}|{candle.open}|{candle.high}|{candle.low}|{candle.close}|{candle.volume}\n"
+        hasher.update(payload.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def md5_params(params: Mapping) -> str:
+    payload = json.dumps(dict(params), sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AsyncJsonlWriter:
+    """
+    Append-only JSON Lines file written by a background thread.
+
+    ``write`` only enqueues the record; the thread serializes and appends it.
+    The queue is bounded, so a producer that outruns the disk blocks instead of
+    buffering without limit. The thread starts on the first record; ``close``
+    drains the queue and stops it, and a later ``write`` starts a new one.
+    """
+
+    def __init__(self, path: str | Path, max_pending: int = 1024) -> None:
+        self.path = Path(path)
+        self.max_pending = max_pending
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+
+    def write(self, record: dict) -> None:
+        if self._thread is None:
+            self._queue = queue.Queue(maxsize=self.max_pending)
+            self._thread = threading.Thread(target=self._drain, name=f"jsonl-writer:{self.path.name}", daemon=True)
+            self._thread.start()
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """Block until every record written so far is on disk."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._queue = None
+        self._thread = None
+
+    def _drain(self) -> None:
+        handle = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle = self.path.open("a", encoding="utf-8")
+        except OSError as exc:
+            logger.error("Cannot open %s, dropping records: %s", self.path, exc)
+        pending = self._queue
+        while True:
+            record = pending.get()
+            try:
+                if record is _STOP:
+                    break
+                if handle is not None:
+                    handle.write(json.dumps(record, default=str) + "\n")
+                    if pending.empty():
+                        handle.flush()
+            except (OSError, ValueError) as exc:
+                logger.error("Writing %s failed, dropping records: %s", self.path, exc)
+                handle.close()
+                handle = None
+            finally:
+                pending.task_done()
+        if handle is not None:
+            handle.close()
+
+    def __getstate__(self) -> dict:
+        # Threads and queues do not pickle; flush so the file matches the snapshot.
+        self.flush()
+        return {"path": self.path, "max_pending": self.max_pending}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
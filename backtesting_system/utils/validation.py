@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-import hashlib
 import json
 from pathlib import Path
 from typing import Iterable, List, Optional
 
 from backtesting_system.models.market import Candle
+from backtesting_system.utils.hashing import md5_candles
 
 
 def validate_ohlcv(data) -> bool:
@@ -73,7 +73,7 @@ class DataValidator:
         cleaned: List[Candle] = []
         invalid_ohlc = 0
         for candle in candles:
-            if candle.high < candle.low or candle.high < candle.open or candle.high < candle.close:
+            if not self.valid_ohlc(candle):
                 invalid_ohlc += 1
                 continue
             cleaned.append(candle)
@@ -122,6 +122,10 @@ class DataValidator:
             report.report_path = self._write_report(report)
         return cleaned, report
 
+    @staticmethod
+    def valid_ohlc(candle: Candle) -> bool:
+        return not (candle.high < candle.low or candle.high < candle.open or candle.high < candle.close)
+
     def _calculate_quality_score(self, report: DataValidationReport) -> float:
         score = 1.0
         score -= len(report.validation_log) * 0.05
@@ -130,11 +134,7 @@ class DataValidator:
         return max(score, 0.0)
 
     def _calculate_checksum(self, candles: List[Candle]) -> str:
-        digest = hashlib.md5()
-        for candle in candles:
-            payload = f"{candle.time.isoformat()}|{candle.open}|{candle.high}|{candle.low}|{candle.close}|{candle.volume}\n"
-            digest.update(payload.encode("utf-8"))
-        return digest.hexdigest()
+        return md5_candles(candles)
 
     def _write_report(self, report: DataValidationReport) -> str:
         Path(self.report_dir).mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,14 @@
+from pathlib import Path
+
+import pytest
+
+from backtesting_system.adapters.data_sources.csv_source import CSVDataSource
+
+H4_PATH = Path(__file__).resolve().parents[1] / "data" / "processed" / "resampled" / "eurusd_h4.csv"
+
+
+@pytest.fixture(scope="session")
+def h4_candles():
+    """6000 EURUSD H4 bars (mid-2012 to early 2015) from the bundled resampled data."""
+    source = CSVDataSource(base_path=H4_PATH.parent, file_map={"EURUSD": H4_PATH}, base_timeframe="H4")
+    return source.load_ohlcv("EURUSD", "H4")[20000:26000]
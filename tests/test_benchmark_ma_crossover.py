@@ -0,0 +1,28 @@
+import pytest
+
+from backtesting_system.strategies.benchmark_ma_crossover import (
+    MovingAverageCrossoverStrategy,
+    crossover_signal_grid,
+)
+
+
+def strategy_signals(candles, fast, slow, cooldown_bars):
+    strategy = MovingAverageCrossoverStrategy({"ma_fast": fast, "ma_slow": slow, "ma_cooldown_bars": cooldown_bars})
+    history = []
+    signals = []
+    for bar in candles:
+        history.append(bar)
+        signal = strategy.generate_signals({"bar": bar, "history": history})
+        signals.append({"long": 1, "short": -1}.get(signal.get("direction"), 0))
+    return signals
+
+
+@pytest.mark.parametrize("fast, slow", [(5, 10), (3, 7), (20, 50), (50, 20)])
+@pytest.mark.parametrize("cooldown_bars", [1, 6])
+def test_grid_matches_strategy(h4_candles, fast, slow, cooldown_bars):
+    expected = strategy_signals(h4_candles, fast, slow, cooldown_bars)
+    grid = crossover_signal_grid([c.close for c in h4_candles], [fast], [slow], cooldown_bars)[(fast, slow)]
+    # Before bar max(fast, slow) the strategy averages a truncated fast window; the grid does not.
+    first = max(fast, slow)
+    assert any(expected[first:])
+    assert grid[first:].tolist() == expected[first:]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from backtesting_system.core.calendar_features import CalendarColumns
+from backtesting_system.strategies.benchmark_random import (
+    RandomBaselineStrategy,
+    _cooldown_entries,
+    random_null_distribution,
+)
+
+PARAMS = [
+    {"random_trade_probability": 0.02, "random_cooldown_bars": 24},
+    {"random_trade_probability": 0.3, "random_cooldown_bars": 1},
+]
+
+
+def strategy_entries(candles, params, seed):
+    strategy = RandomBaselineStrategy({**params, "random_seed": seed})
+    calendar = CalendarColumns.from_candles(candles)
+    history = []
+    entries = []
+    for idx, bar in enumerate(candles):
+        history.append(bar)
+        if strategy.generate_signals({"bar": bar, "history": history, "calendar": calendar}):
+            entries.append(idx)
+    return entries
+
+
+def rule_entries(candidates, day_ids, cooldown):
+    """The strategy's cooldown and one-entry-per-day rules applied bar by bar."""
+    entries = []
+    for bar in candidates:
+        if entries and (bar - entries[-1] < cooldown or day_ids[bar] == day_ids[entries[-1]]):
+            continue
+        entries.append(bar)
+    return entries
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_trade_counts_match_strategy(h4_candles, params):
+    expected = np.mean([len(strategy_entries(h4_candles, params, seed)) for seed in range(40)])
+    null = random_null_distribution(h4_candles, params, seeds=400)
+    assert null.trades.mean() == pytest.approx(expected, rel=0.05)
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_strategy_entries_follow_rules(h4_candles, params):
+    day_ids = CalendarColumns.from_candles(h4_candles).day_ids
+    entries = strategy_entries(h4_candles, params, seed=3)
+    assert entries == rule_entries(entries, day_ids, params["random_cooldown_bars"])
+
+
+@pytest.mark.parametrize("cooldown", [1, 24])
+def test_cooldown_entries_apply_rules(h4_candles, cooldown):
+    count = len(h4_candles)
+    day_ids = CalendarColumns.from_candles(h4_candles).day_ids
+    next_day = np.searchsorted(day_ids, day_ids, side="right")
+    rng = np.random.default_rng(0)
+    seeds = 20
+    candidates = [np.flatnonzero(rng.random(count) < 0.1) for _ in range(seeds)]
+    keys = np.concatenate([seed * count + bars for seed, bars in enumerate(candidates)])
+    taken = keys[_cooldown_entries(keys, seeds, count, cooldown, next_day)]
+    for seed, bars in enumerate(candidates):
+        kept = taken[(taken >= seed * count) & (taken < (seed + 1) * count)] - seed * count
+        assert kept.tolist() == rule_entries(bars.tolist(), day_ids, cooldown)